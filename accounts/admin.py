@@ -5,12 +5,19 @@ and customizes their presentation and functionality.
 
 Classes:
     MemberProfileAdmin: Admin interface for MemberProfile model
-    CustomUserAdmin: Enhanced admin interface for the User model
+    CustomUserAdmin: Enhanced admin interface for the User model, with a
+        CSV member import page (see accounts/imports.py)
 """
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.contrib.auth import get_user_model
+from django.http import Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from .forms import MemberImportForm
+from .imports import import_status, schedule_invitations, start_import
 from .models import MemberProfile
 import logging
 
@@ -43,7 +50,7 @@ class CustomUserAdmin(DjangoUserAdmin):
     list_per_page = 25  # Control pagination for better performance
     
     # Add actions for bulk operations
-    actions = ['make_active', 'make_inactive']
+    actions = ['make_active', 'make_inactive', 'send_invitation']
     
     def make_active(self, request, queryset):
         """Admin action to make selected users active."""
@@ -56,6 +63,52 @@ class CustomUserAdmin(DjangoUserAdmin):
         updated = queryset.update(is_active=False)
         self.message_user(request, f'{updated} brukere ble deaktivert.')
     make_inactive.short_description = "Deaktiver valgte brukere"
+    
+    def send_invitation(self, request, queryset):
+        """Admin action to (re)send invitations to selected users without a password."""
+        user_ids = [user.pk for user in queryset.only('pk', 'password') if not user.has_usable_password()]
+        schedule_invitations(user_ids)
+        self.message_user(request, f'Invitasjon sendes til {len(user_ids)} brukere uten passord.')
+    send_invitation.short_description = "Send invitasjon til valgte brukere uten passord"
+    
+    def get_urls(self):
+        urls = [
+            path(
+                'import-members/',
+                self.admin_site.admin_view(self.import_members_view),
+                name='accounts_user_import',
+            ),
+            path(
+                'import-members/<str:job_id>/',
+                self.admin_site.admin_view(self.import_members_view),
+                name='accounts_user_import_status',
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def import_members_view(self, request, job_id=None):
+        """Upload a CSV of members, then show the progress of its background import."""
+        if not self.has_add_permission(request):
+            return redirect('admin:accounts_user_changelist')
+        form = MemberImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            job_id = start_import(form.cleaned_data['file'], invite=form.cleaned_data['invite'])
+            logger.info("%s started member import %s via admin", request.user, job_id)
+            self.message_user(request, 'Importen er startet. Siden oppdateres til den er ferdig.')
+            return redirect('admin:accounts_user_import_status', job_id=job_id)
+        status = None
+        if job_id is not None:
+            status = import_status(job_id)
+            if status is None:
+                raise Http404("Ukjent import")
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Importer medlemmer',
+            'form': form,
+            'status': status,
+        }
+        return TemplateResponse(request, 'admin/accounts/user/import_members.html', context)
 
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -1,13 +1,30 @@
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+USER_CACHE_KEY = 'auth:user:{}'
+
+
+def user_cache_key(user_id):
+    """Return the cache key used by EmailBackend.get_user for a user id."""
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_cached_user(user_id):
+    """Drop a user from the authentication cache so the next request reloads it."""
+    cache.delete(user_cache_key(user_id))
 
-from django.contrib.auth.backends import ModelBackend
-from django.contrib.auth import get_user_model
 
 class EmailBackend(ModelBackend):
     """
     Authenticate users using email (case-insensitive) and password.
     Compatible with custom user models where email is unique and primary.
+
+    get_user() runs on every authenticated request, so the user is loaded
+    together with its business account, member profile and groups (the
+    role checks every page makes) and cached for AUTH_USER_CACHE_TIMEOUT
+    seconds. Changes to any of those invalidate the entry (see accounts.signals).
     """
     def authenticate(self, request, username=None, password=None, **kwargs):
         email = (username or kwargs.get('email') or '').strip().lower()
@@ -23,9 +40,24 @@ class EmailBackend(ModelBackend):
         return None
 
     def get_user(self, user_id):
+        timeout = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 0)
+        key = user_cache_key(user_id)
+        if timeout:
+            user = cache.get(key)
+            if user is not None:
+                return user
+
         UserModel = get_user_model()
         try:
-            return UserModel.objects.get(pk=user_id)
+            user = (
+                UserModel.objects
+                .select_related('business_account', 'member_profile')
+                .prefetch_related('groups')
+                .get(pk=user_id)
+            )
         except UserModel.DoesNotExist:
             return None
 
+        if timeout:
+            cache.set(key, user, timeout)
+        return user
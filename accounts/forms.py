@@ -381,3 +381,23 @@ class UserProfileForm(forms.ModelForm):
                 logger.error(f"Failed to update member profile for {user.email}: {str(e)}")
                 
         return user
+
+
+class MemberImportForm(forms.Form):
+    """Upload form for bulk member import (see accounts/imports.py)."""
+    file = forms.FileField(
+        label=_('CSV-fil'),
+        help_text=_('Kolonner: email, first_name, last_name, city, username, password.'),
+        widget=forms.ClearableFileInput(attrs={'accept': '.csv'}),
+    )
+    invite = forms.BooleanField(
+        label=_('Send invitasjon til medlemmer uten passord'),
+        required=False,
+        initial=True,
+    )
+
+    def clean_file(self):
+        uploaded = self.cleaned_data['file']
+        if not uploaded.name.lower().endswith('.csv'):
+            raise forms.ValidationError(_('Filen må være en .csv-fil.'))
+        return uploaded
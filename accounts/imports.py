@@ -0,0 +1,376 @@
+"""
+Bulk import of members from CSV.
+
+Partner loyalty programs hand over members by the tens of thousands. The
+CSV is streamed in chunks of MEMBER_IMPORT_CHUNK_SIZE rows; each chunk
+costs one query to find emails and usernames already taken, a bulk
+INSERT each for users, member profiles and Members group memberships, and
+commits on its own, so a bad row only rejects that row. Users are
+inserted with ON CONFLICT DO NOTHING and read back, so an email taken
+between validation and insert (a signup, a parallel import) rejects that
+row instead of the chunk.
+
+The admin page stores the upload and imports it in a Celery task
+(start_import()); the task reports progress to the cache after every
+chunk, and the page polls import_status().
+
+Columns (CSV header): email (required), first_name, last_name, city,
+username (defaults to the email), password.
+
+Passwords: rows with a password are hashed with the configured hasher in
+a process pool (PBKDF2 is deliberately slow, ~100 ms per hash, so hashing
+dominates the import). Rows without one get an unusable password and an
+invitation email with a one-time link for choosing a password.
+
+bulk_create skips save() and the post_save handlers. Nothing needs to be
+invalidated for brand-new users (they are not in the authentication
+cache yet), and emails are lower-cased here as User.save() would.
+"""
+
+import csv
+import io
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.mail import EmailMessage, get_connection
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from .models import MemberProfile
+from .roles import MEMBER_GROUP, group_id
+
+logger = logging.getLogger(__name__)
+
+# Below this many passwords a pool costs more to start than it saves
+POOL_THRESHOLD = 32
+
+UPLOAD_DIR = 'member-imports'
+STATUS_KEY = 'member-import:{}'
+STATUS_TTL = 60 * 60 * 24
+# Rejected rows kept in the status shown on the admin page
+STATUS_REJECTED_LIMIT = 500
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a member import."""
+    created: int = 0
+    invited: int = 0
+    rejected: list = field(default_factory=list)  # (line number, email, reason)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return (self.created + len(self.rejected)) / self.elapsed if self.elapsed else 0.0
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _text(row, key):
+    return (row.get(key) or '').strip()
+
+
+def _validate_chunk(numbered_rows, seen, report):
+    """
+    Validate a chunk of (line number, row) pairs.
+
+    Emails and usernames are checked against the database with a single
+    query for the whole chunk, and against earlier rows via `seen`.
+
+    Returns:
+        list: (line number, cleaned row dict) for the rows to create
+    """
+    User = get_user_model()
+    candidates = []
+    for line, row in numbered_rows:
+        row = {str(key).strip().lower(): value for key, value in row.items() if key}
+        email = _text(row, 'email').lower()
+        city = _text(row, 'city')
+        try:
+            validate_email(email)
+        except ValidationError:
+            report.rejected.append((line, email, "Ugyldig e-postadresse."))
+            continue
+        if any(c.isdigit() for c in city):
+            report.rejected.append((line, email, "By kan ikke inneholde tall."))
+            continue
+        username = (_text(row, 'username') or email)[:150]
+        if email in seen or username in seen:
+            report.rejected.append((line, email, "Duplikat i filen."))
+            continue
+        seen.update((email, username))
+        candidates.append((line, {
+            'email': email,
+            'username': username,
+            'first_name': _text(row, 'first_name')[:150],
+            'last_name': _text(row, 'last_name')[:150],
+            'city': city[:100],
+            'password': _text(row, 'password'),
+        }))
+
+    taken = set()
+    for email, username in User.objects.filter(
+        Q(email__in=[data['email'] for _, data in candidates])
+        | Q(username__in=[data['username'] for _, data in candidates])
+    ).values_list('email', 'username'):
+        taken.update((email, username))
+
+    valid = []
+    for line, data in candidates:
+        if data['email'] in taken or data['username'] in taken:
+            report.rejected.append((line, data['email'], "E-post eller brukernavn finnes allerede."))
+        else:
+            valid.append((line, data))
+    return valid
+
+
+def hash_passwords(passwords, pool=None):
+    """
+    Hash raw passwords with the default hasher.
+
+    Args:
+        passwords: Raw passwords; empty ones become unusable passwords
+        pool: Optional ProcessPoolExecutor to hash in parallel
+
+    Returns:
+        list: Encoded password hashes, in input order
+    """
+    to_hash = [password for password in passwords if password]
+    if pool is not None and len(to_hash) >= POOL_THRESHOLD:
+        hashed = iter(pool.map(make_password, to_hash, chunksize=max(1, len(to_hash) // 64)))
+    else:
+        hashed = iter(make_password(password) for password in to_hash)
+    return [next(hashed) if password else make_password(None) for password in passwords]
+
+
+def _create_chunk(valid, pool, report):
+    """
+    Insert users, member profiles and group memberships for one chunk.
+
+    Rows whose email or username was taken since validation are added to
+    the report as rejected.
+    """
+    User = get_user_model()
+    through = User.groups.through
+    hashes = hash_passwords([data['password'] for _, data in valid], pool)
+    users = [
+        User(
+            email=data['email'],
+            username=data['username'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            city=data['city'],
+            password=password,
+        )
+        for (_, data), password in zip(valid, hashes)
+    ]
+    rows = {user.username: (line, user) for (line, _), user in zip(valid, users)}
+    with transaction.atomic():
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        # Password hashes are salted, so they tell our rows from conflicting ones
+        users = [user for user in User.objects.filter(username__in=rows) if user.password == rows[user.username][1].password]
+        for username in rows.keys() - {user.username for user in users}:
+            line, user = rows[username]
+            report.rejected.append((line, user.email, "E-post eller brukernavn finnes allerede."))
+        MemberProfile.objects.bulk_create([MemberProfile(user=user, city=user.city) for user in users])
+        member_group = group_id(MEMBER_GROUP)
+        through.objects.bulk_create([through(user=user, group_id=member_group) for user in users])
+    return users
+
+
+def import_members(csv_file, workers=None, chunk_size=None, invite=True, progress=None):
+    """
+    Stream a CSV of members into the database.
+
+    Args:
+        csv_file: Text file object, or a binary upload (decoded as UTF-8)
+        workers: Processes hashing passwords (default MEMBER_IMPORT_HASH_WORKERS;
+            1 hashes in this process)
+        chunk_size: Rows validated and inserted per transaction
+        invite: Send invitations to members imported without a password
+        progress: Called with the report so far after every chunk
+
+    Returns:
+        ImportReport: Counts, rejected rows and elapsed time
+    """
+    started = time.perf_counter()
+    report = ImportReport()
+    if isinstance(csv_file.read(0), bytes):
+        csv_file = io.TextIOWrapper(csv_file, encoding='utf-8-sig', newline='')
+    chunk_size = chunk_size or getattr(settings, 'MEMBER_IMPORT_CHUNK_SIZE', 1000)
+    workers = workers or getattr(settings, 'MEMBER_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+
+    rows = enumerate(csv.DictReader(csv_file), start=2)  # line 1 is the header
+    seen = set()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            valid = _validate_chunk(chunk, seen, report)
+            if valid:
+                users = _create_chunk(valid, pool, report)
+                report.created += len(users)
+                uninvited = [user.pk for user in users if not user.has_usable_password()]
+                if invite and uninvited:
+                    report.invited += len(uninvited)
+                    schedule_invitations(uninvited)
+            if progress is not None:
+                report.elapsed = time.perf_counter() - started
+                progress(report)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    report.rejected.sort()
+    report.elapsed = time.perf_counter() - started
+    logger.info(
+        "Imported %s members (%s rejected) in %.1fs, %.0f rows/s",
+        report.created, len(report.rejected), report.elapsed, report.rows_per_second,
+    )
+    return report
+
+
+def _save_status(job_id, state, report=None):
+    status = {'state': state}
+    if report is not None:
+        status.update(
+            created=report.created,
+            invited=report.invited,
+            rejected_count=len(report.rejected),
+            rejected=sorted(report.rejected)[:STATUS_REJECTED_LIMIT],
+            elapsed=report.elapsed,
+            rows_per_second=report.rows_per_second,
+        )
+    cache.set(STATUS_KEY.format(job_id), status, STATUS_TTL)
+
+
+def import_status(job_id):
+    """
+    Progress of an import started with start_import().
+
+    Returns:
+        dict or None: 'state' (queued, running, done or failed) and, once
+        running, the counts so far and the first rejected rows
+    """
+    return cache.get(STATUS_KEY.format(job_id))
+
+
+def run_import(job_id, path, invite=True, workers=None):
+    """Import a stored upload, saving progress after every chunk, then delete it."""
+    _save_status(job_id, 'running')
+    try:
+        with default_storage.open(path, 'rb') as csv_file:
+            report = import_members(
+                csv_file, workers=workers, invite=invite,
+                progress=lambda report: _save_status(job_id, 'running', report),
+            )
+    except Exception:
+        logger.exception("Member import %s failed", job_id)
+        _save_status(job_id, 'failed')
+        raise
+    finally:
+        default_storage.delete(path)
+    _save_status(job_id, 'done', report)
+    return report
+
+
+def start_import(upload, invite=True):
+    """
+    Store an uploaded CSV and import it in the background.
+
+    Runs in Celery when MEMBER_IMPORT_ASYNC is on; if the broker cannot
+    be reached it is imported inline, hashing in this process.
+
+    Returns:
+        str: Job id for import_status()
+    """
+    job_id = uuid.uuid4().hex
+    path = default_storage.save(f'{UPLOAD_DIR}/{job_id}.csv', upload)
+    _save_status(job_id, 'queued')
+    if getattr(settings, 'MEMBER_IMPORT_ASYNC', True):
+        try:
+            from .tasks import import_member_file
+            import_member_file.apply_async((job_id, path, invite), retry=False)
+            return job_id
+        except Exception as e:
+            logger.warning("Could not queue member import, importing inline: %s", e)
+    try:
+        run_import(job_id, path, invite, workers=1)
+    except Exception:
+        pass  # Logged by run_import and shown as failed on the status page
+    return job_id
+
+
+def invitation_url(user):
+    """Absolute one-time link where an invited member chooses a password."""
+    path = reverse('accounts:invitation-accept', kwargs={
+        'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': default_token_generator.make_token(user),
+    })
+    return f"{settings.SITE_URL.rstrip('/')}{path}"
+
+
+def send_invitations(user_ids):
+    """
+    Email invitation links to imported members, over one SMTP connection.
+
+    Users who have set a password since the import are skipped.
+
+    Returns:
+        int: Number of invitations sent
+    """
+    User = get_user_model()
+    users = [user for user in User.objects.filter(pk__in=user_ids) if not user.has_usable_password()]
+    messages = [
+        EmailMessage(
+            "Velkommen til Raildrops!",
+            "Hei!\n\nDu er registrert som medlem på Raildrops. Velg et passord her for å logge inn:\n"
+            f"{invitation_url(user)}\n",
+            to=[user.email],
+        )
+        for user in users
+    ]
+    sent = get_connection(fail_silently=True).send_messages(messages) or 0
+    logger.info(f"Sent {sent} of {len(messages)} member invitations")
+    return sent
+
+
+def schedule_invitations(user_ids):
+    """
+    Send invitations after the current transaction commits.
+
+    Runs in Celery when MEMBER_INVITATIONS_ASYNC is on; if the broker
+    cannot be reached they are sent inline.
+    """
+    user_ids = list(user_ids)
+
+    def run():
+        if getattr(settings, 'MEMBER_INVITATIONS_ASYNC', True):
+            try:
+                from .tasks import send_member_invitations
+                send_member_invitations.apply_async((user_ids,), retry=False)
+                return
+            except Exception as e:
+                logger.warning(f"Could not queue member invitations, sending inline: {e}")
+        send_invitations(user_ids)
+
+    transaction.on_commit(run)
@@ -0,0 +1,168 @@
+"""
+Location updates from browser geolocation.
+
+The geolocation script reports the user's city on page loads, so most
+calls repeat the city already stored. set_city() keeps them cheap:
+
+- coordinates are turned into a city by the offline geocoder
+  (utils/geocoding.py) and typed names are stored in the geocoder's
+  canonical spelling, so members land in the same city names businesses
+  are matched against
+- a city equal to the stored one after normalize_city() writes nothing
+  (request.user and its member profile are already loaded, so this costs
+  no query)
+- a changed city is written with one UPDATE of the city column per table
+  (user and member profile) instead of full save()/full_clean() rounds
+- repeating the city written for a user in the last
+  LOCATION_UPDATE_DEBOUNCE seconds writes nothing either, so stale copies
+  of the user (other tabs, the authentication cache) do not rewrite it;
+  a different city is always written
+
+queryset.update() sends no post_save, so the user is dropped from the
+authentication cache here.
+"""
+
+import logging
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from giveaways.services.entries import normalize_city
+from utils.geocoding import canonical_city, reverse_geocode
+
+from .backends import invalidate_cached_user
+from .models import MemberProfile
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_KEY = 'location:debounce:{}'
+MAX_CITY_LENGTH = 100
+
+
+class InvalidCity(ValueError):
+    """The submitted city cannot be stored."""
+
+
+def clean_city(city):
+    """
+    Validate and sanitize a city name from the client.
+
+    Raises:
+        InvalidCity: With a user-facing message
+    """
+    if not city or not isinstance(city, str):
+        raise InvalidCity('By er påkrevd')
+    if len(city) > MAX_CITY_LENGTH:
+        raise InvalidCity('Bynavn er for langt')
+    # Sanitize input to prevent XSS
+    city = strip_tags(city).strip()
+    if not city:
+        raise InvalidCity('By er påkrevd')
+    if re.search(r'[0-9]', city):
+        raise InvalidCity('Bynavn kan ikke inneholde tall')
+    return canonical_city(city)
+
+
+def city_from_coordinates(latitude, longitude):
+    """
+    Return the canonical city for browser coordinates.
+
+    Raises:
+        InvalidCity: If the position is invalid or not near a known town
+    """
+    place = reverse_geocode(latitude, longitude)
+    if place is None:
+        raise InvalidCity('Fant ingen by for posisjonen')
+    return place.name
+
+
+def city_from_payload(data):
+    """
+    Return the canonical city from a reading: coordinates
+    ('latitude'/'longitude') when given, otherwise the 'city' name.
+
+    Raises:
+        InvalidCity: With a user-facing message
+    """
+    if not isinstance(data, dict):
+        raise InvalidCity('By er påkrevd')
+    if data.get('latitude') is not None and data.get('longitude') is not None:
+        return city_from_coordinates(data['latitude'], data['longitude'])
+    return clean_city(data.get('city'))
+
+
+def _normalize(city):
+    return normalize_city(city or '')
+
+
+def _profile(user):
+    try:
+        return user.member_profile
+    except MemberProfile.DoesNotExist:
+        return None
+
+
+def set_city(user, city):
+    """
+    Store a user's city if it changed.
+
+    Args:
+        user: The user (normally request.user)
+        city: Cleaned city name (see clean_city)
+
+    Returns:
+        str: 'unchanged', 'debounced' or 'updated'
+    """
+    profile = _profile(user)
+    normalized = _normalize(city)
+    if _normalize(user.city) == normalized and (profile is None or _normalize(profile.city) == normalized):
+        return 'unchanged'
+
+    debounce = getattr(settings, 'LOCATION_UPDATE_DEBOUNCE', 60)
+    if debounce and cache.get(DEBOUNCE_KEY.format(user.pk)) == normalized:
+        return 'debounced'
+
+    with transaction.atomic():
+        get_user_model().objects.filter(pk=user.pk).update(city=city)
+        if profile is not None:
+            MemberProfile.objects.filter(pk=profile.pk).update(city=city)
+    invalidate_cached_user(user.pk)
+    if debounce:
+        cache.set(DEBOUNCE_KEY.format(user.pk), normalized, debounce)
+    user.city = city
+    if profile is not None:
+        profile.city = city
+    logger.info("User location updated via geolocation: %s -> %s", user.username, city)
+    return 'updated'
+
+
+def latest_city(readings):
+    """
+    Pick the city to store from a batch of geolocation readings.
+
+    Readings are {'latitude': ..., 'longitude': ..., 'timestamp': ...}
+    or {'city': ..., 'timestamp': ...} dicts (or plain city strings); the
+    newest valid reading wins.
+
+    Raises:
+        InvalidCity: If no reading holds a valid city
+    """
+    if not isinstance(readings, list) or not readings:
+        raise InvalidCity('By er påkrevd')
+    candidates = []
+    for position, reading in enumerate(readings[:50]):
+        if isinstance(reading, str):
+            reading = {'city': reading}
+        try:
+            city = city_from_payload(reading)
+        except InvalidCity:
+            continue
+        timestamp = reading.get('timestamp')
+        candidates.append((timestamp if isinstance(timestamp, (int, float)) else 0, position, city))
+    if not candidates:
+        raise InvalidCity('Ingen gyldige lokasjoner')
+    return max(candidates)[2]
@@ -0,0 +1,106 @@
+"""
+Management command to measure database roundtrips per logged-in request.
+
+Requests a page as a logged-in user with each session engine, with and
+without the cached user loader, and reports how many queries went to the
+session table, to the user table and in total. Everything runs inside a
+transaction that is rolled back, so no data is left behind.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.backends import invalidate_cached_user
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Reports DB queries per logged-in request for each session engine, with and without the user cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=None,
+            help='Page to request (default: the member dashboard)',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Number of measured requests per configuration',
+        )
+        parser.add_argument(
+            '--engines',
+            nargs='+',
+            choices=sorted(settings.SESSION_ENGINES),
+            default=['db', 'cached_db', 'cache', 'signed_cookies'],
+            help='Session engines to compare',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or reverse('accounts:dashboard')
+        n = options['requests']
+        user_cache_timeout = settings.AUTH_USER_CACHE_TIMEOUT or 300
+
+        rows = []
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username='session-benchmark',
+                email='session-benchmark@example.invalid',
+                password=None,
+            )
+            for engine in options['engines']:
+                for timeout in (0, user_cache_timeout):
+                    rows.append(self._measure(engine, timeout, user, path, n))
+            transaction.set_rollback(True)
+        invalidate_cached_user(user.pk)
+
+        self.stdout.write(f'{n} requests to {path}, per-request averages:')
+        self.stdout.write(
+            f'{"engine":<16}{"user cache":>12}{"session q":>12}{"user q":>10}{"total q":>10}{"ms":>10}'
+        )
+        for row in rows:
+            self.stdout.write(
+                f'{row["engine"]:<16}{row["user_cache"]:>12}{row["session"]:>12.1f}'
+                f'{row["user"]:>10.1f}{row["total"]:>10.1f}{row["ms"]:>10.2f}'
+            )
+
+    def _measure(self, engine, timeout, user, path, n):
+        overrides = {
+            'SESSION_ENGINE': settings.SESSION_ENGINES[engine],
+            'AUTH_USER_CACHE_TIMEOUT': timeout,
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+        }
+        with override_settings(**overrides):
+            invalidate_cached_user(user.pk)
+            client = Client()
+            client.force_login(user)
+            # Warm up so the first cache fill is not counted
+            response = client.get(path)
+            if response.status_code != 200:
+                self.stderr.write(self.style.WARNING(f'{path} returned {response.status_code} with {engine}'))
+
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                for _ in range(n):
+                    client.get(path)
+            elapsed = time.perf_counter() - start
+
+        session_table = 'django_session'
+        user_lookup = f'"{User._meta.db_table}"."{User._meta.pk.column}" = '
+        sqls = [q['sql'] for q in ctx.captured_queries]
+        return {
+            'engine': engine,
+            'user_cache': 'on' if timeout else 'off',
+            'session': sum(session_table in sql for sql in sqls) / n,
+            'user': sum(user_lookup in sql for sql in sqls) / n,
+            'total': len(sqls) / n,
+            'ms': elapsed * 1000 / n,
+        }
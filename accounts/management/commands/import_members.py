@@ -0,0 +1,44 @@
+"""
+Management command to import members from a CSV file.
+
+Streams the file in chunks (see accounts/imports.py) and prints a
+throughput report and the rejected rows. Passwords in the file are
+hashed in a process pool; members without one get an invitation email.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.imports import import_members
+
+
+class Command(BaseCommand):
+    help = 'Imports members from a CSV file (email, first_name, last_name, city, username, password).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows validated and inserted per transaction')
+        parser.add_argument('--workers', type=int, default=None, help='Processes hashing passwords (1 = no pool)')
+        parser.add_argument('--no-invite', action='store_true', help='Do not email members imported without a password')
+        parser.add_argument('--show-rejects', type=int, default=20, help='Rejected rows to list (0 = none)')
+
+    def handle(self, *args, **options):
+        try:
+            csv_file = open(options['path'], encoding='utf-8-sig', newline='')
+        except OSError as e:
+            raise CommandError(f"Could not open {options['path']}: {e}")
+
+        with csv_file:
+            report = import_members(
+                csv_file,
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+                invite=not options['no_invite'],
+            )
+
+        for line, email, reason in report.rejected[:options['show_rejects']]:
+            self.stdout.write(f'  line {line}: {email or "-"}: {reason}')
+        if len(report.rejected) > options['show_rejects']:
+            self.stdout.write(f'  ... and {len(report.rejected) - options["show_rejects"]} more')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.created} members ({report.invited} invited, {len(report.rejected)} rejected) '
+            f'in {report.elapsed:.1f}s: {report.rows_per_second:.0f} rows/s.'
+        ))
@@ -0,0 +1,36 @@
+"""
+Management command to reconcile role groups for all users.
+
+Replaces the old add_to_members.py script. Puts every member in the
+"Members" group and every business user in "Bedrift" with a few
+set-based queries, and moves users out of the legacy "Medlem" group.
+Run it after importing users in bulk or restoring a database.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.roles import reconcile_roles
+
+
+class Command(BaseCommand):
+    help = 'Reconciles the Members/Bedrift role groups for all users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Also remove users from role groups that do not match their account type and delete legacy groups',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without writing them')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        report = reconcile_roles(prune=options['prune'], dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        for name, counts in report.items():
+            self.stdout.write(f"{name:<10} +{counts['added']:<8} -{counts['removed']}")
+        verb = 'Would change' if options['dry_run'] else 'Changed'
+        changes = sum(counts['added'] + counts['removed'] for counts in report.values())
+        self.stdout.write(self.style.SUCCESS(f'{verb} {changes} memberships in {elapsed:.2f}s.'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_memberprofile_city_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memberprofile',
+            name='profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/JPEG versions of profile_image (see utils.images).'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/JPEG versions of profile_image (see utils.images).'),
+        ),
+    ]
@@ -24,6 +24,12 @@ class User(AbstractUser):
         null=True,
         help_text="Profile image for the user."
     )
+    profile_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/JPEG versions of profile_image (see utils.images)."
+    )
     city = models.CharField(
         max_length=100, 
         blank=True, 
@@ -112,6 +118,7 @@ class MemberProfile(models.Model):
         user: Link to the User model this profile belongs to
         city: The member's city/location for giveaway participation
         profile_image: Optional profile picture for the member
+        profile_image_variants: Resized versions of profile_image, filled asynchronously
         created_at: Timestamp when this profile was created
     """
     user = models.OneToOneField(
@@ -133,6 +140,12 @@ class MemberProfile(models.Model):
         null=True,
         help_text="Member's profile picture"
     )
+    profile_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/JPEG versions of profile_image (see utils.images)."
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         db_index=True,  # Add index for timestamp-based queries
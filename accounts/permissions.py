@@ -2,11 +2,12 @@ def user_is_member(user) -> bool:
     """
     Returnerer True hvis brukeren er autentisert, IKKE bedriftsbruker, og medlem av gruppen 'Members'.
     Brukes for å gi tilgang til medlemsfunksjoner.
+    Bruker gruppene som EmailBackend.get_user allerede har hentet, uten ny spørring.
     """
     return (
         user.is_authenticated
         and not hasattr(user, "business_account")
-        and user.groups.filter(name="Members").exists()
+        and any(group.name == "Members" for group in user.groups.all())
     )
 
 
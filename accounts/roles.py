@@ -0,0 +1,134 @@
+"""
+Role groups for members and businesses.
+
+Every user belongs to exactly one role group: MEMBER_GROUP for members,
+BUSINESS_GROUP for users with a business account. Older registrations
+used "Medlem" for members; LEGACY_GROUPS maps such names to the group
+that replaces them.
+
+- group_id(): id of a role group, looked up (or created) once per process
+- add_role(): put a newly registered user in a role group
+- reconcile_roles(): set-based sync of every user's role groups, used by
+  the sync_roles management command
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import transaction
+
+from .backends import user_cache_key
+
+logger = logging.getLogger(__name__)
+
+MEMBER_GROUP = 'Members'
+BUSINESS_GROUP = 'Bedrift'
+ROLE_GROUPS = (MEMBER_GROUP, BUSINESS_GROUP)
+LEGACY_GROUPS = {'Medlem': MEMBER_GROUP}
+
+BATCH_SIZE = 1000
+
+_group_ids = {}
+
+
+def group_id(name):
+    """Return the id of a role group, creating the group on first use."""
+    pk = _group_ids.get(name)
+    if pk is None:
+        pk = Group.objects.get_or_create(name=name)[0].pk
+        _group_ids[name] = pk
+    return pk
+
+
+def clear_group_ids(**kwargs):
+    """Forget cached group ids (connected to Group deletes and post_migrate)."""
+    _group_ids.clear()
+
+
+def add_role(user, name):
+    """
+    Add a user to a role group by cached id.
+
+    Goes through user.groups.add(), so m2m_changed still drops the user
+    from the authentication cache.
+    """
+    user.groups.add(group_id(name))
+
+
+def _invalidate(user_ids):
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        cache.delete_many([user_cache_key(pk) for pk in user_ids[start:start + BATCH_SIZE]])
+
+
+def reconcile_roles(prune=False, dry_run=False):
+    """
+    Bring every user's role groups in line with their account type.
+
+    Memberships are inserted and deleted directly in the groups through
+    table, a few set-based queries per group rather than queries per
+    user. Legacy group members are moved to the group replacing it.
+
+    Args:
+        prune: Also remove users from the role group that does not match
+            their account type, and delete emptied legacy groups
+        dry_run: Count changes without writing them
+
+    Returns:
+        dict: Number of memberships added and removed per group
+    """
+    User = get_user_model()
+    through = User.groups.through
+    business_users = User.objects.filter(business_account__isnull=False)
+    members = User.objects.filter(business_account__isnull=True)
+    wanted = {MEMBER_GROUP: members, BUSINESS_GROUP: business_users}
+    report = {name: {'added': 0, 'removed': 0} for name in (*ROLE_GROUPS, *LEGACY_GROUPS)}
+    touched = set()
+
+    with transaction.atomic():
+        ids = {name: group_id(name) for name in ROLE_GROUPS}
+        legacy_ids = dict(Group.objects.filter(name__in=LEGACY_GROUPS).values_list('name', 'pk'))
+
+        for name, users in wanted.items():
+            missing = list(users.exclude(groups=ids[name]).values_list('pk', flat=True))
+            report[name]['added'] = len(missing)
+            touched.update(missing)
+            if not dry_run:
+                through.objects.bulk_create(
+                    [through(user_id=pk, group_id=ids[name]) for pk in missing],
+                    batch_size=BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+
+        stale = {name: [] for name in ROLE_GROUPS}
+        if prune:
+            stale[MEMBER_GROUP] = list(business_users.filter(groups=ids[MEMBER_GROUP]).values_list('pk', flat=True))
+            stale[BUSINESS_GROUP] = list(members.filter(groups=ids[BUSINESS_GROUP]).values_list('pk', flat=True))
+        for name, legacy_id in legacy_ids.items():
+            stale[name] = list(through.objects.filter(group_id=legacy_id).values_list('user_id', flat=True))
+
+        for name, user_ids in stale.items():
+            gid = ids.get(name) or legacy_ids[name]
+            report[name]['removed'] = len(user_ids)
+            touched.update(user_ids)
+            if user_ids and not dry_run and (prune or name in legacy_ids):
+                for start in range(0, len(user_ids), BATCH_SIZE):
+                    through.objects.filter(
+                        group_id=gid, user_id__in=user_ids[start:start + BATCH_SIZE]
+                    ).delete()
+
+        if prune and legacy_ids and not dry_run:
+            Group.objects.filter(pk__in=legacy_ids.values()).delete()
+
+        if dry_run:
+            # Undo groups created by group_id()
+            transaction.set_rollback(True)
+            clear_group_ids()
+        else:
+            # Bulk through-table writes send no m2m_changed signals
+            user_ids = list(touched)
+            transaction.on_commit(lambda: _invalidate(user_ids))
+
+    logger.info(f"Role groups reconciled{' (dry run)' if dry_run else ''}: {report}")
+    return report
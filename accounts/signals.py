@@ -0,0 +1,54 @@
+"""
+Signal handlers for the accounts app.
+
+Keeps the EmailBackend user cache consistent with the database. The cached
+user carries its business account, member profile and groups, so changes
+to any of them drop the entry.
+
+Role group ids cached by accounts.roles are forgotten when a group is
+deleted or the database is migrated.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_cached_user
+from .roles import clear_group_ids
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Drop the cached user whenever the user row changes."""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender='accounts.MemberProfile')
+@receiver(post_delete, sender='accounts.MemberProfile')
+@receiver(post_save, sender='businesses.Business')
+@receiver(post_delete, sender='businesses.Business')
+def invalidate_owner_cache(sender, instance, **kwargs):
+    """Drop the cached owner of a member profile or business account."""
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_group_members_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached users whose group memberships changed."""
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_cached_user(instance.pk)
+    elif action == 'pre_clear':
+        # group.user_set.clear() does not report which users it removes
+        for user_id in instance.user_set.values_list('pk', flat=True):
+            invalidate_cached_user(user_id)
+    elif action in ('post_add', 'post_remove'):
+        for user_id in pk_set:
+            invalidate_cached_user(user_id)
+
+
+post_delete.connect(clear_group_ids, sender=Group, dispatch_uid='accounts.roles.group_deleted')
+post_migrate.connect(clear_group_ids, dispatch_uid='accounts.roles.migrated')
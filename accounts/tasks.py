@@ -0,0 +1,40 @@
+"""
+Celery tasks for accounts.
+"""
+
+import logging
+from importlib import import_module
+
+from celery import shared_task
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='accounts.clear_expired_sessions')
+def clear_expired_sessions() -> None:
+    """
+    Remove expired sessions from the configured session store.
+
+    Database-backed engines (db, cached_db) otherwise keep every expired row
+    in django_session. Cache and signed-cookie sessions expire on their own,
+    so this is a no-op for them.
+    """
+    engine = import_module(settings.SESSION_ENGINE)
+    engine.SessionStore.clear_expired()
+    logger.info(f"Cleared expired sessions for {settings.SESSION_ENGINE}")
+
+
+@shared_task(name='accounts.send_member_invitations')
+def send_member_invitations(user_ids) -> int:
+    """Email invitation links to members imported without a password."""
+    from .imports import send_invitations
+    return send_invitations(user_ids)
+
+
+@shared_task(name='accounts.import_member_file')
+def import_member_file(job_id, path, invite=True) -> dict:
+    """Import a member CSV stored by the admin upload, reporting progress to the cache."""
+    from .imports import import_status, run_import
+    run_import(job_id, path, invite)
+    return import_status(job_id)
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.location import set_city
+from accounts.models import MemberProfile
+
+User = get_user_model()
+
+
+@pytest.fixture
+def member(client):
+    cache.clear()
+    user = User.objects.create_user(username='geo', email='geo@example.com', password='pw12345', city='Oslo')
+    MemberProfile.objects.create(user=user, city='Oslo')
+    client.force_login(user)
+    yield user
+    cache.clear()
+
+
+def post(client, name, payload):
+    return client.post(reverse(name), json.dumps(payload), content_type='application/json')
+
+
+def writes(ctx):
+    return [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE') and 'session' not in q['sql']]
+
+
+@pytest.mark.django_db
+def test_unchanged_city_writes_nothing(client, member):
+    with CaptureQueriesContext(connection) as ctx:
+        response = post(client, 'accounts:update-location', {'city': ' oslo '})
+    assert response.json()['status'] == 'unchanged'
+    assert writes(ctx) == []
+
+
+@pytest.mark.django_db
+def test_changed_city_updates_only_city_column(client, member):
+    with CaptureQueriesContext(connection) as ctx:
+        response = post(client, 'accounts:update-location', {'city': 'Bergen'})
+    assert response.json()['status'] == 'updated'
+    updates = writes(ctx)
+    assert len(updates) == 2
+    assert all('SET "city"' in sql and ',' not in sql.split('SET', 1)[1].split('WHERE')[0] for sql in updates)
+    member.refresh_from_db()
+    assert member.city == 'Bergen'
+    assert member.member_profile.city == 'Bergen'
+
+
+@pytest.mark.django_db
+def test_repeated_city_is_debounced_per_user(member, settings):
+    settings.LOCATION_UPDATE_DEBOUNCE = 60
+    stale = User.objects.get(pk=member.pk)
+    assert set_city(member, 'Bergen') == 'updated'
+    # A copy of the user loaded before the write still says Oslo
+    assert set_city(stale, 'Bergen') == 'debounced'
+
+
+@pytest.mark.django_db
+def test_changed_city_within_debounce_window_is_written(client, member, settings):
+    settings.LOCATION_UPDATE_DEBOUNCE = 60
+    assert post(client, 'accounts:update-location', {'city': 'Bergen'}).json()['status'] == 'updated'
+    assert post(client, 'accounts:update-location', {'city': 'Trondheim'}).json()['status'] == 'updated'
+    member.refresh_from_db()
+    assert member.city == 'Trondheim'
+    assert member.member_profile.city == 'Trondheim'
+
+
+@pytest.mark.django_db
+def test_invalid_city_rejected(client, member):
+    assert post(client, 'accounts:update-location', {'city': 'Oslo 1'}).status_code == 400
+    assert post(client, 'accounts:update-location', {'city': '<b></b>'}).status_code == 400
+    assert client.post(reverse('accounts:update-location'), 'x', content_type='application/json').status_code == 400
+
+
+@pytest.mark.django_db
+def test_batch_uses_newest_reading_once_per_session(client, member):
+    response = post(client, 'accounts:update-location-batch', {'readings': [
+        {'city': 'Bergen', 'timestamp': 2},
+        {'city': 'Tromsø', 'timestamp': 3},
+        {'city': 'Bodø 8', 'timestamp': 4},
+        {'city': 'Stavanger', 'timestamp': 1},
+    ]})
+    assert response.json() == {'success': True, 'city': 'Tromsø', 'status': 'updated'}
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = post(client, 'accounts:update-location-batch', {'readings': ['Bergen']})
+    assert response.json()['status'] == 'already-synced'
+    assert writes(ctx) == []
+    member.refresh_from_db()
+    assert member.city == 'Tromsø'
+
+
+@pytest.mark.django_db
+def test_coordinates_are_geocoded_to_canonical_city(client, member):
+    response = post(client, 'accounts:update-location', {'latitude': 63.4305, 'longitude': 10.3951})
+    assert response.json()['city'] == 'Trondheim'
+    member.refresh_from_db()
+    assert member.city == 'Trondheim'
+
+    response = post(client, 'accounts:update-location', {'latitude': 48.85, 'longitude': 2.35})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_typed_city_stored_in_canonical_spelling(client, member, settings):
+    settings.LOCATION_UPDATE_DEBOUNCE = 0
+    post(client, 'accounts:update-location', {'city': 'tromso'})
+    member.refresh_from_db()
+    assert member.city == 'Tromsø'
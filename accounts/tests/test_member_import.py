@@ -0,0 +1,165 @@
+import io
+import re
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts import imports
+from accounts.imports import import_members, run_import
+from accounts.models import MemberProfile
+from accounts.permissions import user_is_member
+from accounts.roles import clear_group_ids
+
+User = get_user_model()
+
+HEADER = 'email,first_name,last_name,city,password\n'
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher(settings):
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.MEMBER_INVITATIONS_ASYNC = False
+    settings.MEMBER_IMPORT_ASYNC = False
+    clear_group_ids()
+    yield
+    clear_group_ids()
+
+
+def csv_text(*rows):
+    return io.StringIO(HEADER + ''.join(rows))
+
+
+@pytest.mark.django_db
+def test_import_creates_users_profiles_and_memberships():
+    report = import_members(csv_text(
+        'Kari@Example.com,Kari,Nordmann,Bergen,hemmelig1\n',
+        'ola@example.com,Ola,,Oslo,\n',
+    ), workers=1)
+
+    assert report.created == 2
+    kari = User.objects.get(email='kari@example.com')
+    assert kari.check_password('hemmelig1')
+    assert kari.member_profile.city == 'Bergen'
+    assert user_is_member(kari)
+    assert not User.objects.get(email='ola@example.com').has_usable_password()
+
+
+@pytest.mark.django_db
+def test_rejects_invalid_duplicate_and_existing_rows():
+    User.objects.create_user(username='finnes', email='finnes@example.com', password='pw12345')
+    report = import_members(csv_text(
+        'ny@example.com,,,Oslo,\n',
+        'ikke-en-epost,,,Oslo,\n',
+        'NY@example.com,,,Oslo,\n',
+        'finnes@example.com,,,Oslo,\n',
+        'tall@example.com,,,Oslo 1,\n',
+    ), workers=1, invite=False)
+
+    assert report.created == 1
+    assert [line for line, _, _ in report.rejected] == [3, 4, 5, 6]
+    assert MemberProfile.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_query_count_is_per_chunk_not_per_row():
+    def run(count, offset):
+        rows = [f'user{offset + i}@example.com,,,Oslo,\n' for i in range(count)]
+        with CaptureQueriesContext(connection) as ctx:
+            import_members(csv_text(*rows), workers=1, chunk_size=500, invite=False)
+        return len(ctx.captured_queries)
+
+    run(1, 0)  # creates the Members group
+    assert run(5, 100) == run(50, 200)
+
+
+@pytest.mark.django_db
+def test_passwords_hashed_in_process_pool():
+    rows = [f'pool{i}@example.com,,,Oslo,passord{i}\n' for i in range(40)]
+    report = import_members(csv_text(*rows), workers=2)
+    assert report.created == 40
+    assert User.objects.get(email='pool7@example.com').check_password('passord7')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_invitation_link_sets_password(client):
+    import_members(csv_text('invitert@example.com,,,Oslo,\n'), workers=1)
+
+    assert len(mail.outbox) == 1
+    link = re.search(r'https?://[^/]+(/\S+)', mail.outbox[0].body).group(1)
+    response = client.get(link, follow=True)
+    response = client.post(response.redirect_chain[-1][0], {
+        'new_password1': 'Et-sterkt-passord-42',
+        'new_password2': 'Et-sterkt-passord-42',
+    })
+    assert response.status_code == 302
+    assert response['Location'] == reverse('accounts:member-login')
+    assert User.objects.get(email='invitert@example.com').check_password('Et-sterkt-passord-42')
+
+
+@pytest.mark.django_db
+def test_import_command_reports_throughput(tmp_path):
+    path = tmp_path / 'members.csv'
+    path.write_text(HEADER + 'kommando@example.com,,,Oslo,pw\nugyldig,,,Oslo,\n', encoding='utf-8')
+    out = io.StringIO()
+    call_command('import_members', str(path), '--workers', '1', '--no-invite', stdout=out)
+    assert 'Imported 1 members (0 invited, 1 rejected)' in out.getvalue()
+    assert 'rows/s' in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_row_taken_after_validation_rejects_only_that_row():
+    validate = imports._validate_chunk
+
+    def validate_then_signup(*args):
+        valid = validate(*args)
+        User.objects.create_user(username='signup', email='samtidig@example.com', password='pw12345')
+        return valid
+
+    with mock.patch.object(imports, '_validate_chunk', side_effect=validate_then_signup):
+        report = import_members(csv_text(
+            'forst@example.com,,,Oslo,\n',
+            'samtidig@example.com,,,Oslo,\n',
+        ), workers=1, invite=False)
+
+    assert report.created == 1
+    assert report.rejected == [(3, 'samtidig@example.com', 'E-post eller brukernavn finnes allerede.')]
+    assert MemberProfile.objects.filter(user__email='forst@example.com').exists()
+
+
+@pytest.mark.django_db
+def test_admin_import_page(client, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw12345')
+    client.force_login(admin)
+    upload = io.BytesIO((HEADER + 'admin-import@example.com,,,Tromsø,\nugyldig,,,Oslo,\n').encode('utf-8'))
+    upload.name = 'members.csv'
+    response = client.post(reverse('admin:accounts_user_import'), {'file': upload}, follow=True)
+    assert response.status_code == 200
+    status = response.context['status']
+    assert (status['state'], status['created'], status['rejected_count']) == ('done', 1, 1)
+    assert not list(tmp_path.rglob('*.csv'))
+    assert client.get(reverse('admin:accounts_user_changelist')).status_code == 200
+
+
+@pytest.mark.django_db
+def test_admin_upload_is_queued(client, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEMBER_IMPORT_ASYNC = True
+    client.force_login(User.objects.create_superuser(username='admin', email='admin@example.com', password='pw12345'))
+    upload = io.BytesIO((HEADER + 'ko@example.com,,,Oslo,\n').encode('utf-8'))
+    upload.name = 'members.csv'
+    with mock.patch('accounts.tasks.import_member_file.apply_async') as apply_async:
+        response = client.post(reverse('admin:accounts_user_import'), {'file': upload}, follow=True)
+    job_id, path, invite = apply_async.call_args.args[0]
+    assert response.context['status'] == {'state': 'queued'}
+    assert not User.objects.filter(email='ko@example.com').exists()
+
+    run_import(job_id, path, invite)
+    response = client.get(reverse('admin:accounts_user_import_status', args=[job_id]))
+    assert response.context['status']['created'] == 1
@@ -0,0 +1,102 @@
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.backends import EmailBackend, invalidate_cached_user
+from accounts.roles import BUSINESS_GROUP, MEMBER_GROUP, add_role, clear_group_ids, group_id, reconcile_roles
+from businesses.models import Business
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def fresh_group_ids():
+    # Group rows are rolled back between tests; cached ids must go too
+    clear_group_ids()
+    yield
+    clear_group_ids()
+
+
+def make_business_user(name):
+    user = User.objects.create_user(username=name, email=f'{name}@example.com', password='pw12345')
+    Business.objects.create(user=user, admin=user, name=name, city='Oslo')
+    return user
+
+
+def group_names(user):
+    return sorted(user.groups.values_list('name', flat=True))
+
+
+@pytest.mark.django_db
+def test_group_id_is_cached_after_first_lookup():
+    pk = group_id(MEMBER_GROUP)
+    with CaptureQueriesContext(connection) as ctx:
+        assert group_id(MEMBER_GROUP) == pk
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_add_role_invalidates_cached_user(settings):
+    settings.AUTH_USER_CACHE_TIMEOUT = 60
+    user = User.objects.create_user(username='rolle', email='rolle@example.com', password='pw12345')
+    backend = EmailBackend()
+    backend.get_user(user.pk)
+    add_role(user, MEMBER_GROUP)
+    assert [g.name for g in backend.get_user(user.pk).groups.all()] == [MEMBER_GROUP]
+    invalidate_cached_user(user.pk)
+
+
+@pytest.mark.django_db
+def test_reconcile_assigns_roles_and_migrates_legacy_group():
+    legacy = Group.objects.create(name='Medlem')
+    members = [
+        User.objects.create_user(username=f'm{i}', email=f'm{i}@example.com', password='pw12345')
+        for i in range(5)
+    ]
+    members[0].groups.add(legacy)
+    business_user = make_business_user('kafe')
+
+    report = reconcile_roles()
+    assert report[MEMBER_GROUP]['added'] == 5
+    assert report[BUSINESS_GROUP]['added'] == 1
+    assert report['Medlem']['removed'] == 1
+    assert all(group_names(user) == [MEMBER_GROUP] for user in members)
+    assert group_names(business_user) == [BUSINESS_GROUP]
+
+    # A fixed number of queries however many users need a role
+    for i in range(5, 40):
+        User.objects.create_user(username=f'm{i}', email=f'm{i}@example.com', password='pw12345')
+    with CaptureQueriesContext(connection) as ctx:
+        assert reconcile_roles()[MEMBER_GROUP]['added'] == 35
+    assert len(ctx.captured_queries) <= 8
+
+    assert reconcile_roles()[MEMBER_GROUP]['added'] == 0
+
+
+@pytest.mark.django_db
+def test_prune_removes_mismatched_roles_and_legacy_groups():
+    Group.objects.create(name='Medlem')
+    business_user = make_business_user('butikk')
+    business_user.groups.add(group_id(MEMBER_GROUP))
+
+    report = reconcile_roles(prune=True)
+    assert report[MEMBER_GROUP]['removed'] == 1
+    assert group_names(business_user) == [BUSINESS_GROUP]
+    assert not Group.objects.filter(name='Medlem').exists()
+
+
+@pytest.mark.django_db
+def test_sync_roles_dry_run_writes_nothing():
+    User.objects.create_user(username='tørr', email='dry@example.com', password='pw12345')
+    out = io.StringIO()
+    call_command('sync_roles', '--dry-run', stdout=out)
+    assert 'Would change 1 memberships' in out.getvalue()
+    assert not Group.objects.filter(name__in=[MEMBER_GROUP, BUSINESS_GROUP]).exists()
+
+    call_command('sync_roles', stdout=out)
+    assert User.objects.get(username='tørr').groups.filter(name=MEMBER_GROUP).exists()
@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import MemberProfile
+from accounts.backends import EmailBackend, invalidate_cached_user
+from accounts.tasks import clear_expired_sessions
+from businesses.models import Business
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_get_user_is_served_from_cache(settings):
+    settings.AUTH_USER_CACHE_TIMEOUT = 60
+    user = User.objects.create_user(username='cacheuser', email='cache@example.com', password='pw12345')
+    backend = EmailBackend()
+    assert backend.get_user(user.pk) == user
+    with CaptureQueriesContext(connection) as ctx:
+        assert backend.get_user(user.pk) == user
+    assert len(ctx.captured_queries) == 0
+    invalidate_cached_user(user.pk)
+
+
+@pytest.mark.django_db
+def test_user_save_invalidates_cached_user(settings):
+    settings.AUTH_USER_CACHE_TIMEOUT = 60
+    user = User.objects.create_user(username='cacheuser', email='cache@example.com', password='pw12345')
+    backend = EmailBackend()
+    backend.get_user(user.pk)
+    user.first_name = 'Endret'
+    user.save()
+    assert backend.get_user(user.pk).first_name == 'Endret'
+    invalidate_cached_user(user.pk)
+
+
+@pytest.mark.django_db
+def test_logged_in_request_skips_session_and_user_queries(client, settings):
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    settings.AUTH_USER_CACHE_TIMEOUT = 60
+    user = User.objects.create_user(username='cacheuser', email='cache@example.com', password='pw12345')
+    client.force_login(user)
+    url = reverse('accounts:dashboard')
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    sqls = [q['sql'] for q in ctx.captured_queries]
+    assert not any('django_session' in sql for sql in sqls)
+    assert not any(f'"{User._meta.db_table}"."id" = ' in sql for sql in sqls)
+    invalidate_cached_user(user.pk)
+
+
+@pytest.mark.django_db
+def test_clear_expired_sessions_removes_only_expired_rows(settings):
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    now = timezone.now()
+    Session.objects.create(session_key='expired', session_data='', expire_date=now - datetime.timedelta(days=1))
+    Session.objects.create(session_key='active', session_data='', expire_date=now + datetime.timedelta(days=1))
+    clear_expired_sessions()
+    assert list(Session.objects.values_list('session_key', flat=True)) == ['active']
+
+
+@pytest.mark.django_db
+def test_cached_user_includes_profile_business_and_groups(settings):
+    settings.AUTH_USER_CACHE_TIMEOUT = 60
+    user = User.objects.create_user(username='cacheuser', email='cache@example.com', password='pw12345')
+    MemberProfile.objects.create(user=user, city='Oslo')
+    user.groups.add(Group.objects.create(name='Members'))
+    backend = EmailBackend()
+    backend.get_user(user.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        cached = backend.get_user(user.pk)
+        assert cached.member_profile.city == 'Oslo'
+        assert not hasattr(cached, 'business_account')
+        assert [g.name for g in cached.groups.all()] == ['Members']
+    assert len(ctx.captured_queries) == 0
+    invalidate_cached_user(user.pk)
+
+
+@pytest.mark.django_db
+def test_profile_business_and_group_changes_invalidate_cached_user(settings):
+    settings.AUTH_USER_CACHE_TIMEOUT = 60
+    user = User.objects.create_user(username='cacheuser', email='cache@example.com', password='pw12345')
+    backend = EmailBackend()
+
+    backend.get_user(user.pk)
+    MemberProfile.objects.create(user=user, city='Bergen')
+    assert backend.get_user(user.pk).member_profile.city == 'Bergen'
+
+    Business.objects.create(user=user, admin=user, name='Kafé', city='Bergen')
+    assert backend.get_user(user.pk).business_account.name == 'Kafé'
+
+    group = Group.objects.create(name='Members')
+    group.user_set.add(user)
+    assert [g.name for g in backend.get_user(user.pk).groups.all()] == ['Members']
+    group.user_set.clear()
+    assert list(backend.get_user(user.pk).groups.all()) == []
+    invalidate_cached_user(user.pk)
@@ -1,7 +1,13 @@
+import datetime
+
 import pytest
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.test import Client
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Entry, Giveaway
 
 
 User = get_user_model()
@@ -89,3 +95,20 @@ def test_dashboard_requires_login(client):
     response = client.get(url)
     # Bør redirecte til login
     assert response.status_code in (302, 401)
+
+@pytest.mark.django_db
+def test_dashboard_lists_participations(client):
+    owner = User.objects.create_user(username='eier', email='eier@example.com', password='pw12345')
+    business = Business.objects.create(user=owner, admin=owner, name='Kafé', city='Oslo')
+    giveaway = Giveaway.objects.create(
+        business=business, title='Kaffekort', description='Test',
+        start_date=timezone.now(), end_date=timezone.now() + datetime.timedelta(days=1),
+    )
+    member = User.objects.create_user(username='medlem', email='medlem@example.com', password='pw12345', city='Oslo')
+    Entry.objects.create(giveaway=giveaway, user=member, answer='4', user_location_city='Oslo')
+    client.force_login(member)
+    response = client.get(reverse('accounts:dashboard'))
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'id="participations-table"' in content
+    assert '<th scope="row">Kaffekort</th>' in content
@@ -12,14 +12,16 @@ URL patterns:
     * /member/profile/ - User profile view
     * /member/profile/edit/ - Edit user profile
     * /member/password/change/ - Change password
+    * /member/invitation/<uidb64>/<token>/ - Imported member chooses a password
     * /dashboard/ - User dashboard
     * /logout/ - Logout
     * /update-location/ - AJAX endpoint for location updates
+    * /update-location/batch/ - All geolocation readings of a session in one call
 """
 
 from django.urls import path, reverse_lazy
 from django.views.generic.base import RedirectView
-from django.contrib.auth.views import PasswordChangeView, PasswordChangeDoneView
+from django.contrib.auth.views import PasswordChangeView, PasswordChangeDoneView, PasswordResetConfirmView
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_protect
@@ -30,7 +32,7 @@ from .views import (
     ProfileView, ProfileEditView,
     member_login_view, member_register_view, BusinessRegisterView,
     custom_logout_view, dashboard_view,
-    update_location
+    update_location, update_location_batch
 )
 
 app_name = 'accounts'
@@ -79,6 +81,14 @@ urlpatterns = [
         )),
         name='password_change_done'
     ),
+    path(
+        'member/invitation/<uidb64>/<token>/',
+        secure_view(PasswordResetConfirmView.as_view(
+            template_name='accounts/invitation_accept.html',
+            success_url=reverse_lazy('accounts:member-login')
+        )),
+        name='invitation-accept'
+    ),
     
     # ===== Bedriftsregistrering =====
     path(
@@ -111,6 +121,11 @@ urlpatterns = [
         login_required(csrf_protect(require_http_methods(["POST"])(update_location))), 
         name='update-location'
     ),
+    path(
+        'update-location/batch/', 
+        login_required(csrf_protect(require_http_methods(["POST"])(update_location_batch))), 
+        name='update-location-batch'
+    ),
 ]
 
 # Sikkerhetsmerknad:
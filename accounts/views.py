@@ -12,11 +12,16 @@ from django.views.generic import TemplateView
 from django.views.generic.edit import FormView, UpdateView
 
 from .forms import UserRegistrationForm, UserProfileForm, BusinessRegistrationForm, MemberLoginForm
+from .location import InvalidCity, city_from_payload, latest_city, set_city
 from .permissions import user_is_member, user_is_business
+from .roles import BUSINESS_GROUP, MEMBER_GROUP, add_role
 from businesses.forms import BusinessForm as BusinessProfileForm
 from businesses.models import Business
+from giveaways.feed import get_cards
 from giveaways.models import Entry, Winner, Giveaway
 from giveaways.views import BusinessOnlyMixin
+from utils.ratelimit import ratelimit
+from utils.routers import ReplicaReadMixin
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -25,17 +30,21 @@ from django.views.generic.edit import FormView
 
 # Views are organized following Django best practices with CBVs for complex views
 
-class HomeTestPageView(TemplateView):
+class HomeTestPageView(ReplicaReadMixin, TemplateView):
     """
-    Viser forsiden (testpage.html) med alle aktive giveaways horisontalt.
+    Viser forsiden (testpage.html) med de mest relevante aktive giveawayene horisontalt.
+    Kortene hentes ferdig rendret fra cachen (giveaways/feed.py); flere kort
+    lastes inn etter hvert via giveaways:home-feed.
+    Leses fra lesereplika når det er konfigurert.
     """
     template_name = "testpage.html"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        giveaways = Giveaway.objects.filter(is_active=True).select_related('business')
-        context["giveaways"] = giveaways
-        logger.info(f"Forside med {giveaways.count()} giveaways vist.")
+        cards, next_offset = get_cards()
+        context["cards"] = cards
+        context["next_offset"] = next_offset
+        logger.info(f"Forside med {len(cards)} giveaways vist.")
         return context
 
 class ProfileView(LoginRequiredMixin, TemplateView):
@@ -89,61 +98,35 @@ class BusinessProfileEditView(LoginRequiredMixin, BusinessOnlyMixin, UpdateView)
     login_url = "accounts:business-login"
     
 
+@ratelimit('location')
 @require_POST
 @login_required
 def update_location(request):
     """
     AJAX endpoint to update a user's location based on browser geolocation.
     
-    This function handles the update of user location from geolocation API requests.  
-    It expects a JSON payload with a 'city' field and returns a JSON response.
+    Expects a JSON payload with 'latitude' and 'longitude' (mapped to a
+    canonical city by the offline geocoder) or a 'city' field, and returns
+    a JSON response. Unchanged cities write nothing and changes are
+    debounced per user (see accounts/location.py).
     
     Args:
         request: HttpRequest object with JSON body
     Returns:
         JsonResponse with success/error information
     """
-    from django.utils.html import strip_tags
-    from django.views.decorators.csrf import csrf_protect
-    
     try:
-        # Parse the JSON data from the request body
         data = json.loads(request.body)
-        city = data.get('city')
-        
-        # Validate input
-        if not city:
-            return JsonResponse({'success': False, 'error': 'By er påkrevd'}, status=400)
-        
-        if len(city) > 100:
-            return JsonResponse({'success': False, 'error': 'Bynavn er for langt'}, status=400)
-            
-        # Sanitize input to prevent XSS
-        city = strip_tags(city)
-        
-        # Validate city format (no numbers allowed)
-        import re
-        if re.search(r'[0-9]', city):
-            return JsonResponse({'success': False, 'error': 'Bynavn kan ikke inneholde tall'}, status=400)
-        
-        # Update the user's city in their profile
-        user = request.user
-        user.city = city
-        user.save()
-        
-        # Also update MemberProfile if it exists
-        if hasattr(user, 'member_profile'):
-            profile = user.member_profile
-            profile.city = city
-            profile.save()
-        
-        logger.info(f"User location updated via geolocation: {user.username} -> {city}")
-        
+        city = city_from_payload(data)
+        status = set_city(request.user, city)
         return JsonResponse({
             'success': True,
-            'message': 'Lokasjon oppdatert',
-            'city': city
+            'message': 'Lokasjon oppdatert' if status == 'updated' else 'Lokasjon uendret',
+            'city': request.user.city if status == 'debounced' else city,
+            'status': status,
         })
+    except InvalidCity as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except json.JSONDecodeError:
         logger.warning(f"Invalid JSON in update_location from user {request.user.username}")
         return JsonResponse({'success': False, 'error': 'Ugyldig JSON-format'}, status=400)
@@ -151,6 +134,40 @@ def update_location(request):
         logger.error(f"Error updating user location for {request.user.username}: {str(e)}")
         return JsonResponse({'success': False, 'error': 'Server feil'}, status=500)
 
+
+LOCATION_SYNCED_SESSION_KEY = 'location_synced'
+
+
+@ratelimit('location')
+@require_POST
+@login_required
+def update_location_batch(request):
+    """
+    AJAX endpoint taking all geolocation readings of a session in one call.
+    
+    Expects {"readings": [{"latitude": ..., "longitude": ..., "timestamp": ...}, ...]}
+    (or readings with a "city"); the newest
+    valid reading is stored. Only the first call per session does any work,
+    later calls return the city synced earlier.
+    """
+    synced = request.session.get(LOCATION_SYNCED_SESSION_KEY)
+    if synced is not None:
+        return JsonResponse({'success': True, 'city': synced, 'status': 'already-synced'})
+    try:
+        data = json.loads(request.body)
+        city = latest_city(data.get('readings') if isinstance(data, dict) else None)
+        status = set_city(request.user, city)
+        request.session[LOCATION_SYNCED_SESSION_KEY] = request.user.city or city
+        return JsonResponse({'success': True, 'city': request.session[LOCATION_SYNCED_SESSION_KEY], 'status': status})
+    except InvalidCity as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except json.JSONDecodeError:
+        logger.warning(f"Invalid JSON in update_location_batch from user {request.user.username}")
+        return JsonResponse({'success': False, 'error': 'Ugyldig JSON-format'}, status=400)
+    except Exception as e:
+        logger.error(f"Error updating user location for {request.user.username}: {str(e)}")
+        return JsonResponse({'success': False, 'error': 'Server feil'}, status=500)
+
     def get_object(self, queryset=None):
         return self.request.user.business_account
 
@@ -169,7 +186,6 @@ class BusinessRegisterView(FormView):
     success_url = reverse_lazy("accounts:login")
 
     def form_valid(self, form):
-        from django.contrib.auth.models import Group
         user = form.save(commit=False)
         user.set_password(form.cleaned_data["password1"])
         user.save()
@@ -183,8 +199,7 @@ class BusinessRegisterView(FormView):
             city=form.cleaned_data["city"]
         )
         # Legg bruker i Bedrift-gruppen
-        bedrift_group, _ = Group.objects.get_or_create(name="Bedrift")
-        user.groups.add(bedrift_group)
+        add_role(user, BUSINESS_GROUP)
         # Sett bruker som admin for bedriften
         business.admin = user
         business.save()
@@ -205,7 +220,6 @@ def member_register_view(request):
     if request.method == 'POST':
         form = UserRegistrationForm(request.POST)
         if form.is_valid():
-            from django.contrib.auth.models import Group
             # Save user without committing to get the user instance
             user = form.save(commit=False)
             # Save the city from the form to the User model
@@ -220,9 +234,8 @@ def member_register_view(request):
                 city=form.cleaned_data.get('city', '')
             )
             
-            # Add user to Medlem group
-            medlem_group, _ = Group.objects.get_or_create(name="Medlem")
-            user.groups.add(medlem_group)
+            # Add user to the Members group (checked by user_is_member)
+            add_role(user, MEMBER_GROUP)
             
             # Specify backend for regular users
             login(request, user, backend='django.contrib.auth.backends.ModelBackend')
@@ -245,6 +258,7 @@ def member_register_view(request):
         'form': form,
     })
 
+@ratelimit('login')
 def member_login_view(request):
     """
     Håndterer innlogging for medlemmer.
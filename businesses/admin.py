@@ -1,5 +1,7 @@
+import csv
 import logging
 from django.contrib import admin
+from django.http import HttpResponse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from .models import Business
@@ -82,9 +84,6 @@ class BusinessAdmin(admin.ModelAdmin):
         """
         Export selected businesses to CSV.
         """
-        import csv
-        from django.http import HttpResponse
-        
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="businesses.csv"'
         
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0003_alter_business_options_alter_business_address_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
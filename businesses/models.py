@@ -20,6 +20,7 @@ class Business(models.Model):
         name (CharField): The business name
         description (TextField): Detailed description of the business
         logo (ImageField): Business logo image
+        logo_variants (JSONField): Resized WebP/JPEG versions of logo, filled asynchronously
         website (URLField): Business website
         postal_code (CharField): Postal code of business location
         city (CharField): City of business location
@@ -53,6 +54,7 @@ class Business(models.Model):
     name = models.CharField(max_length=255, db_index=True)
     description = models.TextField(blank=True)
     logo = models.ImageField(upload_to="business_logos/", blank=True, null=True)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     website = models.URLField(blank=True, null=True)
     postal_code = models.CharField(max_length=10, blank=True, db_index=True)
     city = models.CharField(max_length=64, blank=True, db_index=True)
@@ -11,6 +11,9 @@ from django.db.models import Count, Q
 from .models import Business
 from .forms import BusinessForm
 from accounts.forms import BusinessRegistrationForm, MemberLoginForm
+from accounts.roles import BUSINESS_GROUP, add_role
+from giveaways.models import Giveaway, Entry, Winner
+from utils.routers import ReplicaReadMixin
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +39,12 @@ class BusinessContextMixin:
         if not business:
             return {}
             
-        from giveaways.models import Giveaway, Entry, Winner
-        
         # At-a-glance stats
         giveaways = Giveaway.objects.filter(business=business)
-        giveaways_active = giveaways.filter(is_active=True)
-        giveaways_ended = giveaways.filter(is_active=False)
+        # winners_drawn lets the rows show has_winner without a query each
+        rows = giveaways.annotate(winners_drawn=Count('winners'))
+        giveaways_active = rows.filter(is_active=True)
+        giveaways_ended = rows.filter(is_active=False)
         total_giveaways = giveaways.count()
         total_participants = Entry.objects.filter(giveaway__business=business).count()
         total_winners = Winner.objects.filter(giveaway__business=business).count()
@@ -62,7 +65,7 @@ class BusinessContextMixin:
             "recent_winners": recent_winners,
         }
 
-class BusinessPublicProfileView(DetailView):
+class BusinessPublicProfileView(ReplicaReadMixin, DetailView):
     """
     Offentlig visning av bedriftsprofil. Viser navn, logo, beskrivelse, sted, postnummer, nettside og aktive giveaways.
     """
@@ -101,9 +104,7 @@ class BusinessRegisterView(FormView):
             city=form.cleaned_data["city"]
         )
         # Add user to Bedrift group
-        from django.contrib.auth.models import Group
-        bedrift_group, _ = Group.objects.get_or_create(name="Bedrift")
-        user.groups.add(bedrift_group)
+        add_role(user, BUSINESS_GROUP)
         business.admin = user
         business.save()
         messages.success(self.request, "Bedriftsbruker og bedrift opprettet!")
@@ -112,6 +113,7 @@ class BusinessRegisterView(FormView):
 class BusinessLoginView(FormView):
     template_name = "businesses/business_login.html"
     form_class = MemberLoginForm
+    ratelimit_scope = 'login'
 
     def form_valid(self, form):
         user = form.cleaned_data.get('user')
@@ -184,10 +186,11 @@ class BusinessProfileEditView(LoginRequiredMixin, BusinessContextMixin, UpdateVi
         messages.success(self.request, "Bedriftsprofilen er oppdatert!")
         return super().form_valid(form)
 
-class BusinessDashboardView(LoginRequiredMixin, BusinessContextMixin, TemplateView):
+class BusinessDashboardView(LoginRequiredMixin, ReplicaReadMixin, BusinessContextMixin, TemplateView):
     """
     Dashboard for bedriftsbrukere. Viser statistikk, aktive/avsluttede giveaways
     og nylig aktivitet. Bruker BusinessContextMixin for statistikk.
+    Statistikken leses fra lesereplika når det er konfigurert.
     """
     template_name = "businesses/business_dashboard.html"
     login_url = "businesses:business-login"
@@ -7,10 +7,17 @@ including winner selection for giveaways.
 
 import os
 from celery import Celery
+from celery.schedules import crontab
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+# Celery's Django fixup runs the system checks when a worker starts, which
+# imports the URLconf and with it every view and form module the worker
+# never uses. The checks already run on deploy (manage.py check/migrate)
+# and in the web process; set CELERY_SKIP_CHECKS= (empty) to run them anyway.
+os.environ.setdefault('CELERY_SKIP_CHECKS', 'true')
+
 # Create the Celery app
 app = Celery('raildrops')
 
@@ -35,16 +42,41 @@ app.conf.update(
     
     # Task routing for winner selection
     task_routes={
-        'giveaways.select_winner_task': {'queue': 'giveaway_winners'},
         'giveaways.select_winners_batch': {'queue': 'giveaway_control'},
         'giveaways.summarize_winner_selection': {'queue': 'giveaway_control'},
+        'utils.process_image_variants': {'queue': 'images'},
+        'utils.process_shared_image_variants': {'queue': 'images'},
+        'giveaways.rebuild_home_feed': {'queue': 'giveaway_control'},
     },
     
     # Rate limits to prevent database overload
     task_annotations={
-        'giveaways.select_winner_task': {'rate_limit': '10/s'},
         'giveaways.select_winners_batch': {'rate_limit': '1/s'},
-    }
+    },
+    
+    # Periodic maintenance (run with `celery -A config beat`)
+    beat_schedule={
+        'clear-expired-sessions': {
+            'task': 'accounts.clear_expired_sessions',
+            'schedule': crontab(hour=4, minute=0),
+        },
+        'select-ended-giveaways': {
+            'task': 'giveaways.select_winners',
+            'schedule': crontab(minute='*/15'),
+        },
+        'notify-winners': {
+            'task': 'giveaways.notify_winners',
+            'schedule': crontab(minute='*/5'),
+        },
+        'rebuild-home-feed': {
+            'task': 'giveaways.rebuild_home_feed',
+            'schedule': crontab(minute='*/5'),
+        },
+        'redraw-unclaimed-winners': {
+            'task': 'giveaways.redraw_winners',
+            'schedule': crontab(minute='*/15'),
+        },
+    },
 )
 
 @app.task(bind=True)
@@ -32,11 +32,14 @@ INSTALLED_APPS = [
     # Task processing
     'django_celery_results',
     'notifications',
+    'utils',  # Shared helpers: image variants, pagination
     # Add other apps here
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'utils.middleware.RateLimitMiddleware',
+    'utils.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -47,12 +50,27 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# Templates
+# TEMPLATE_CACHE keeps compiled templates in memory (cached loader); it is
+# on unless DEBUG, where templates must reload on edit. TEMPLATE_WARMUP
+# compiles every template when the WSGI application starts
+# (utils.templates.warm_templates), so the first requests after a deploy
+# don't pay for parsing.
+TEMPLATE_CACHE = os.getenv('TEMPLATE_CACHE', str(not DEBUG)) == 'True'
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', str(TEMPLATE_CACHE)) == 'True'
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if TEMPLATE_CACHE:
+    TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -67,12 +85,74 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgres selects the PostgreSQL profile (recommended in production:
+# SQLite serializes writers). Connections are reused for CONN_MAX_AGE seconds
+# and health-checked before reuse; DB_POOL=True uses a psycopg 3 connection
+# pool instead (Django requires CONN_MAX_AGE=0 with a pool).
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'raildrops'),
+            'USER': os.getenv('POSTGRES_USER', 'raildrops'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+            'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('POSTGRES_CONNECT_TIMEOUT', 5)),
+            },
+        }
+    }
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        }
+    # Read replicas (comma-separated hosts); same credentials as the primary
+    for i, host in enumerate(filter(None, os.getenv('POSTGRES_REPLICA_HOSTS', '').split(',')), start=1):
+        DATABASES[f'replica{i}'] = {
+            **DATABASES['default'],
+            'HOST': host.strip(),
+            'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # Take the write lock when a transaction starts, so busy_timeout
+                # applies instead of failing on a read-to-write lock upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
-}
+
+# Listing, detail, home and business profile pages (and business dashboard
+# stats) read from these replicas; everything else uses the primary.
+# See utils/routers.py.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica')]
+DATABASE_ROUTERS = ['utils.routers.ReplicaRouter']
+# After a write, the user reads from the primary for this many seconds
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 15))
+REPLICA_STICKY_COOKIE = 'use_primary'
+
+# SQLite tuning for single-node installs (see utils/db.py): WAL journal so
+# reads do not block behind writes, synchronous=NORMAL, busy_timeout, mmap and
+# page cache, applied on every new connection
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True') == 'True'
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64000))
+# Attempts for writes that still hit "database is locked"
+SQLITE_LOCK_RETRIES = int(os.getenv('SQLITE_LOCK_RETRIES', 3))
 
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User' 
@@ -112,6 +192,16 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# collectstatic writes content-hashed copies plus .gz/.br versions (utils/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'utils.storage.CompressedManifestStaticFilesStorage'},
+}
+# Serve STATIC_ROOT from the WSGI app with far-future cache headers (utils/wsgi.py);
+# turn off when a web server or CDN serves /static/ instead
+SERVE_STATIC = os.getenv('SERVE_STATIC', 'True') == 'True'
+# Load anime.js from static/vendor/ instead of the CDN (run `manage.py vendor_animejs` first)
+ANIMEJS_LOCAL = os.getenv('ANIMEJS_LOCAL', 'False') == 'True'
 
 # Media files (uploads)
 MEDIA_URL = '/media/'
@@ -126,15 +216,133 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Public base URL used in links sent by email (e.g. member invitations)
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+# Image variants (see utils/images.py)
+# Render resized WebP/JPEG versions of uploads in Celery; set to False to render inline
+IMAGE_VARIANTS_ASYNC = os.getenv('IMAGE_VARIANTS_ASYNC', 'True') == 'True'
+IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', 80))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# Shared by sessions and the cached user loader. Set REDIS_URL in production so
+# all workers see the same entries; the local-memory cache is per process.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'raildrops',
+        }
+    }
+
+# Rate limiting (utils/ratelimit.py): fixed-window counters per scope, kept
+# per client IP, logged-in user ('user', a signed user id cookie set at login;
+# requests without it are only limited per IP) and/or submitted login
+# ('username'). Rates are 'N/period' with period s, m, h or d. Behind proxies, set
+# RATELIMIT_IP_HEADER=HTTP_X_FORWARDED_FOR and RATELIMIT_TRUSTED_PROXIES to
+# the number of proxies that append to it, so clients are told apart.
+RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True') == 'True'
+RATELIMIT_IP_HEADER = os.getenv('RATELIMIT_IP_HEADER', '')
+RATELIMIT_TRUSTED_PROXIES = int(os.getenv('RATELIMIT_TRUSTED_PROXIES', 1))
+RATELIMITS = {
+    'giveaway-entry': {'methods': ['POST'], 'user': '10/m', 'ip': '60/m'},
+    'login': {'methods': ['POST'], 'username': '10/10m', 'ip': '30/m'},
+    'location': {'user': '20/m', 'ip': '300/m'},
+    'animation-data': {'user': '60/m', 'ip': '300/m'},
+}
+
+# Seconds an authenticated user is cached by EmailBackend.get_user (0 disables)
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 300))
+
+# Seconds during which the same city is not written again for a user
+# (accounts/location.py); a changed city is always written. 0 disables
+LOCATION_UPDATE_DEBOUNCE = int(os.getenv('LOCATION_UPDATE_DEBOUNCE', 60))
+
+# Offline reverse geocoding (utils/geocoding.py): a GeoJSON file of municipality
+# boundaries (default utils/data/municipalities_no.geojson when present) for
+# containment lookups; without it, coordinates farther than
+# GEOCODER_MAX_DISTANCE_KM from every bundled town are not mapped to a city
+GEOCODER_BOUNDARIES_FILE = os.getenv('GEOCODER_BOUNDARIES_FILE', '')
+GEOCODER_MAX_DISTANCE_KM = float(os.getenv('GEOCODER_MAX_DISTANCE_KM', 60))
+
+# Giveaway snapshots (giveaways/snapshots.py): seconds in the shared cache,
+# and seconds/entries in each process's local LRU. Other processes may serve
+# a changed giveaway for up to GIVEAWAY_SNAPSHOT_LOCAL_TTL seconds.
+GIVEAWAY_SNAPSHOT_TIMEOUT = int(os.getenv('GIVEAWAY_SNAPSHOT_TIMEOUT', 300))
+GIVEAWAY_SNAPSHOT_LOCAL_TTL = int(os.getenv('GIVEAWAY_SNAPSHOT_LOCAL_TTL', 5))
+GIVEAWAY_SNAPSHOT_LOCAL_SIZE = int(os.getenv('GIVEAWAY_SNAPSHOT_LOCAL_SIZE', 1024))
+
+# Homepage feed (giveaways/feed.py): number of ranked giveaways kept, cards
+# rendered per batch, cache lifetime (longer than the 5-minute beat rebuild)
+# and the debounce before a change-triggered rebuild. Set HOME_FEED_ASYNC to
+# False to rebuild inline instead of in Celery.
+HOME_FEED_SIZE = int(os.getenv('HOME_FEED_SIZE', 60))
+HOME_FEED_PAGE_SIZE = int(os.getenv('HOME_FEED_PAGE_SIZE', 12))
+HOME_FEED_TIMEOUT = int(os.getenv('HOME_FEED_TIMEOUT', 900))
+HOME_FEED_REBUILD_DELAY = int(os.getenv('HOME_FEED_REBUILD_DELAY', 10))
+HOME_FEED_ASYNC = os.getenv('HOME_FEED_ASYNC', 'True') == 'True'
+
+# Giveaway search (giveaways/search.py): ranked results considered per query,
+# suggestions returned by the typeahead endpoint and how long they are cached
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 200))
+SEARCH_TYPEAHEAD_LIMIT = int(os.getenv('SEARCH_TYPEAHEAD_LIMIT', 8))
+SEARCH_TYPEAHEAD_CACHE_TIMEOUT = int(os.getenv('SEARCH_TYPEAHEAD_CACHE_TIMEOUT', 60))
+
+# Duplicate-entry screening (giveaways/services/duplicates.py): entries by
+# other accounts with the same normalized email or the same device get a
+# duplicate reason; reasons in ENTRY_SCREENING_EXCLUDE are left out of draws.
+# Device matches (shared NAT, same phone) are only flagged for staff review
+ENTRY_SCREENING_ENABLED = os.getenv('ENTRY_SCREENING_ENABLED', 'True') == 'True'
+ENTRY_SCREENING_EXCLUDE = [r for r in os.getenv('ENTRY_SCREENING_EXCLUDE', 'email').split(',') if r]
+
+# Winner claims (giveaways/services/redraws.py): days a winner has to claim
+# the prize (0 = no deadline), and giveaways handled per redraw run
+WINNER_CLAIM_DAYS = int(os.getenv('WINNER_CLAIM_DAYS', 7))
+WINNER_REDRAW_BATCH_SIZE = int(os.getenv('WINNER_REDRAW_BATCH_SIZE', 50))
+
+# Giveaway import (giveaways/imports.py): giveaways created per import (after
+# expanding recurring series), giveaways per series, and rows per INSERT
+GIVEAWAY_IMPORT_MAX_ROWS = int(os.getenv('GIVEAWAY_IMPORT_MAX_ROWS', 500))
+GIVEAWAY_IMPORT_MAX_OCCURRENCES = int(os.getenv('GIVEAWAY_IMPORT_MAX_OCCURRENCES', 52))
+GIVEAWAY_IMPORT_BATCH_SIZE = int(os.getenv('GIVEAWAY_IMPORT_BATCH_SIZE', 200))
+
+# Member import (accounts/imports.py): rows per chunk/transaction, processes
+# hashing passwords (0 = one per CPU), and whether admin uploads and
+# invitations to members imported without a password are handled in Celery
+MEMBER_IMPORT_CHUNK_SIZE = int(os.getenv('MEMBER_IMPORT_CHUNK_SIZE', 1000))
+MEMBER_IMPORT_HASH_WORKERS = int(os.getenv('MEMBER_IMPORT_HASH_WORKERS', 0))
+MEMBER_IMPORT_ASYNC = os.getenv('MEMBER_IMPORT_ASYNC', 'True') == 'True'
+MEMBER_INVITATIONS_ASYNC = os.getenv('MEMBER_INVITATIONS_ASYNC', 'True') == 'True'
+
 # Session and CSRF Settings
 SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 CSRF_COOKIE_SECURE = False    # Set to True in production with HTTPS
 SESSION_COOKIE_HTTPONLY = True
 CSRF_COOKIE_HTTPONLY = True
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+# Session storage, selected with SESSION_BACKEND:
+#   cached_db      - cache in front of django_session (default, survives cache flushes)
+#   cache          - cache only, no session queries (sessions lost if the cache is cleared)
+#   signed_cookies - signed client-side cookie, no server storage (keep session data small)
+#   db             - django_session table on every request
+SESSION_ENGINES = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_BACKEND', 'cached_db')]
 
 # Fix for development environments
 CSRF_COOKIE_SAMESITE = None  # Set to 'Lax' in production
@@ -144,4 +352,51 @@ SESSION_COOKIE_SAMESITE = None  # Set to 'Lax' in production
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
 CSRF_COOKIE_DOMAIN = None
 CSRF_TRUSTED_ORIGINS = ['http://127.0.0.1:8000', 'http://localhost:8000']
-CSRF_USE_SESSIONS = False  # Set to True for added security in production
\ No newline at end of file
+CSRF_USE_SESSIONS = False  # Set to True for added security in production
+
+# Logging (utils/logging.py)
+# Records go through a bounded queue to a background thread, so request
+# threads never wait on I/O. LOG_FORMAT is json (one object per line) or
+# text; LOG_INFO_SAMPLE_RATE keeps that fraction of DEBUG/INFO records
+# (warnings and errors are always kept). Email addresses are masked.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_INFO_SAMPLE_RATE = float(os.getenv('LOG_INFO_SAMPLE_RATE', 1.0))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sample': {'()': 'utils.logging.SamplingFilter', 'rate': LOG_INFO_SAMPLE_RATE},
+        'redact_email': {'()': 'utils.logging.RedactEmailFilter'},
+    },
+    'formatters': {
+        'json': {'()': 'utils.logging.JSONFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': LOG_FORMAT,
+            'filters': ['redact_email'],
+        },
+        'queue': {
+            'class': 'utils.logging.NonBlockingHandler',
+            'targets': ['console'],
+            'queue_size': LOG_QUEUE_SIZE,
+            'filters': ['sample'],
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': LOG_LEVEL},
+    'loggers': {
+        # Replace Django's default console/mail_admins handlers
+        'django': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+        'django.server': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Pagination
+# Keyset-paginated lists show an approximate total; counts are cached this long (seconds)
+KEYSET_COUNT_CACHE_TIMEOUT = int(os.getenv('KEYSET_COUNT_CACHE_TIMEOUT', 60))
+# Above this many rows (per the PostgreSQL planner estimate) admin changelists show an estimate instead of COUNT(*)
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv('COUNT_ESTIMATE_THRESHOLD', 10000))
@@ -4,3 +4,17 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.SERVE_STATIC:
+    # Serve collected, fingerprinted static files with far-future cache headers
+    from utils.wsgi import StaticFilesMiddleware
+
+    application = StaticFilesMiddleware(application)
+
+if settings.TEMPLATE_WARMUP:
+    # Compile all templates before the first request
+    from utils.templates import warm_templates
+
+    warm_templates()
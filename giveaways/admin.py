@@ -1,15 +1,30 @@
+import csv
+from functools import partial
+
 from django.contrib import admin
 from .models import Giveaway, Entry, Winner
 
 import logging
-from django.utils.html import format_html
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.html import format_html, mark_safe
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 
+from .feed import schedule_rebuild
+from .search import index_giveaways
+from .services.duplicates import excluded_reasons
+from .snapshots import invalidate_giveaway_snapshots
+from .tasks import select_winners_batch
+from utils.admin import ApproximateCountAdminMixin, KeysetPaginationAdminMixin
+
 logger = logging.getLogger(__name__)
 
 @admin.register(Giveaway)
-class GiveawayAdmin(admin.ModelAdmin):
+class GiveawayAdmin(ApproximateCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'title', 'business_name', 'get_location', 'status_badge', 'prize_value', 
         'entries_count', 'start_date', 'end_date', 'has_winner'
@@ -36,6 +51,9 @@ class GiveawayAdmin(admin.ModelAdmin):
         (_('Spørsmål og svaralternativer'), {
             'fields': ('signup_question', 'signup_options')
         }),
+        (_('Trekning'), {
+            'fields': ('number_of_winners', 'early_bird_hours', 'early_bird_weight')
+        }),
         (_('Statistikk'), {
             'fields': ('entries_count',)
         }),
@@ -43,6 +61,25 @@ class GiveawayAdmin(admin.ModelAdmin):
     
     actions = ['mark_active', 'mark_inactive', 'export_entries', 'select_winner']
     
+    def get_queryset(self, request):
+        """
+        Annotate entry and winner counts so list columns need no per-row queries.
+        
+        The counts are correlated subqueries rather than a JOIN + GROUP BY,
+        so only the giveaways on the current page are counted.
+        """
+        entry_counts = Entry.objects.filter(
+            giveaway=OuterRef('pk')
+        ).order_by().values('giveaway').annotate(count=Count('pk')).values('count')
+        winners = Winner.objects.filter(giveaway=OuterRef('pk'), status__in=Winner.ACTIVE_STATUSES)
+        winner_counts = winners.order_by().values('giveaway').annotate(count=Count('pk')).values('count')
+        first_winner = winners.order_by('rank', 'pk')
+        return super().get_queryset(request).annotate(
+            _entries_count=Coalesce(Subquery(entry_counts), 0),
+            _winners_count=Coalesce(Subquery(winner_counts), 0),
+            _winner_email=Subquery(first_winner.values('user__email')[:1]),
+        )
+    
     def business_name(self, obj):
         """Display business name with link to business admin"""
         if obj.business:
@@ -97,41 +134,62 @@ class GiveawayAdmin(admin.ModelAdmin):
     
     def entries_count(self, obj):
         """Count entries with link to filtered entries admin"""
-        count = obj.entries.count()
+        count = getattr(obj, '_entries_count', None)
+        if count is None:
+            count = obj.entries.count()
         if count:
             url = reverse('admin:giveaways_entry_changelist') + f'?giveaway__id__exact={obj.id}'
             return format_html('<a href="{}">{} deltakere</a>', url, count)
         return '0 deltakere'
     entries_count.short_description = _('Deltakere')
+    entries_count.admin_order_field = '_entries_count'
     
     def has_winner(self, obj):
-        """Check if giveaway has a winner with link to winner admin"""
-        try:
-            winner = obj.winner
-            url = reverse('admin:giveaways_winner_change', args=[winner.id])
-            return format_html('<a href="{}" style="color: green;">Ja - {}</a>', url, winner.user.email)
-        except (Winner.DoesNotExist, AttributeError):
-            return format_html('<span style="color: gray;">Nei</span>')
-    has_winner.short_description = _('Vinner')
+        """Show how many winners the giveaway has, linking to the winner admin"""
+        if hasattr(obj, '_winners_count'):
+            count, email = obj._winners_count, obj._winner_email
+        else:
+            active = obj.winners.filter(status__in=Winner.ACTIVE_STATUSES)
+            first = active.select_related('user').order_by('rank', 'pk').first()
+            count, email = active.count(), first.user.email if first else None
+        if count:
+            url = reverse('admin:giveaways_winner_changelist') + f'?giveaway__id__exact={obj.id}'
+            if count > 1:
+                return format_html('<a href="{}" style="color: green;">Ja - {} (+{})</a>', url, email, count - 1)
+            return format_html('<a href="{}" style="color: green;">Ja - {}</a>', url, email)
+        return format_html('<span style="color: gray;">Nei</span>')
+    has_winner.short_description = _('Vinnere')
     has_winner.boolean = False  # Changed to False to avoid using boolean icons
     
+    def _set_active(self, queryset, is_active):
+        """
+        Update is_active for the selected giveaways.
+
+        queryset.update() sends no post_save, so the snapshots, search
+        rows and homepage feed are refreshed here (see signals.py).
+        """
+        ids = list(queryset.values_list('pk', flat=True))
+        with transaction.atomic():
+            updated = Giveaway.objects.filter(pk__in=ids).update(is_active=is_active)
+            index_giveaways(ids)
+            transaction.on_commit(partial(invalidate_giveaway_snapshots, *ids))
+            schedule_rebuild()
+        return updated
+    
     def mark_active(self, request, queryset):
         """Mark selected giveaways as active"""
-        updated = queryset.update(is_active=True)
+        updated = self._set_active(queryset, True)
         self.message_user(request, f'{updated} giveaways marked as active.')
     mark_active.short_description = _('Merk som aktive')
     
     def mark_inactive(self, request, queryset):
         """Mark selected giveaways as inactive"""
-        updated = queryset.update(is_active=False)
+        updated = self._set_active(queryset, False)
         self.message_user(request, f'{updated} giveaways marked as inactive.')
     mark_inactive.short_description = _('Merk som inaktive')
     
     def export_entries(self, request, queryset):
         """Export entries for selected giveaways to CSV"""
-        import csv
-        from django.http import HttpResponse
-        
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="giveaway_entries.csv"'
         
@@ -158,13 +216,6 @@ class GiveawayAdmin(admin.ModelAdmin):
         Only works for expired giveaways without existing winners.
         Uses the scalable winner selection system.
         """
-        from django.urls import reverse
-        from django.utils.html import mark_safe
-        from .tasks import select_winners_batch
-        from .services.winner_selection import find_eligible_giveaways
-        
-        # Filter for eligible giveaways
-        from django.utils import timezone
         now = timezone.now()
         
         # Count all selected giveaways
@@ -175,8 +226,7 @@ class GiveawayAdmin(admin.ModelAdmin):
         eligible_ids = list(eligible_giveaways.values_list('id', flat=True))
         
         # Find which ones already have winners
-        from .models import Winner
-        existing_winners = Winner.objects.filter(giveaway__in=eligible_giveaways).values_list('giveaway_id', flat=True)
+        existing_winners = Winner.objects.filter(giveaway__in=eligible_giveaways).values_list('giveaway_id', flat=True).distinct()
         existing_winners = list(existing_winners)
         
         # Get final list of eligible giveaways without winners
@@ -232,15 +282,32 @@ class GiveawayAdmin(admin.ModelAdmin):
     
     select_winner.short_description = _('Trekk vinner for valgte giveaways')
 
+class GiveawayRelatedOnlyFilter(admin.RelatedOnlyFieldListFilter):
+    """
+    Giveaway filter that loads the business in the same query.
+    
+    Giveaway.__str__ includes the business name, so the stock filter
+    issues one extra query per giveaway listed in the sidebar.
+    """
+    
+    def field_choices(self, field, request, model_admin):
+        pk_qs = model_admin.get_queryset(request).order_by().distinct().values_list(
+            f'{field.name}_id', flat=True
+        )
+        giveaways = Giveaway.objects.filter(pk__in=pk_qs).select_related('business').order_by('title')
+        return [(giveaway.pk, str(giveaway)) for giveaway in giveaways]
+
+
 @admin.register(Entry)
-class EntryAdmin(admin.ModelAdmin):
+class EntryAdmin(KeysetPaginationAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for Entry model.
     Provides enhanced display, filtering, and functionality.
+    Uses keyset pagination since the table grows with every participation.
     """
     list_display = (
         'user_email', 'giveaway_title', 'answer_display', 
-        'user_location_city', 'entered_at'
+        'user_location_city', 'duplicate_reason', 'weight', 'entered_at'
     )
     list_display_links = ('user_email',)
     list_select_related = ('giveaway', 'user')
@@ -250,8 +317,8 @@ class EntryAdmin(admin.ModelAdmin):
         'user__username', 'user_location_city'
     )
     list_filter = (
-        'entered_at', 'user_location_city',
-        ('giveaway', admin.RelatedOnlyFieldListFilter)
+        'entered_at', 'duplicate_reason', 'user_location_city',
+        ('giveaway', GiveawayRelatedOnlyFilter)
     )
     date_hierarchy = 'entered_at'
     
@@ -292,26 +359,63 @@ class EntryAdmin(admin.ModelAdmin):
     is_correct.boolean = True
 
 
+class DuplicateReviewFilter(admin.SimpleListFilter):
+    """
+    Winners whose entry matched another account on a signal that does not
+    keep it out of the draw (by default the same device), for staff review.
+    """
+    title = _('Til gjennomgang')
+    parameter_name = 'review'
+
+    def lookups(self, request, model_admin):
+        return [('duplicate', _('Mulig duplikat'))]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'duplicate':
+            return queryset.exclude(_duplicate_reason__in=['', *excluded_reasons()]).filter(
+                _duplicate_reason__isnull=False
+            )
+        return queryset
+
+
 @admin.register(Winner)
-class WinnerAdmin(admin.ModelAdmin):
+class WinnerAdmin(KeysetPaginationAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for Winner model.
     Provides enhanced display, filtering, and functionality.
+    Uses keyset pagination to avoid OFFSET scans on deep pages.
     """
     list_display = (
-        'user_email', 'giveaway_title', 'was_correct_answer_display',
-        'selected_at', 'notification_status'
+        'user_email', 'giveaway_title', 'rank', 'status', 'claim_deadline',
+        'was_correct_answer_display', 'duplicate_review', 'selected_at', 'notification_status'
     )
     list_display_links = ('user_email',)
     list_select_related = ('giveaway', 'user')
     
     search_fields = ('giveaway__title', 'user__email', 'user__username')
-    list_filter = ('selected_at', 'notification_sent')
+    list_filter = (
+        'status', DuplicateReviewFilter, 'selected_at', 'notification_sent',
+        ('giveaway', GiveawayRelatedOnlyFilter)
+    )
     date_hierarchy = 'selected_at'
     
-    readonly_fields = ('selected_at', 'was_correct_answer_display', 'entry_details')
+    readonly_fields = (
+        'selected_at', 'was_correct_answer_display', 'entry_details',
+        'draw_seed', 'draw_root', 'draw_entry_count', 'draw_index', 'draw_attempt', 'draw_key',
+        'claimed_at', 'redrawn', 'redraw_tried_at', 'replaces',
+    )
     
-    actions = ['mark_notification_sent']
+    actions = ['mark_notification_sent', 'disqualify_winners']
+    
+    def get_queryset(self, request):
+        """Annotate the winner's entry and its duplicate reason, avoiding queries per row."""
+        winner_entry = Entry.objects.filter(
+            giveaway=OuterRef('giveaway'), user=OuterRef('user')
+        )
+        return super().get_queryset(request).annotate(
+            _has_entry=Exists(winner_entry),
+            _duplicate_reason=Subquery(winner_entry.values('duplicate_reason')[:1]),
+        )
     
     def user_email(self, obj):
         """Display user email with link to user admin"""
@@ -336,12 +440,23 @@ class WinnerAdmin(admin.ModelAdmin):
     
     def was_correct_answer_display(self, obj):
         """Display whether winner had correct answer"""
-        if obj.was_correct_answer():
+        has_entry = getattr(obj, '_has_entry', None)
+        if has_entry is None:
+            has_entry = obj.was_correct_answer()
+        if has_entry:
             return format_html('<span style="color: green;">✓</span>')
         return format_html('<span style="color: red;">✗</span>')
     was_correct_answer_display.short_description = _('Korrekt svar')
     # Removed boolean=True to fix admin display error
     
+    def duplicate_review(self, obj):
+        """Flag winners whose entry matched another account without being excluded"""
+        reason = getattr(obj, '_duplicate_reason', None)
+        if reason and reason not in excluded_reasons():
+            return format_html('<span style="color: orange;">Sjekk ({})</span>', reason)
+        return ''
+    duplicate_review.short_description = _('Mulig duplikat')
+    
     def notification_status(self, obj):
         """Display notification status"""
         if obj.notification_sent:
@@ -366,4 +481,10 @@ class WinnerAdmin(admin.ModelAdmin):
         for winner in queryset:
             winner.mark_notification_sent()
         self.message_user(request, f'Marked notifications as sent for {queryset.count()} winners.')
-    mark_notification_sent.short_description = _('Merk varslinger som sendt')
\ No newline at end of file
+    mark_notification_sent.short_description = _('Merk varslinger som sendt')
+    
+    def disqualify_winners(self, request, queryset):
+        """Disqualify the selected winners; replacements are drawn by the next redraw run"""
+        updated = queryset.filter(status__in=Winner.ACTIVE_STATUSES).update(status=Winner.DISQUALIFIED)
+        self.message_user(request, f'Disqualified {updated} winners. Replacements are drawn automatically.')
+    disqualify_winners.short_description = _('Diskvalifiser og trekk ny vinner')
\ No newline at end of file
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class GiveawaysConfig(AppConfig):
+    name = 'giveaways'
+
+    def ready(self):
+        # Register snapshot cache invalidation handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,148 @@
+"""
+Precomputed homepage giveaway feed.
+
+The front page shows a ranked, size-limited list of live giveaways. The
+feed is built off the request path and stored in the cache as a list of
+rendered card fragments, so rendering the homepage (and each lazy-loaded
+batch from the JSON endpoint) costs one cache read however many
+giveaways exist.
+
+- build_feed(): ranks live giveaways and renders their cards
+- get_feed(): returns the cached feed, building it on a cold cache
+- schedule_rebuild(): queues a rebuild after a giveaway or business
+  changes (debounced); the giveaways.rebuild_home_feed task also runs
+  periodically so entry counts and "time left" stay current
+
+Ranking favours popular giveaways and those about to end. Only a bounded
+candidate pool is ranked: the most-entered and soonest-ending live
+giveaways, HOME_FEED_SIZE * CANDIDATE_FACTOR of each.
+"""
+
+import logging
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Giveaway
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_KEY = 'home:feed'
+REBUILD_PENDING_KEY = 'home:feed:rebuild-pending'
+CARD_TEMPLATE = 'giveaways/giveaway_card.html'
+CANDIDATE_FACTOR = 3
+
+
+def feed_size():
+    return getattr(settings, 'HOME_FEED_SIZE', 60)
+
+
+def page_size():
+    return getattr(settings, 'HOME_FEED_PAGE_SIZE', 12)
+
+
+def score(entries_count, end_date, now):
+    """
+    Relevance of a live giveaway.
+
+    Popularity grows logarithmically with entries, so one viral giveaway
+    does not bury everything else; urgency approaches 2 as the end date
+    nears and halves when a day is left.
+    """
+    days_left = max((end_date - now).total_seconds(), 0) / 86400
+    return math.log1p(entries_count) + 2.0 / (1 + days_left)
+
+
+def ranked_giveaways(limit=None, now=None):
+    """
+    Return up to `limit` live giveaways ordered by score, highest first.
+
+    Each giveaway carries `entries_count` and its business.
+    """
+    limit = limit or feed_size()
+    now = now or timezone.now()
+    live = (
+        Giveaway.objects.filter(is_active=True, start_date__lte=now, end_date__gte=now)
+        .select_related('business')
+        .annotate(entries_count=Count('entries'))
+    )
+    pool = limit * CANDIDATE_FACTOR
+    candidates = {g.pk: g for g in live.order_by('-entries_count', 'end_date')[:pool]}
+    candidates.update((g.pk, g) for g in live.order_by('end_date', 'id')[:pool])
+    ranked = sorted(
+        candidates.values(),
+        key=lambda g: (-score(g.entries_count, g.end_date, now), g.end_date, g.pk),
+    )
+    return ranked[:limit]
+
+
+def build_feed():
+    """
+    Rank live giveaways, render their cards and store the feed in the cache.
+
+    Returns:
+        list: Rendered card HTML strings, in feed order
+    """
+    # Cleared first so changes made while building queue another rebuild
+    cache.delete(REBUILD_PENDING_KEY)
+    cards = [
+        render_to_string(CARD_TEMPLATE, {'giveaway': giveaway})
+        for giveaway in ranked_giveaways()
+    ]
+    cache.set(FEED_CACHE_KEY, cards, getattr(settings, 'HOME_FEED_TIMEOUT', 900))
+    logger.info(f"Homepage feed rebuilt with {len(cards)} giveaways")
+    return cards
+
+
+def get_feed():
+    """Return the cached card fragments, building them if the cache is cold."""
+    cards = cache.get(FEED_CACHE_KEY)
+    if cards is None:
+        cards = build_feed()
+    return cards
+
+
+def get_cards(offset=0, limit=None):
+    """
+    Return one batch of cards and the offset of the next batch.
+
+    Returns:
+        tuple: (list of card HTML strings, next offset or None)
+    """
+    limit = limit or page_size()
+    cards = get_feed()
+    batch = cards[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(cards) else None
+    return batch, next_offset
+
+
+def schedule_rebuild():
+    """
+    Rebuild the feed after the current transaction commits.
+
+    Bursts of changes (bulk edits, imports) queue a single rebuild: the
+    task is delayed by HOME_FEED_REBUILD_DELAY seconds and only queued if
+    none is pending. Runs inline when HOME_FEED_ASYNC is off; if the
+    broker cannot be reached the cached feed is dropped instead and
+    rebuilt by the next homepage request.
+    """
+    def run():
+        if not getattr(settings, 'HOME_FEED_ASYNC', True):
+            build_feed()
+            return
+        delay = getattr(settings, 'HOME_FEED_REBUILD_DELAY', 10)
+        if not cache.add(REBUILD_PENDING_KEY, True, delay + 60):
+            return
+        try:
+            from .tasks import rebuild_home_feed
+            rebuild_home_feed.apply_async(countdown=delay, retry=False)
+        except Exception as e:
+            logger.warning(f"Could not queue homepage feed rebuild: {e}")
+            cache.delete_many([FEED_CACHE_KEY, REBUILD_PENDING_KEY])
+
+    transaction.on_commit(run)
@@ -1,5 +1,7 @@
 from django import forms
 from .models import Giveaway, Entry
+from .services.entries import normalize_city
+from utils.geocoding import canonical_city, reverse_geocode
 import logging
 
 logger = logging.getLogger(__name__)
@@ -7,6 +9,9 @@ logger = logging.getLogger(__name__)
 class EntryForm(forms.ModelForm):
     answer = forms.CharField(label="Answer", widget=forms.RadioSelect, required=True)
     user_location_city = forms.CharField(widget=forms.HiddenInput(), required=True)
+    # Browser position; when given, the entry city comes from the offline geocoder
+    latitude = forms.FloatField(widget=forms.HiddenInput(), required=False, min_value=-90, max_value=90)
+    longitude = forms.FloatField(widget=forms.HiddenInput(), required=False, min_value=-180, max_value=180)
 
     class Meta:
         model = Entry
@@ -47,18 +52,29 @@ class EntryForm(forms.ModelForm):
                     self.data = data
                     
                 # Log the city we're using
-                logger.info(f"Using city {user_city} for user {user.email}")
+                logger.debug("Using city %s for user %s", user_city, user.pk)
             else:
-                logger.warning(f"No city found for user {user.email}")
+                logger.warning("No city found for user %s", user.pk)
+
+        # A position sent by the browser wins over the profile city
+        if self.is_bound and self.data.get("latitude") and self.data.get("longitude"):
+            place = reverse_geocode(self.data.get("latitude"), self.data.get("longitude"))
+            if place is not None:
+                data = self.data.copy()
+                data["user_location_city"] = place.name
+                self.data = data
 
     def clean(self):
         cleaned_data = super().clean()
         answer = cleaned_data.get("answer")
-        user_location_city = cleaned_data.get("user_location_city")
+        # Store the geocoder's spelling so entries use one name per city
+        user_location_city = canonical_city(cleaned_data.get("user_location_city"))
+        if user_location_city:
+            cleaned_data["user_location_city"] = user_location_city
         user = self.request.user if self.request else None
         giveaway = self.giveaway
         
-        # Direct implementation of validation logic to avoid circular imports
+        # Works on the snapshot (business_city) rather than giveaway.business
         result = self._validate_entry(user, giveaway, user_location_city, answer)
         
         if not result["success"]:
@@ -66,13 +82,16 @@ class EntryForm(forms.ModelForm):
                 self.add_error("answer", result["error"])
             else:
                 self.add_error("user_location_city", result["error"])
-            logger.warning(f"Validation failed for entry: {result['error']}")
+            logger.info("Validation failed for entry: %s", result["error"])
         else:
-            logger.info(f"Entry approved for city: {user_location_city}")
+            logger.debug("Entry approved for city: %s", user_location_city)
         return cleaned_data
         
     def _validate_entry(self, user, giveaway, user_city, answer):
-        """Internal validation function to avoid circular imports."""
+        """Validate an entry against a Giveaway or a cached GiveawaySnapshot.
+
+        Mirrors services.validate_entry, which needs giveaway.business.
+        """
         # Always require an answer
         if not answer:
             return {"success": False, "error": "You must select an answer."}
@@ -83,10 +102,13 @@ class EntryForm(forms.ModelForm):
         
         # IMPORTANT: Users must be in the same city as the business to participate
         normalized_user_city = self._normalize_city(user_city)
-        normalized_business_city = self._normalize_city(giveaway.business.city)
+        normalized_business_city = self._normalize_city(giveaway.business_city)
         
         # Log the normalization for debugging
-        logger.info(f"Comparing user city '{user_city}' ({normalized_user_city}) with business city '{giveaway.business.city}' ({normalized_business_city})")
+        logger.debug(
+            "Comparing user city %r (%s) with business city %r (%s)",
+            user_city, normalized_user_city, giveaway.business_city, normalized_business_city,
+        )
         
         if not normalized_user_city:
             # Edge case: Empty normalized city
@@ -96,30 +118,24 @@ class EntryForm(forms.ModelForm):
             # Create a more informative error message
             return {
                 "success": False, 
-                "error": f"You must be in {giveaway.business.city} to participate in this giveaway. Your current position is registered as {user_city}."
+                "error": f"You must be in {giveaway.business_city} to participate in this giveaway. Your current position is registered as {user_city}."
             }
         
         # Log successful location match
-        logger.info(f"Approved position: {user_city} matches {giveaway.business.city}")
+        logger.debug("Approved position: %s matches %s", user_city, giveaway.business_city)
         
         return {"success": True, "normalized_city": normalized_user_city}
     
     def _normalize_city(self, city):
         """Normalize city name for consistent comparison."""
-        import unicodedata
-        if not city:
-            return ""
-        city = city.lower().strip()
-        city = unicodedata.normalize('NFKD', city)
-        # Remove all non-alphanumeric characters
-        city = ''.join(c for c in city if c.isalnum())
-        return city
+        return normalize_city(city)
 
 
 class GiveawayCreateForm(forms.ModelForm):
     """
     Form for creating a new giveaway. Includes prize, image, value, description, dates,
-    signup question and up to 4 answer options (radio).
+    signup question, up to 4 answer options (radio), the number of winners and
+    the optional early entry weighting.
     """
     option_1 = forms.CharField(label="Answer Option 1", max_length=100, required=False)
     option_2 = forms.CharField(label="Answer Option 2", max_length=100, required=False)
@@ -127,14 +143,20 @@ class GiveawayCreateForm(forms.ModelForm):
     option_4 = forms.CharField(label="Answer Option 4", max_length=100, required=False)
     signup_options = forms.JSONField(required=False, widget=forms.HiddenInput())
     
+    DRAW_FIELDS = ("number_of_winners", "early_bird_hours", "early_bird_weight")
+    
     def __init__(self, *args, **kwargs):
         self.business = kwargs.pop('business', None)
         super().__init__(*args, **kwargs)
+        # Draw settings fall back to the model defaults when left out
+        for name in self.DRAW_FIELDS:
+            self.fields[name].required = False
 
     class Meta:
         model = Giveaway
         fields = [
-            "title", "description", "image", "prize_value", "start_date", "end_date", "signup_question", "signup_options"
+            "title", "description", "image", "prize_value", "start_date", "end_date", "signup_question", "signup_options",
+            "number_of_winners", "early_bird_hours", "early_bird_weight",
         ]
         widgets = {
             "start_date": forms.DateTimeInput(attrs={"type": "datetime-local"}),
@@ -175,8 +197,52 @@ class GiveawayCreateForm(forms.ModelForm):
         # Set the signup_options field value
         cleaned_data["signup_options"] = options_list
         
+        for name in self.DRAW_FIELDS:
+            if cleaned_data.get(name) is None:
+                cleaned_data[name] = Giveaway._meta.get_field(name).default
+        
         return cleaned_data
 
     def save(self, commit=True):
         # We've already set signup_options in clean(), so we can use the default behavior
         return super().save(commit=commit)
+
+
+class MultipleImageInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultipleImageField(forms.ImageField):
+    """ImageField accepting several files; cleans to a list of uploads."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("widget", MultipleImageInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        if isinstance(data, (list, tuple)):
+            return [super(MultipleImageField, self).clean(item, initial) for item in data]
+        cleaned = super().clean(data, initial)
+        return [cleaned] if cleaned else []
+
+
+class GiveawayImportForm(forms.Form):
+    """
+    Upload form for bulk giveaway import (see giveaways/imports.py).
+    Rows refer to images by file name in the `image` column.
+    """
+    file = forms.FileField(
+        label="Import file (.csv or .json)",
+        widget=forms.ClearableFileInput(attrs={"accept": ".csv,.json"}),
+    )
+    images = MultipleImageField(label="Images", required=False)
+
+    def clean_file(self):
+        uploaded = self.cleaned_data["file"]
+        if not uploaded.name.lower().endswith((".csv", ".json")):
+            raise forms.ValidationError("Filen må være en .csv- eller .json-fil.")
+        return uploaded
+
+    def images_by_name(self):
+        """Return the uploaded images keyed by their file name."""
+        return {image.name: image for image in self.cleaned_data.get("images") or []}
@@ -0,0 +1,281 @@
+"""
+Bulk import of giveaways from CSV or JSON.
+
+Chains create many similar giveaways at once. An import file is parsed
+and every row validated in one pass before anything is written; if any
+row is invalid nothing is imported and every problem is reported with its
+row number. Valid imports are inserted with bulk_create in one
+transaction.
+
+Columns (CSV header or JSON object keys):
+    title, description, start_date, end_date (required)
+    prize_value, signup_question
+    options (JSON list, or "|"-separated in CSV) or option_1 .. option_4
+    image: file name of one of the images uploaded with the import
+    repeat: daily, weekly or monthly; occurrences: number of giveaways
+        in the series (default 1). Each occurrence shifts both dates.
+
+bulk_create skips Giveaway.save() and post_save, so the work normally
+done by signals is done here: image variants are built asynchronously
+(once per distinct image) and the search index and homepage feed are
+updated. Draws need nothing per giveaway: the select_winners task runs
+from beat every 15 minutes (config/celery.py) and draws every giveaway
+once it has ended.
+"""
+
+import calendar
+import csv
+import io
+import json
+import logging
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from utils.images import schedule_shared_variants
+
+from .feed import schedule_rebuild
+from .models import Giveaway
+from .search import index_giveaways
+
+logger = logging.getLogger(__name__)
+
+REPEAT_CHOICES = ('daily', 'weekly', 'monthly')
+MAX_OPTIONS = 4
+
+
+class ImportFileError(Exception):
+    """The upload could not be read as a CSV or JSON list of rows."""
+
+
+def read_rows(uploaded_file):
+    """
+    Parse an uploaded .csv or .json file into a list of row dicts.
+
+    CSV files may use comma or semicolon delimiters (spreadsheet exports
+    with Norwegian locale use semicolons) and may start with a BOM.
+
+    Raises:
+        ImportFileError: If the file cannot be parsed
+    """
+    name = (uploaded_file.name or '').lower()
+    try:
+        text = uploaded_file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ImportFileError("Filen må være UTF-8-kodet.")
+
+    if name.endswith('.json'):
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise ImportFileError(f"Ugyldig JSON: {e}")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ImportFileError("JSON-filen må inneholde en liste med objekter.")
+        return rows
+
+    if name.endswith('.csv'):
+        try:
+            dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;')
+        except csv.Error:
+            dialect = csv.excel
+        return list(csv.DictReader(io.StringIO(text), dialect=dialect))
+
+    raise ImportFileError("Filen må være en .csv- eller .json-fil.")
+
+
+def _text(row, key):
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def _options(row):
+    options = row.get('options')
+    if isinstance(options, list):
+        values = options
+    elif options:
+        values = str(options).split('|')
+    else:
+        values = [row.get(f'option_{i}') for i in range(1, MAX_OPTIONS + 1)]
+    return [str(value).strip() for value in values if value and str(value).strip()]
+
+
+def _datetime(value, field):
+    if not value:
+        raise ValidationError({field: "Mangler verdi."})
+    parsed = parse_datetime(str(value).strip())
+    if parsed is None:
+        raise ValidationError({field: f"Ugyldig dato/tid: {value} (bruk f.eks. 2025-06-01 12:00)."})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _shift(value, repeat, step):
+    if repeat == 'daily':
+        return value + timedelta(days=step)
+    if repeat == 'weekly':
+        return value + timedelta(weeks=step)
+    # Monthly: same day of month, clamped to the month's last day
+    month_index = value.month - 1 + step
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def _occurrences(row):
+    repeat = (row.get('repeat') or '').strip().lower()
+    count = row.get('occurrences') or 1
+    if repeat and repeat not in REPEAT_CHOICES:
+        raise ValidationError({'repeat': f"Må være en av: {', '.join(REPEAT_CHOICES)}."})
+    try:
+        count = int(count)
+    except (TypeError, ValueError):
+        raise ValidationError({'occurrences': f"Ugyldig antall: {count}."})
+    max_occurrences = getattr(settings, 'GIVEAWAY_IMPORT_MAX_OCCURRENCES', 52)
+    if not 1 <= count <= max_occurrences:
+        raise ValidationError({'occurrences': f"Må være mellom 1 og {max_occurrences}."})
+    if count > 1 and not repeat:
+        raise ValidationError({'repeat': "Angi repeat når occurrences er større enn 1."})
+    return repeat, count
+
+
+def _error_messages(error):
+    if hasattr(error, 'message_dict'):
+        return [f"{field}: {message}" for field, messages in error.message_dict.items() for message in messages]
+    return list(error.messages)
+
+
+def build_giveaways(business, rows, images=None):
+    """
+    Validate rows and build (unsaved) giveaways, expanding recurrence rules.
+
+    Args:
+        business: Business hosting the giveaways
+        rows: Row dicts from read_rows()
+        images: Dict of uploaded file name -> UploadedFile
+
+    Returns:
+        tuple: (list of Giveaway, list of (row number, message) errors);
+        row numbers start at 1 for the first data row
+    """
+    images = images or {}
+    giveaways, errors = [], []
+    max_total = getattr(settings, 'GIVEAWAY_IMPORT_MAX_ROWS', 500)
+
+    for number, row in enumerate(rows, start=1):
+        row = {str(key).strip().lower(): value for key, value in row.items() if key}
+        row_errors = []
+
+        def check(func, *args):
+            try:
+                return func(*args)
+            except ValidationError as e:
+                row_errors.extend(_error_messages(e))
+
+        start_date = check(_datetime, row.get('start_date'), 'start_date')
+        end_date = check(_datetime, row.get('end_date'), 'end_date')
+        repeat, count = check(_occurrences, row) or ('', 1)
+        options = _options(row)
+        if len(options) < 2:
+            row_errors.append("options: Du må angi minst 2 svaralternativer.")
+        image_name = _text(row, 'image')
+        if image_name and image_name not in images:
+            row_errors.append(f"image: Bildet {image_name} ble ikke lastet opp.")
+
+        template = Giveaway(
+            business=business,
+            title=_text(row, 'title'),
+            description=_text(row, 'description'),
+            prize_value=row.get('prize_value') or None,
+            start_date=start_date,
+            end_date=end_date,
+            signup_question=_text(row, 'signup_question'),
+            signup_options=options,
+        )
+        # Field and model validation (title, prize value, date order, options)
+        exclude = ['business', 'image'] + [f for f, v in (('start_date', start_date), ('end_date', end_date)) if not v]
+        check(template.full_clean, exclude)
+        if row_errors:
+            errors.extend((number, message) for message in row_errors)
+            continue
+
+        for step in range(count):
+            giveaway = Giveaway(
+                business=business,
+                title=template.title,
+                description=template.description,
+                prize_value=template.prize_value,
+                start_date=_shift(template.start_date, repeat, step) if step else template.start_date,
+                end_date=_shift(template.end_date, repeat, step) if step else template.end_date,
+                signup_question=template.signup_question,
+                signup_options=list(template.signup_options),
+            )
+            giveaway._import_image = image_name
+            giveaways.append(giveaway)
+
+    if len(giveaways) > max_total:
+        errors.append((0, f"Importen gir {len(giveaways)} giveaways; maksimum er {max_total}."))
+    return giveaways, errors
+
+
+def _store_images(giveaways, images):
+    """Save each referenced upload once and point its giveaways at it."""
+    field = Giveaway._meta.get_field('image')
+    stored = {}
+    for giveaway in giveaways:
+        name = giveaway._import_image
+        if not name:
+            continue
+        if name not in stored:
+            upload = images[name]
+            upload.seek(0)
+            stored[name] = field.storage.save(field.generate_filename(giveaway, posixpath.basename(name)), upload)
+        giveaway.image = stored[name]
+
+
+def import_giveaways(business, uploaded_file, images=None):
+    """
+    Import giveaways for a business from an uploaded CSV/JSON file.
+
+    Nothing is written unless every row is valid.
+
+    Args:
+        business: Business hosting the giveaways
+        uploaded_file: The .csv or .json upload
+        images: Dict of uploaded file name -> UploadedFile
+
+    Returns:
+        dict: {'success', 'created' (list of Giveaway), 'errors' (list of
+        (row number, message))}
+    """
+    images = images or {}
+    try:
+        rows = read_rows(uploaded_file)
+    except ImportFileError as e:
+        return {'success': False, 'created': [], 'errors': [(0, str(e))]}
+    if not rows:
+        return {'success': False, 'created': [], 'errors': [(0, "Filen inneholder ingen rader.")]}
+
+    giveaways, errors = build_giveaways(business, rows, images)
+    if errors:
+        return {'success': False, 'created': [], 'errors': errors}
+
+    with transaction.atomic():
+        _store_images(giveaways, images)
+        created = Giveaway.objects.bulk_create(
+            giveaways, batch_size=getattr(settings, 'GIVEAWAY_IMPORT_BATCH_SIZE', 200)
+        )
+        ids = [giveaway.pk for giveaway in created]
+        index_giveaways(ids)
+        with_images = [giveaway.pk for giveaway in created if giveaway.image]
+        if with_images:
+            schedule_shared_variants('giveaways.Giveaway', with_images)
+        schedule_rebuild()
+
+    logger.info(f"Importerte {len(created)} giveaways for {business.name}")
+    return {'success': True, 'created': created, 'errors': []}
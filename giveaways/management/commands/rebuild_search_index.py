@@ -0,0 +1,37 @@
+"""
+Management command to rebuild the giveaway full-text search table.
+
+Needed after bulk writes that bypass signals (queryset.update(),
+bulk_create, raw SQL) or after restoring a database. Giveaways are
+indexed in batches, each in its own transaction.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from giveaways.models import Giveaway
+from giveaways.search import SEARCH_TABLE, index_queryset, is_supported
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for giveaways.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Giveaways indexed per transaction')
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            self.stdout.write(self.style.WARNING(
+                f'No full-text backend for {connection.vendor}; search uses icontains filters.'
+            ))
+            return
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+
+        batch_size = options['batch_size']
+        ids = list(Giveaway.objects.order_by('pk').values_list('pk', flat=True))
+        total = 0
+        for start in range(0, len(ids), batch_size):
+            with transaction.atomic():
+                total += index_queryset(Giveaway.objects.filter(pk__in=ids[start:start + batch_size]))
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} giveaways.'))
@@ -0,0 +1,49 @@
+"""
+Management command to verify recorded draws.
+
+Recomputes each giveaway's draw from the seed, the Merkle root over the
+giveaway's entries and the recorded indexes or sampling keys of its
+winners (see giveaways/services/draws.py). Entry ids are streamed in chunks, so
+memory stays flat for giveaways with millions of entries. Exits with an
+error if any draw does not verify.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from giveaways.models import Giveaway
+from giveaways.services.draws import CHUNK_SIZE, verify_draw
+
+
+class Command(BaseCommand):
+    help = 'Verifies that recorded winner draws can be reproduced from their seed and entries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('giveaway_ids', nargs='*', type=int, help='Giveaways to verify (default: all with a recorded draw)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Entry ids fetched per round trip')
+
+    def handle(self, *args, **options):
+        giveaways = Giveaway.objects.order_by('id')
+        if options['giveaway_ids']:
+            giveaways = giveaways.filter(id__in=options['giveaway_ids'])
+        else:
+            giveaways = giveaways.filter(winners__isnull=False).exclude(winners__draw_seed='').distinct()
+
+        failed = 0
+        for giveaway in giveaways.iterator():
+            started = time.perf_counter()
+            result = verify_draw(giveaway, chunk_size=options['chunk_size'])
+            elapsed = time.perf_counter() - started
+            label = f'Giveaway {giveaway.pk}: {result.count} entries in {elapsed:.2f}s'
+            if result.ok:
+                winners = giveaway.winners.count()
+                skipped = f', {len(result.skipped)} duplicate pick(s) skipped' if result.skipped else ''
+                self.stdout.write(self.style.SUCCESS(f'{label} - OK ({winners} winner(s){skipped})'))
+            else:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'{label} - FAILED'))
+                for problem in result.problems:
+                    self.stdout.write(f'    {problem}')
+
+        if failed:
+            raise CommandError(f'{failed} draw(s) failed verification')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0003_add_notification_sent_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giveaway',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-19 15:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0004_business_logo_variants'),
+        ('giveaways', '0004_giveaway_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='giveaway',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['end_date', 'id'], name='giveaway_active_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='giveaway',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['business', 'end_date'], name='giveaway_active_biz_end_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+"""
+BRIN index on Entry.entered_at (PostgreSQL only).
+
+Entries are append-only, so entered_at follows the physical row order and a
+BRIN index answers time-range scans (analytics, admin date filters) at a
+fraction of a B-tree's size. Built CONCURRENTLY so entry submission is not
+blocked; other databases skip this migration.
+"""
+
+from django.db import migrations
+
+INDEX_NAME = 'entry_entered_at_brin'
+
+
+def create_brin(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} '
+        f'ON giveaways_entry USING brin (entered_at) WITH (pages_per_range = 32)'
+    )
+
+
+def drop_brin(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('giveaways', '0005_active_giveaway_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin, drop_brin, elidable=False),
+    ]
@@ -0,0 +1,100 @@
+"""
+Full-text search table for giveaways (see giveaways/search.py).
+
+Creates an FTS5 virtual table on SQLite or a tsvector table with a GIN
+index on PostgreSQL, then indexes the existing giveaways. Other databases
+skip this migration and search with icontains filters.
+
+The schema and word folding are copied here as they were when the
+migration was written, so later changes to giveaways/search.py do not
+change what it does; run the rebuild_search_index command after changing
+the folding.
+"""
+
+import re
+import unicodedata
+
+from django.db import migrations
+
+SEARCH_TABLE = 'giveaways_search'
+
+SQLITE_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    title, business_name, city, description, prefix='2 3'
+)
+"""
+
+POSTGRES_SCHEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        giveaway_id integer PRIMARY KEY REFERENCES giveaways_giveaway (id) ON DELETE CASCADE,
+        document tsvector NOT NULL
+    )
+    """,
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin ON {SEARCH_TABLE} USING gin (document)",
+]
+
+NORWEGIAN_FOLD = str.maketrans({'ø': 'o', 'æ': 'ae'})
+
+
+def fold_word(word):
+    word = unicodedata.normalize('NFKD', word.lower().strip())
+    return ''.join(c for c in word if c.isalnum()).translate(NORWEGIAN_FOLD)
+
+
+def fold_text(text):
+    if not text:
+        return ''
+    return ' '.join(filter(None, (fold_word(word) for word in re.split(r'[\s\-/.,;:]+', text))))
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(SQLITE_SCHEMA)
+    elif connection.vendor == 'postgresql':
+        for statement in POSTGRES_SCHEMA:
+            schema_editor.execute(statement)
+    else:
+        return
+
+    Giveaway = apps.get_model('giveaways', 'Giveaway')
+    rows = Giveaway.objects.using(connection.alias).values_list(
+        'id', 'title', 'business__name', 'business__city', 'description'
+    )
+    documents = [(row[0], *(fold_text(value) for value in row[1:])) for row in rows]
+    if not documents:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(doc[0],) for doc in documents])
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, business_name, city, description) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                documents,
+            )
+        else:
+            vector = ' || '.join(
+                f"setweight(to_tsvector('simple', %s), '{weight}')" for weight in 'ABCD'
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (giveaway_id, document) VALUES (%s, {vector}) "
+                f"ON CONFLICT (giveaway_id) DO UPDATE SET document = EXCLUDED.document",
+                documents,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0006_entry_entered_at_brin'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index, elidable=False),
+    ]
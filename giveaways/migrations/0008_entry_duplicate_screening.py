@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-19 16:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0007_giveaway_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='device_key',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='duplicate_reason',
+            field=models.CharField(blank=True, choices=[('email', 'Samme e-postadresse'), ('device', 'Samme enhet')], help_text='Set when the entry matches an earlier entry by another account in the same giveaway', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['giveaway', 'email_key'], name='giveaways_e_giveawa_21e5af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['giveaway', 'device_key'], name='giveaways_e_giveawa_011cef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['giveaway', 'duplicate_reason'], name='giveaways_e_giveawa_7ba377_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+import giveaways.models
+
+
+def assign_seeds(apps, schema_editor):
+    # AddField gives every existing row the same default value
+    Giveaway = apps.get_model('giveaways', 'Giveaway')
+    rows = list(Giveaway.objects.using(schema_editor.connection.alias).only('id'))
+    for row in rows:
+        row.draw_seed = giveaways.models.new_draw_seed()
+    Giveaway.objects.using(schema_editor.connection.alias).bulk_update(rows, ['draw_seed'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0008_entry_duplicate_screening'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giveaway',
+            name='draw_seed',
+            field=models.CharField(default=giveaways.models.new_draw_seed, editable=False, max_length=64),
+        ),
+        migrations.RunPython(assign_seeds, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='winner',
+            name='draw_attempt',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='draw_entry_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='draw_index',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='draw_root',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='draw_seed',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
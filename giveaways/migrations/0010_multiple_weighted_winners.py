@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-19 16:49
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0009_draw_seed_commitment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='winner',
+            options={'ordering': ['-selected_at', 'rank'], 'verbose_name': 'Winner', 'verbose_name_plural': 'Winners'},
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='weight',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='early_bird_hours',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Early Entry Bonus (hours)'),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='early_bird_weight',
+            field=models.PositiveSmallIntegerField(default=2, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Early Entry Weight'),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='number_of_winners',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(100)], verbose_name='Number of Winners'),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='draw_key',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='rank',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name='winner',
+            name='draw_attempt',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='winner',
+            name='giveaway',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='winners', to='giveaways.giveaway'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='winner',
+            unique_together={('giveaway', 'user')},
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['giveaway', 'weight'], name='giveaways_e_giveawa_7d8940_idx'),
+        ),
+    ]
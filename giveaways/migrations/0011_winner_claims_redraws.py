@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-19 17:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0010_multiple_weighted_winners'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='winner',
+            name='claim_deadline',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='redrawn',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='replaces',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='replacements', to='giveaways.winner'),
+        ),
+        migrations.AddField(
+            model_name='winner',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Venter på bekreftelse'), ('claimed', 'Bekreftet'), ('expired', 'Ikke bekreftet i tide'), ('disqualified', 'Diskvalifisert')], default='pending', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='winner',
+            index=models.Index(fields=['status', 'claim_deadline'], name='giveaways_w_status_f49d63_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='winner',
+            index=models.Index(fields=['redrawn', 'status'], name='giveaways_w_redrawn_a9baab_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0011_winner_claims_redraws'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='winner',
+            name='redraw_tried_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,16 +1,28 @@
+import hashlib
 import logging
+import secrets
+from datetime import timedelta
 from typing import Dict, List, Optional, Union, Any, Tuple
 
 from django.db import models
 from django.conf import settings
 from django.urls import reverse
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils import timezone
 
 from businesses.models import Business
 
 logger = logging.getLogger(__name__)
 
+MAX_WINNERS = 100
+
+
+def new_draw_seed() -> str:
+    """Secret 256-bit seed for a giveaway's draw (see services/draws.py)."""
+    return secrets.token_hex(32)
+
+
 class Giveaway(models.Model):
     """
     Model for giveaways on Raildrops.
@@ -21,6 +33,7 @@ class Giveaway(models.Model):
         title (CharField): Title of the giveaway
         description (TextField): Detailed description of the giveaway
         image (ImageField): Optional image for the giveaway
+        image_variants (JSONField): Resized WebP/JPEG versions of image, filled asynchronously
         prize_value (DecimalField): Optional monetary value of the prize
         start_date (DateTimeField): When the giveaway starts
         end_date (DateTimeField): When the giveaway ends
@@ -28,6 +41,12 @@ class Giveaway(models.Model):
         created_at (DateTimeField): When the giveaway was created
         signup_question (CharField): Question users must answer to participate
         signup_options (JSONField): Answer options for the question (max 4)
+        number_of_winners (PositiveSmallIntegerField): How many winners are drawn
+        early_bird_hours (PositiveSmallIntegerField): Entries within this many
+            hours of the start get early_bird_weight chances (0 = off)
+        early_bird_weight (PositiveSmallIntegerField): Weight of early entries
+        draw_seed (CharField): Secret seed of the draw; only its hash
+            (draw_commitment) is shown until the winner is drawn
     """
     business = models.ForeignKey(
         Business, 
@@ -38,6 +57,7 @@ class Giveaway(models.Model):
     title = models.CharField(max_length=255, db_index=True)
     description = models.TextField()
     image = models.ImageField(upload_to="giveaway_images/", blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     prize_value = models.DecimalField(
         max_digits=10, 
         decimal_places=2, 
@@ -60,6 +80,22 @@ class Giveaway(models.Model):
         verbose_name="Answer Options (max 4)"
     )
 
+    number_of_winners = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_WINNERS)],
+        verbose_name="Number of Winners"
+    )
+    early_bird_hours = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Early Entry Bonus (hours)"
+    )
+    early_bird_weight = models.PositiveSmallIntegerField(
+        default=2,
+        validators=[MinValueValidator(1)],
+        verbose_name="Early Entry Weight"
+    )
+    draw_seed = models.CharField(max_length=64, default=new_draw_seed, editable=False)
+
     def __str__(self) -> str:
         """Return a string representation of the giveaway.
         
@@ -68,6 +104,24 @@ class Giveaway(models.Model):
         """
         return f"{self.title} ({self.business.name})"
         
+    @property
+    def business_city(self) -> str:
+        """City of the hosting business (also available on GiveawaySnapshot).
+
+        Returns:
+            str: The business city
+        """
+        return self.business.city
+
+    @property
+    def draw_commitment(self) -> str:
+        """SHA-256 of the draw seed, published before the giveaway ends.
+
+        Returns:
+            str: Hex digest
+        """
+        return hashlib.sha256(bytes.fromhex(self.draw_seed)).hexdigest()
+
     def get_absolute_url(self) -> str:
         """Returns the URL to access a detail record for this giveaway.
         
@@ -181,15 +235,27 @@ class Giveaway(models.Model):
     
     @property
     def has_winner(self) -> bool:
-        """Check if this giveaway has a winner.
+        """Check if winners have been drawn for this giveaway.
+        
+        Uses a `winners_drawn` count annotation when the queryset has one.
         
         Returns:
-            bool: True if a winner has been selected for this giveaway
+            bool: True if at least one winner has been selected
         """
-        try:
-            return hasattr(self, 'winner') and self.winner is not None
-        except Exception:
-            return False
+        drawn = getattr(self, 'winners_drawn', None)
+        if drawn is not None:
+            return drawn > 0
+        return self.pk is not None and self.winners.exists()
+
+    def entry_weight(self, entered_at) -> int:
+        """Draw weight of an entry submitted at `entered_at`.
+        
+        Returns:
+            int: early_bird_weight within early_bird_hours of the start, else 1
+        """
+        if self.early_bird_hours and entered_at <= self.start_date + timedelta(hours=self.early_bird_hours):
+            return self.early_bird_weight
+        return 1
             
     def get_winner_display_url(self) -> str:
         """Get the URL for displaying the winner details.
@@ -213,6 +279,18 @@ class Giveaway(models.Model):
             models.Index(fields=['business', 'is_active']),
             models.Index(fields=['start_date', 'end_date']),
             models.Index(fields=['is_active', 'start_date', 'end_date']),
+            # Partial indexes: only active giveaways are listed or drawn, so
+            # inactive rows are left out and the indexes stay small
+            models.Index(
+                fields=['end_date', 'id'],
+                condition=models.Q(is_active=True),
+                name='giveaway_active_end_idx',
+            ),
+            models.Index(
+                fields=['business', 'end_date'],
+                condition=models.Q(is_active=True),
+                name='giveaway_active_biz_end_idx',
+            ),
         ]
 
 class Entry(models.Model):
@@ -225,6 +303,11 @@ class Entry(models.Model):
         answer (CharField): The answer option selected by the user
         user_location_city (CharField): The city of the user when they entered
         entered_at (DateTimeField): When the entry was submitted
+        email_key, device_key (CharField): Screening keys of the normalized
+            email and the entry request
+        duplicate_reason (CharField): 'email' or 'device' if another account
+            entered earlier with the same key
+        weight (PositiveSmallIntegerField): Chances in weighted draws (1 = normal)
     """
     giveaway = models.ForeignKey(
         Giveaway, 
@@ -241,6 +324,16 @@ class Entry(models.Model):
     answer = models.CharField(max_length=255, blank=True, db_index=True)
     user_location_city = models.CharField(max_length=100, blank=True, db_index=True)
     entered_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Duplicate screening (giveaways/services/duplicates.py)
+    email_key = models.CharField(max_length=16, blank=True, editable=False)
+    device_key = models.CharField(max_length=16, blank=True, editable=False)
+    duplicate_reason = models.CharField(
+        max_length=10,
+        blank=True,
+        choices=[('email', 'Samme e-postadresse'), ('device', 'Samme enhet')],
+        help_text="Set when the entry matches an earlier entry by another account in the same giveaway",
+    )
+    weight = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
 
     class Meta:
         verbose_name = "Entry"
@@ -251,6 +344,10 @@ class Entry(models.Model):
             models.Index(fields=['giveaway', 'answer']),
             models.Index(fields=['user', 'entered_at']),
             models.Index(fields=['user_location_city']),
+            models.Index(fields=['giveaway', 'email_key']),
+            models.Index(fields=['giveaway', 'device_key']),
+            models.Index(fields=['giveaway', 'duplicate_reason']),
+            models.Index(fields=['giveaway', 'weight']),
         ]
         
     def __str__(self) -> str:
@@ -325,15 +422,43 @@ class Winner(models.Model):
     Model for giveaway winners. Links a user with a giveaway after winner selection.
     
     Attributes:
-        giveaway (OneToOneField): The giveaway this winner is for (one winner per giveaway)
+        giveaway (ForeignKey): The giveaway this winner is for (number_of_winners per giveaway)
         user (ForeignKey): The user who won the giveaway
+        rank (PositiveSmallIntegerField): Order in which the winner was drawn, from 1
         selected_at (DateTimeField): When the winner was selected
         notification_sent (BooleanField): Whether a notification has been sent to the winner
+        draw_seed, draw_root, draw_entry_count, draw_index, draw_attempt: The
+            revealed seed, Merkle root and number of entries at draw time, the
+            winning entry's position and the attempt that picked it
+        draw_key (CharField): Sampling key of the entry in weighted draws,
+            blank in indexed draws (see services/draws.py)
+        status (CharField): pending until the winner claims the prize; expired
+            or disqualified winners are replaced by a redraw
+        claim_deadline (DateTimeField): When a pending winner expires (None = never)
+        claimed_at (DateTimeField): When the winner claimed the prize
+        redrawn (BooleanField): Set once a replacement has been drawn for this
+            expired or disqualified winner
+        redraw_tried_at (DateTimeField): Last redraw run that found no
+            replacement; such places are retried after the others
+        replaces (ForeignKey): The winner this one was drawn to replace
     """
-    giveaway = models.OneToOneField(
+    PENDING = 'pending'
+    CLAIMED = 'claimed'
+    EXPIRED = 'expired'
+    DISQUALIFIED = 'disqualified'
+    STATUS_CHOICES = [
+        (PENDING, 'Venter på bekreftelse'),
+        (CLAIMED, 'Bekreftet'),
+        (EXPIRED, 'Ikke bekreftet i tide'),
+        (DISQUALIFIED, 'Diskvalifisert'),
+    ]
+    # Winners that hold a place; the others are kept for the draw record
+    ACTIVE_STATUSES = (PENDING, CLAIMED)
+
+    giveaway = models.ForeignKey(
         Giveaway, 
         on_delete=models.CASCADE, 
-        related_name="winner",
+        related_name="winners",
         db_index=True
     )
     user = models.ForeignKey(
@@ -342,8 +467,29 @@ class Winner(models.Model):
         related_name="giveaway_wins",
         db_index=True
     )
+    rank = models.PositiveSmallIntegerField(default=1)
     selected_at = models.DateTimeField(auto_now_add=True, db_index=True)
     notification_sent = models.BooleanField(default=False, db_index=True)
+    # Draw record; blank for winners drawn before seed commitments
+    draw_seed = models.CharField(max_length=64, blank=True, editable=False)
+    draw_root = models.CharField(max_length=64, blank=True, editable=False)
+    draw_entry_count = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    draw_index = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    draw_attempt = models.PositiveIntegerField(default=0, editable=False)
+    draw_key = models.CharField(max_length=32, blank=True, editable=False)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    claim_deadline = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    redrawn = models.BooleanField(default=False, editable=False)
+    redraw_tried_at = models.DateTimeField(null=True, blank=True, editable=False)
+    replaces = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="replacements",
+        editable=False
+    )
 
     def __str__(self) -> str:
         """
@@ -361,6 +507,43 @@ class Winner(models.Model):
         self.notification_sent = True
         self.save(update_fields=['notification_sent'])
     
+    @property
+    def is_active(self) -> bool:
+        """True while the winner holds a place (pending or claimed)."""
+        return self.status in self.ACTIVE_STATUSES
+    
+    def can_claim(self) -> bool:
+        """
+        Check if the winner can still claim the prize.
+        
+        Returns:
+            bool: True if pending and the claim deadline has not passed
+        """
+        return self.status == self.PENDING and (self.claim_deadline is None or timezone.now() <= self.claim_deadline)
+    
+    def claim(self) -> bool:
+        """
+        Claim the prize, if the winner still can.
+        
+        The status is changed with a conditional UPDATE, so a claim racing
+        the expiry task (or an admin disqualifying the winner) cannot
+        overwrite it. On failure the current status is reloaded.
+        
+        Returns:
+            bool: True if the prize was claimed
+        """
+        now = timezone.now()
+        claimed = Winner.objects.filter(
+            models.Q(claim_deadline__isnull=True) | models.Q(claim_deadline__gte=now),
+            pk=self.pk,
+            status=self.PENDING,
+        ).update(status=self.CLAIMED, claimed_at=now)
+        if not claimed:
+            self.refresh_from_db(fields=['status', 'claimed_at'])
+            return False
+        self.status, self.claimed_at = self.CLAIMED, now
+        return True
+    
     def get_entry(self) -> Optional['Entry']:
         """
         Get the entry that this winner submitted for the giveaway.
@@ -394,8 +577,12 @@ class Winner(models.Model):
         """
         verbose_name = "Winner"
         verbose_name_plural = "Winners"
-        ordering = ['-selected_at']
+        ordering = ['-selected_at', 'rank']
+        unique_together = ('giveaway', 'user')
         indexes = [
             models.Index(fields=['user', 'selected_at']),
             models.Index(fields=['notification_sent']),
+            # Expired claims and vacancies awaiting a redraw (services/redraws.py)
+            models.Index(fields=['status', 'claim_deadline']),
+            models.Index(fields=['redrawn', 'status']),
         ]
\ No newline at end of file
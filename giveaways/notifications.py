@@ -0,0 +1,108 @@
+"""
+Winner notification emails.
+
+Pending winners not yet notified are emailed in batches: each
+winner gets an email with the claim link and deadline, and each
+giveaway's business gets one email listing the winners in the batch. A
+batch is sent over one SMTP connection and the winners whose email went
+out are marked with a single UPDATE, so notifying many winners costs a
+constant number of queries per batch. Winners whose email failed stay
+pending and are retried by the next call. Expired or disqualified winners
+are never emailed.
+
+The notify_winners task runs this from beat every 5 minutes, so winners
+hear about a draw (and their claim deadline) shortly after it.
+"""
+
+import logging
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.formats import date_format
+from django.utils.timezone import localtime
+
+from .models import Winner
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+
+def _winner_message(winner):
+    giveaway = winner.giveaway
+    url = f"{settings.SITE_URL.rstrip('/')}{reverse('giveaways:giveaway-winner', args=[giveaway.pk])}"
+    deadline = ''
+    if winner.claim_deadline:
+        deadline = f"Bekreft gevinsten innen {date_format(localtime(winner.claim_deadline), 'j. F Y H:i')}, ellers trekkes en ny vinner.\n"
+    return EmailMessage(
+        f"Gratulerer, du har vunnet {giveaway.title}!",
+        f"Hei!\n\nDu er trukket som vinner av {giveaway.title} fra {giveaway.business.name}.\n"
+        f"{deadline}Bekreft gevinsten her: {url}\n",
+        to=[winner.user.email],
+    )
+
+
+def _business_message(giveaway, winners):
+    names = "\n".join(f"{winner.rank}. {winner.user.get_full_name() or winner.user.email}" for winner in winners)
+    return EmailMessage(
+        f"Vinnere trukket for {giveaway.title}",
+        f"Hei!\n\nFølgende vinnere er trukket for {giveaway.title}:\n\n{names}\n",
+        to=[giveaway.business.user.email],
+    )
+
+
+def _send(connection, message):
+    """Send one message; False (logged) if it did not go out."""
+    try:
+        return bool(connection.send_messages([message]))
+    except Exception:
+        logger.exception("Could not send %r to %s", message.subject, ", ".join(message.to))
+        return False
+
+
+def send_winner_notifications(giveaway_ids=None, batch_size=BATCH_SIZE):
+    """
+    Email pending winners and their businesses.
+
+    Args:
+        giveaway_ids: Only notify winners of these giveaways (default: all)
+        batch_size: Winners per SMTP connection and UPDATE
+
+    Returns:
+        int: Number of winners whose email was sent
+    """
+    pending = (
+        Winner.objects.filter(notification_sent=False, status=Winner.PENDING)
+        .select_related('user', 'giveaway__business__user')
+        .order_by('giveaway_id', 'id')
+    )
+    if giveaway_ids is not None:
+        pending = pending.filter(giveaway_id__in=list(giveaway_ids))
+
+    notified = 0
+    position = Q()
+    while True:
+        batch = list(pending.filter(position)[:batch_size])
+        if not batch:
+            return notified
+        sent, failed = [], 0
+        with get_connection() as connection:
+            for _, winners in groupby(batch, key=lambda winner: winner.giveaway_id):
+                winners = list(winners)
+                for winner in winners:
+                    if _send(connection, _winner_message(winner)):
+                        sent.append(winner)
+                    else:
+                        failed += 1
+                if not _send(connection, _business_message(winners[0].giveaway, winners)):
+                    failed += 1
+        Winner.objects.filter(pk__in=[winner.pk for winner in sent]).update(notification_sent=True)
+        logger.info("Notified %s of %s winners (%s emails failed)", len(sent), len(batch), failed)
+        notified += len(sent)
+        if len(batch) < batch_size:
+            return notified
+        last = batch[-1]
+        position = Q(giveaway_id__gt=last.giveaway_id) | Q(giveaway_id=last.giveaway_id, id__gt=last.id)
@@ -1,6 +1,7 @@
 """
 Permissions for giveaways app. Centralizes all access logic for entries and giveaways.
 """
+from .models import Entry
 
 def is_member(user) -> bool:
     """
@@ -19,7 +20,12 @@ def is_member(user) -> bool:
 
 
 def can_enter_giveaway(user, giveaway) -> bool:
-    """Return True if user is allowed to enter the given giveaway."""
+    """
+    Return True if user is allowed to enter the given giveaway.
+
+    Accepts a Giveaway or a cached GiveawaySnapshot; only the entry check
+    reaches the database.
+    """
     if not user.is_authenticated:
         return False
     if not is_member(user):
@@ -27,6 +33,6 @@ def can_enter_giveaway(user, giveaway) -> bool:
     if not giveaway.is_active:
         return False
     # Only allow one entry per user per giveaway
-    if giveaway.entries.filter(user=user).exists():
+    if Entry.objects.filter(giveaway_id=giveaway.id, user=user).exists():
         return False
     return True
@@ -0,0 +1,232 @@
+"""
+Full-text search over giveaways and the businesses hosting them.
+
+Each giveaway has one row in the `giveaways_search` table holding its
+title, business name, city and description, folded with fold_text() so
+"Kaffe på Tromsø" is found by "kaffe", "pa" or "tromso". Rows are kept in
+sync by the signal handlers in giveaways/signals.py; bulk writes that
+bypass signals must call index_giveaways() themselves, and the
+rebuild_search_index command rebuilds the whole table.
+
+Storage depends on the database:
+
+- SQLite: an FTS5 virtual table with prefix indexes, ranked with bm25()
+- PostgreSQL: a weighted tsvector column with a GIN index, ranked with
+  ts_rank() (the same SearchVector/SearchRank building blocks as
+  django.contrib.postgres.search, written as SQL for the upsert)
+
+The table is created by migration 0007_giveaway_search_index. Every
+query token is matched as a prefix and all tokens must match. On other
+databases search falls back to icontains filters.
+"""
+
+import logging
+import re
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, router
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Giveaway
+from .services.entries import normalize_city
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'giveaways_search'
+
+# Relative weight of each column, most important first
+COLUMNS = ('title', 'business_name', 'city', 'description')
+BM25_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+TSVECTOR_WEIGHTS = ('A', 'B', 'C', 'D')
+
+MAX_QUERY_TOKENS = 8
+
+
+def fold_word(word: str) -> str:
+    """
+    Fold one word with normalize_city(), so words match city names.
+
+    Lower-cases, strips accents (NFKD) and drops everything that is not a
+    letter or digit, and maps ø/æ to o/ae.
+    """
+    return normalize_city(word)
+
+
+def fold_text(text: Optional[str]) -> str:
+    """Fold every word in text; words are separated by single spaces."""
+    if not text:
+        return ''
+    return ' '.join(filter(None, (fold_word(word) for word in re.split(r'[\s\-/.,;:]+', text))))
+
+
+def query_tokens(query: Optional[str]) -> List[str]:
+    """Return the folded tokens of a user query (at most MAX_QUERY_TOKENS)."""
+    return fold_text(query).split()[:MAX_QUERY_TOKENS]
+
+
+def is_supported(using=None) -> bool:
+    """Return True if the database has a full-text backend."""
+    return (using or connection).vendor in ('sqlite', 'postgresql')
+
+
+def _documents(queryset):
+    rows = queryset.values_list('id', 'title', 'business__name', 'business__city', 'description')
+    return [(row[0], *(fold_text(value) for value in row[1:])) for row in rows]
+
+
+def index_queryset(queryset, using=None) -> int:
+    """
+    (Re)index the giveaways in queryset.
+
+    Args:
+        queryset: Giveaway queryset
+        using: Database connection (default: the default connection)
+
+    Returns:
+        int: Number of giveaways indexed
+    """
+    conn = using or connection
+    if not is_supported(conn):
+        return 0
+    documents = _documents(queryset)
+    if not documents:
+        return 0
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(doc[0],) for doc in documents])
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s)",
+                documents,
+            )
+        else:
+            vector = ' || '.join(
+                f"setweight(to_tsvector('simple', %s), '{weight}')" for weight in TSVECTOR_WEIGHTS
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (giveaway_id, document) VALUES (%s, {vector}) "
+                f"ON CONFLICT (giveaway_id) DO UPDATE SET document = EXCLUDED.document",
+                documents,
+            )
+    return len(documents)
+
+
+def index_giveaways(ids) -> int:
+    """(Re)index the giveaways with the given ids."""
+    return index_queryset(Giveaway.objects.filter(pk__in=list(ids)))
+
+
+def remove_giveaways(ids) -> None:
+    """Remove giveaways from the search table."""
+    ids = [(pk,) for pk in ids]
+    if not ids or not is_supported():
+        return
+    key = 'rowid' if connection.vendor == 'sqlite' else 'giveaway_id'
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE {key} = %s", ids)
+
+
+def search_ids(query: str, limit: Optional[int] = None, live: bool = False) -> Optional[List[int]]:
+    """
+    Return ids of giveaways matching query, best match first.
+
+    Args:
+        query: The user's search text
+        limit: Maximum number of ids (default: SEARCH_MAX_RESULTS)
+        live: Only return active giveaways running now. The filter is part
+            of the ranked query, so ended giveaways do not use up the limit.
+
+    Returns:
+        list or None: Ranked ids, or None if the database has no
+        full-text backend (callers then use fallback_filter())
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    # Follow the router so searches from replica-read views use a replica
+    conn = connections[router.db_for_read(Giveaway)]
+    if not is_supported(conn):
+        return None
+    limit = limit or getattr(settings, 'SEARCH_MAX_RESULTS', 200)
+    key = 'rowid' if conn.vendor == 'sqlite' else 'giveaway_id'
+    join, live_filter, live_params = '', '', []
+    if live:
+        now = conn.ops.adapt_datetimefield_value(timezone.now())
+        join = f" JOIN {Giveaway._meta.db_table} giveaway ON giveaway.id = {SEARCH_TABLE}.{key}"
+        live_filter = " AND giveaway.is_active = %s AND giveaway.start_date <= %s AND giveaway.end_date >= %s"
+        live_params = [True, now, now]
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            match = ' '.join(f'"{token}"*' for token in tokens)
+            weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+            cursor.execute(
+                f"SELECT {SEARCH_TABLE}.rowid FROM {SEARCH_TABLE}{join} WHERE {SEARCH_TABLE} MATCH %s{live_filter} "
+                f"ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s",
+                [match, *live_params, limit],
+            )
+        else:
+            tsquery = ' & '.join(f'{token}:*' for token in tokens)
+            cursor.execute(
+                f"SELECT {SEARCH_TABLE}.giveaway_id FROM {SEARCH_TABLE}{join}, to_tsquery('simple', %s) query "
+                f"WHERE document @@ query{live_filter} "
+                f"ORDER BY ts_rank(document, query) DESC, {SEARCH_TABLE}.giveaway_id LIMIT %s",
+                [tsquery, *live_params, limit],
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def fallback_filter(query: str) -> Q:
+    """Filter matching every query word with icontains, for databases without full-text search."""
+    condition = Q()
+    for word in (query or '').split()[:MAX_QUERY_TOKENS]:
+        condition &= (
+            Q(title__icontains=word)
+            | Q(description__icontains=word)
+            | Q(business__name__icontains=word)
+            | Q(business__city__icontains=word)
+        )
+    return condition
+
+
+def typeahead(query: str, limit: Optional[int] = None) -> List[dict]:
+    """
+    Return live giveaways for the search box suggestions, best match first.
+
+    Results are cached briefly per folded query, so a user typing the same
+    prefix as many others is answered from the cache.
+    """
+    limit = limit or getattr(settings, 'SEARCH_TYPEAHEAD_LIMIT', 8)
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    cache_key = f"search:typeahead:{limit}:{' '.join(tokens)}"
+    results = cache.get(cache_key)
+    if results is not None:
+        return results
+
+    ids = search_ids(query, limit=limit, live=True)
+    if ids is None:
+        now = timezone.now()
+        live = Giveaway.objects.filter(is_active=True, start_date__lte=now, end_date__gte=now)
+        live = live.filter(fallback_filter(query)).order_by('end_date')
+    else:
+        live = Giveaway.objects.filter(pk__in=ids)
+    rows = live.values('id', 'title', 'business__name', 'business__city')[:limit]
+    if ids is not None:
+        position = {pk: i for i, pk in enumerate(ids)}
+        rows = sorted(rows, key=lambda row: position[row['id']])
+    results = [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'business': row['business__name'],
+            'city': row['business__city'],
+            'url': reverse('giveaways:giveaway-detail', args=[row['id']]),
+        }
+        for row in rows
+    ]
+    cache.set(cache_key, results, getattr(settings, 'SEARCH_TYPEAHEAD_CACHE_TIMEOUT', 60))
+    return results
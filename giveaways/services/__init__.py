@@ -2,37 +2,43 @@
 Services package for giveaways.
 
 This package contains service modules for complex business logic:
-- base.py: Common utilities like logging decorators
+- entries.py: City matching and entry validation
+- duplicates.py: Duplicate-entry and multi-account screening
+- draws.py: Seed commitments and verifiable draws
+- redraws.py: Claim deadlines and redraws for unclaimed prizes
 - winner_selection.py: Core winner selection logic
+- base.py: Common utilities like logging decorators
 - metrics.py: Performance tracking utilities
 
-The package also exposes key functions from the parent services.py module.
+The functions other apps use are re-exported here.
 """
 
 from .base import log_execution_time
-from .winner_selection import select_random_winner_scalable, process_winners_batch
-
-# Import and expose key functions from the parent services.py module
-import sys
-import os
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+from .draws import verify_draw
+from .duplicates import drawable_entries, screen_entry, screen_giveaway
+from .entries import cities_match, normalize_city, validate_entry
+from .redraws import redraw_expired_winners
+from .winner_selection import (
+    can_select_winners_for_expired_giveaways,
+    find_eligible_giveaways,
+    process_winners_batch,
+    select_random_winner,
+    select_random_winner_scalable,
+)
 
-# Import the validate_entry function from the parent module
-try:
-    from ..services import validate_entry, cities_match, normalize_city, select_random_winner, can_select_winners_for_expired_giveaways
-except ImportError as e:
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.error(f"Failed to import from parent services.py: {e}")
-    
-    # Define fallback functions to prevent crashes
-    def validate_entry(*args, **kwargs):
-        return {"success": False, "error": "Validation service unavailable. Please try again later."}
-        
-    def cities_match(city1, city2):
-        return city1.lower().strip() == city2.lower().strip()
-        
-    def normalize_city(city):
-        return city.lower().strip() if city else ""
+__all__ = [
+    'can_select_winners_for_expired_giveaways',
+    'cities_match',
+    'drawable_entries',
+    'find_eligible_giveaways',
+    'log_execution_time',
+    'normalize_city',
+    'process_winners_batch',
+    'redraw_expired_winners',
+    'screen_entry',
+    'screen_giveaway',
+    'select_random_winner',
+    'select_random_winner_scalable',
+    'validate_entry',
+    'verify_draw',
+]
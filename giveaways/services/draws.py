@@ -0,0 +1,513 @@
+"""
+Verifiable, reproducible draws.
+
+Every giveaway gets a secret 256-bit seed when it is created
+(Giveaway.draw_seed); its SHA-256 (Giveaway.draw_commitment) is shown on
+the giveaway page before the end date, so the seed cannot be changed to
+favour anyone once entries are in. At draw time the entries are committed
+to by a Merkle root over their ids in id order (RFC 6962 tree hash,
+leaves are 8-byte big-endian ids), computed in one streamed pass, and
+number_of_winners entries are drawn without replacement:
+
+Indexed draws (all weights 1):
+    Attempt 0, 1, 2, ... picks the index
+    HMAC-SHA256(seed, "root:count:attempt:block") mod count, rejection
+    sampled so every index is equally likely. Indexes already picked are
+    skipped without a query; a new index costs one OFFSET query, and the
+    entry wins unless it is an excluded duplicate (services/duplicates.py).
+    N winners cost about N queries after the hashing pass.
+
+Weighted draws (some entry has weight > 1):
+    Efraimidis-Spirakis sampling: each entry gets the key
+    ln(u) / weight with u = HMAC-SHA256(seed, "key:id") scaled to (0, 1),
+    and the N largest keys win. Keys are computed in the same streamed
+    pass as the root (leaves then also carry the weight), keeping a heap of
+    the best N + DRAW_SPARES candidates: O(n log N) time, O(N) memory.
+
+Redraws for unclaimed prizes (redraw_entries) continue the same draw:
+later attempts, or the next largest keys. If the entries changed since
+(a member deleted their account), the redraw starts a new draw record
+over the current entries instead. Each winner stores the seed, root,
+count, its entry's index and the attempt (indexed) or key (weighted), so
+anyone with the entry ids can recompute the draw.
+verify_draw() does that in a single streamed pass with memory
+independent of the number of entries, and the verify_draw management
+command runs it for million-entry giveaways.
+"""
+
+import hashlib
+import heapq
+import hmac
+import itertools
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from ..models import Entry, Giveaway, Winner
+from .base import SelectionError
+
+logger = logging.getLogger(__name__)
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+MAX_ATTEMPTS = 1000
+DRAW_SPARES = 16
+CHUNK_SIZE = 2000
+
+
+class MerkleRoot:
+    """
+    Streaming RFC 6962 Merkle tree hash over entry ids (and weights).
+
+    Keeps one hash per set bit of the leaf count, so memory is O(log n).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._stack = []  # (subtree size, hash), sizes strictly decreasing
+
+    def add(self, entry_id: int, weight: Optional[int] = None) -> None:
+        leaf = entry_id.to_bytes(8, 'big')
+        if weight is not None:
+            leaf += weight.to_bytes(4, 'big')
+        size, digest = 1, hashlib.sha256(LEAF_PREFIX + leaf).digest()
+        while self._stack and self._stack[-1][0] == size:
+            left_size, left = self._stack.pop()
+            size, digest = left_size + size, hashlib.sha256(NODE_PREFIX + left + digest).digest()
+        self._stack.append((size, digest))
+        self.count += 1
+
+    def hexdigest(self) -> str:
+        if not self._stack:
+            return hashlib.sha256(b'').hexdigest()
+        digest = self._stack[-1][1]
+        for _, left in reversed(self._stack[:-1]):
+            digest = hashlib.sha256(NODE_PREFIX + left + digest).digest()
+        return digest.hex()
+
+
+def entry_rows(giveaway_id: int, *fields: str, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+    """(id, *fields) of a giveaway's entries in id order, streamed from a server-side cursor."""
+    return Entry.objects.filter(giveaway_id=giveaway_id).order_by('id').values_list('id', *fields).iterator(
+        chunk_size=chunk_size,
+    )
+
+
+def entries_root(giveaway_id: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Merkle root and number of a giveaway's entries (ids only).
+
+    Returns:
+        tuple: (root hex digest, entry count)
+    """
+    tree = MerkleRoot()
+    for entry_id, in entry_rows(giveaway_id, chunk_size=chunk_size):
+        tree.add(entry_id)
+    return tree.hexdigest(), tree.count
+
+
+def is_weighted(giveaway_id: int) -> bool:
+    """True if any entry of the giveaway has a weight other than 1."""
+    return Entry.objects.filter(giveaway_id=giveaway_id).exclude(weight=1).exists()
+
+
+def pick_index(seed: str, root: str, count: int, attempt: int = 0) -> int:
+    """
+    Uniform index in [0, count) derived from the seed and the entry root.
+
+    HMAC-SHA256 is used as a counter-mode generator keyed with the seed;
+    outputs above the largest multiple of count are rejected, so the
+    modulo is unbiased.
+    """
+    if count < 1:
+        raise ValueError("Cannot pick from an empty entry set")
+    space = 1 << 256
+    limit = space - space % count
+    key = bytes.fromhex(seed)
+    for block in itertools.count():
+        message = f'{root}:{count}:{attempt}:{block}'.encode()
+        value = int.from_bytes(hmac.new(key, message, hashlib.sha256).digest(), 'big')
+        if value < limit:
+            return value % count
+
+
+def sampling_key(seed: str, entry_id: int, weight: int) -> float:
+    """Efraimidis-Spirakis key ln(u) / weight; larger keys win."""
+    digest = hmac.new(bytes.fromhex(seed), f'key:{entry_id}'.encode(), hashlib.sha256).digest()
+    # 53 random bits, mapped into the open interval (0, 1)
+    u = ((int.from_bytes(digest[:8], 'big') >> 11) + 0.5) / (1 << 53)
+    return math.log(u) / weight
+
+
+@dataclass
+class Draw:
+    """One drawn entry and how it was picked."""
+    entry: Entry
+    seed: str
+    root: str
+    count: int
+    index: int
+    attempt: int = 0
+    key: Optional[float] = None
+
+    def winner_fields(self) -> dict:
+        """Draw record fields for Winner."""
+        return {
+            'draw_seed': self.seed,
+            'draw_root': self.root,
+            'draw_entry_count': self.count,
+            'draw_index': self.index,
+            'draw_attempt': self.attempt,
+            'draw_key': '' if self.key is None else repr(self.key),
+        }
+
+
+def replay_indexes(seed: str, root: str, count: int, attempts: int):
+    """
+    Indexes picked by attempts 0 .. attempts-1 of an indexed draw.
+
+    Returns:
+        tuple: (list of (attempt, index) for first picks of an index, set
+        of all indexes picked)
+    """
+    fresh, seen = [], set()
+    for attempt in range(attempts):
+        if len(seen) == count:
+            break
+        index = pick_index(seed, root, count, attempt)
+        if index not in seen:
+            seen.add(index)
+            fresh.append((attempt, index))
+    return fresh, seen
+
+
+def pick_entries(
+    giveaway: Giveaway,
+    root: str,
+    count: int,
+    wanted: int,
+    accept: Callable[[Entry], bool],
+    first_attempt: int = 0,
+    seen: Optional[Set[int]] = None,
+) -> List[Draw]:
+    """
+    Indexed draw of up to `wanted` entries, starting at `first_attempt`.
+
+    Args:
+        giveaway: The giveaway (its draw_seed is used)
+        root, count: Merkle root and number of the giveaway's entries
+        wanted: Number of entries to draw
+        accept: Returns False for entries that may not win; rejected
+            picks are skipped by drawing the next attempt
+        first_attempt: First attempt to draw (continuing an earlier draw)
+        seen: Indexes picked by the earlier attempts, which are skipped
+
+    Returns:
+        list of Draw, fewer than wanted if every entry has been picked
+
+    Raises:
+        SelectionError: If more than MAX_ATTEMPTS consecutive picks were
+            rejected
+    """
+    seen = set() if seen is None else set(seen)
+    entries = Entry.objects.filter(giveaway_id=giveaway.id).order_by('id')
+    draws = []
+    rejected = 0
+    for attempt in itertools.count(first_attempt):
+        if len(draws) == wanted or len(seen) == count:
+            break
+        index = pick_index(giveaway.draw_seed, root, count, attempt)
+        if index in seen:
+            continue
+        seen.add(index)
+        entry = entries[index:index + 1].get()
+        if accept(entry):
+            draws.append(Draw(entry, giveaway.draw_seed, root, count, index, attempt))
+            rejected = 0
+        else:
+            rejected += 1
+            if rejected > MAX_ATTEMPTS:
+                raise SelectionError(f"No eligible entry in {MAX_ATTEMPTS} picks for giveaway {giveaway.id}")
+    return draws
+
+
+def draw_weighted(
+    giveaway: Giveaway,
+    wanted: int,
+    accept: Callable[[Entry], bool],
+    skip_entry_ids: Iterable[int] = (),
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Draw]:
+    """
+    Weighted draw of up to `wanted` entries by the largest sampling keys.
+
+    Streams (id, weight) once, computing the Merkle root (weighted leaves)
+    and keeping the best wanted + DRAW_SPARES keys in a heap. If accept()
+    rejects so many candidates that the heap runs out, the pass is
+    repeated with a larger heap.
+
+    Args:
+        skip_entry_ids: Entries that may not be drawn again (earlier
+            winners); they are still part of the root
+    """
+    skip = set(skip_entry_ids)
+    size = wanted + DRAW_SPARES
+    while True:
+        tree = MerkleRoot()
+        heap = []  # (key, index, entry id), smallest key first
+        candidates = 0
+        for index, (entry_id, weight) in enumerate(entry_rows(giveaway.id, 'weight', chunk_size=chunk_size)):
+            tree.add(entry_id, weight)
+            if entry_id in skip:
+                continue
+            candidates += 1
+            item = (sampling_key(giveaway.draw_seed, entry_id, weight), index, entry_id)
+            if len(heap) < size:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        root, count = tree.hexdigest(), tree.count
+        entries = Entry.objects.in_bulk([entry_id for _, _, entry_id in heap])
+        draws = []
+        for key, index, entry_id in sorted(heap, reverse=True):
+            if accept(entries[entry_id]):
+                draws.append(Draw(entries[entry_id], giveaway.draw_seed, root, count, index, key=key))
+                if len(draws) == wanted:
+                    return draws
+        if candidates <= size:
+            return draws
+        size *= 4
+
+
+def draw_winners(
+    giveaway: Giveaway,
+    wanted: int,
+    accept: Callable[[Entry], bool],
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Draw]:
+    """
+    Draw up to `wanted` distinct winning entries of a giveaway.
+
+    Run inside the transaction that locks the giveaway and creates the
+    Winner rows, so the entry set cannot change between the snapshot and
+    the picks.
+
+    Args:
+        giveaway: The giveaway (its draw_seed is used)
+        wanted: Number of winners
+        accept: Returns False for entries that may not win
+        chunk_size: Rows fetched per round trip while hashing
+
+    Returns:
+        list of Draw in winning order; empty if the giveaway has no entries
+    """
+    if is_weighted(giveaway.id):
+        return draw_weighted(giveaway, wanted, accept, chunk_size=chunk_size)
+    root, count = entries_root(giveaway.id, chunk_size)
+    if count == 0:
+        return []
+    return pick_entries(giveaway, root, count, wanted, accept)
+
+
+def redraw_entries(
+    giveaway: Giveaway,
+    previous: List[Winner],
+    wanted: int,
+    accept: Callable[[Entry], bool],
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Draw]:
+    """
+    Draw `wanted` more entries, continuing the draw that picked `previous`.
+
+    Indexed draws continue at the attempt after the last recorded one,
+    with the earlier picks replayed from the seed (no queries), so a
+    redraw costs about one indexed query per replacement. Weighted draws
+    take the next largest keys in one streamed pass. Either way the
+    replacements extend the latest draw record and verify_draw() checks
+    them together with its earlier winners.
+
+    If the entries changed since that record (a winner-to-be deleted
+    their account), the replacements are drawn afresh over the current
+    entries and carry the new root and count: a new draw record.
+
+    Args:
+        giveaway: The giveaway (its draw_seed is used)
+        previous: All Winner rows of the giveaway, including replaced ones
+        wanted: Number of replacements
+        accept: Returns False for entries that may not win
+    """
+    recorded = [winner for winner in previous if winner.draw_seed]
+    if not recorded:
+        # Drawn before seed commitments: start a fresh draw
+        return draw_winners(giveaway, wanted, accept, chunk_size)
+    latest = max(recorded, key=lambda winner: winner.pk)
+    root, count = latest.draw_root, latest.draw_entry_count
+    record = [winner for winner in recorded if (winner.draw_root, winner.draw_entry_count) == (root, count)]
+    if latest.draw_key:
+        # One streamed pass either way; a changed root makes it a new record
+        skip = Entry.objects.filter(
+            giveaway_id=giveaway.id, user_id__in=[winner.user_id for winner in previous],
+        ).values_list('id', flat=True)
+        return draw_weighted(giveaway, wanted, accept, skip_entry_ids=skip, chunk_size=chunk_size)
+    if Entry.objects.filter(giveaway_id=giveaway.id).count() != count:
+        logger.info("Entries of giveaway %s changed since the draw, starting a new draw record", giveaway.id)
+        return draw_winners(giveaway, wanted, accept, chunk_size)
+    last_attempt = max(winner.draw_attempt for winner in record)
+    _, seen = replay_indexes(giveaway.draw_seed, root, count, last_attempt + 1)
+    return pick_entries(giveaway, root, count, wanted, accept, first_attempt=last_attempt + 1, seen=seen)
+
+
+@dataclass
+class Verification:
+    """Result of verify_draw(); ok is True only if every check passed."""
+    giveaway: Giveaway
+    root: str = ''
+    count: int = 0
+    skipped: List[int] = field(default_factory=list)
+    superseded: List[int] = field(default_factory=list)
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def verify_draw(giveaway: Giveaway, chunk_size: int = CHUNK_SIZE) -> Verification:
+    """
+    Recompute the draw of a giveaway's winners from the current entries.
+
+    Checks that the seed matches the giveaway's commitment, that the
+    Merkle root and count of the entries match the latest draw record and
+    that replaying it gives exactly its recorded winners. Picks that were
+    skipped (indexed draws) or entries that outrank a winner (weighted
+    draws) must be entries marked as duplicates or earlier winners. Entry
+    rows are streamed once; memory does not grow with the number of
+    entries.
+
+    Winners of earlier records (drawn before the entries changed) can
+    only be checked against the seed: their attempt must replay to the
+    recorded index, or their entry, if it still exists, to the recorded
+    key. They are listed in `superseded`.
+    """
+    result = Verification(giveaway)
+    winners = list(giveaway.winners.order_by('id'))
+    if not winners:
+        result.problems.append("The giveaway has no winners.")
+        return result
+    if any(not winner.draw_seed for winner in winners):
+        result.problems.append("A winner was drawn without a recorded seed and cannot be verified.")
+        return result
+
+    if len({winner.draw_seed for winner in winners}) != 1:
+        result.problems.append("Winners were recorded with different seeds.")
+        return result
+    seed = winners[0].draw_seed
+    if not hmac.compare_digest(hashlib.sha256(bytes.fromhex(seed)).hexdigest(), giveaway.draw_commitment):
+        result.problems.append("Seed does not match the giveaway's published commitment.")
+
+    # Records in the order they were started; only the latest matches the current entries
+    records: Dict[tuple, List[Winner]] = {}
+    for winner in winners:
+        records.setdefault((winner.draw_root, winner.draw_entry_count), []).append(winner)
+    *earlier, (root, count) = records
+    earlier_users: Set[int] = set()
+    for record in earlier:
+        _verify_superseded(result, records[record], seed, *record)
+        earlier_users.update(winner.user_id for winner in records[record])
+
+    latest = records[(root, count)]
+    if all(winner.draw_key for winner in latest):
+        _verify_weighted(result, latest, seed, earlier_users, chunk_size)
+    elif not any(winner.draw_key for winner in latest):
+        _verify_indexed(result, latest, seed, root, count, earlier_users, chunk_size)
+    else:
+        result.problems.append("Winners mix weighted and indexed draws.")
+        return result
+
+    if result.count != count:
+        result.problems.append(f"Entry count is {result.count}, the draw recorded {count}.")
+    if result.root != root:
+        result.problems.append("Merkle root of the entries does not match the recorded root.")
+    return result
+
+
+def _verify_superseded(result, winners, seed, root, count):
+    result.superseded.extend(winner.pk for winner in winners)
+    keyed = [winner for winner in winners if winner.draw_key]
+    if keyed:
+        entries = {
+            user_id: (entry_id, weight)
+            for user_id, entry_id, weight in Entry.objects.filter(
+                giveaway_id=result.giveaway.id, user_id__in=[winner.user_id for winner in keyed],
+            ).values_list('user_id', 'id', 'weight')
+        }
+        for winner in keyed:
+            # A deleted account's entry is gone; nothing left to replay
+            if winner.user_id in entries and repr(sampling_key(seed, *entries[winner.user_id])) != winner.draw_key:
+                result.problems.append(f"Winner {winner.pk}'s key does not match the replayed draw.")
+    indexed = {winner.draw_attempt: winner for winner in winners if not winner.draw_key}
+    if indexed:
+        fresh, _ = replay_indexes(seed, root, count, max(indexed) + 1)
+        fresh = dict(fresh)
+        for attempt, winner in indexed.items():
+            if fresh.get(attempt) != winner.draw_index:
+                result.problems.append(f"Winner {winner.pk}'s attempt {attempt} does not replay to its index.")
+
+
+def _verify_indexed(result, winners, seed, root, count, earlier_users, chunk_size):
+    by_attempt = {winner.draw_attempt: winner for winner in winners}
+    fresh, seen = replay_indexes(seed, root, count, max(by_attempt) + 1)
+    fresh_attempts = {attempt for attempt, _ in fresh}
+    for attempt in set(by_attempt) - fresh_attempts:
+        result.problems.append(f"Attempt {attempt} did not pick a new entry.")
+
+    found: Dict[int, int] = {}
+    tree = MerkleRoot()
+    for entry_id, in entry_rows(result.giveaway.id, chunk_size=chunk_size):
+        if tree.count in seen:
+            found[tree.count] = entry_id
+        tree.add(entry_id)
+    result.root, result.count = tree.hexdigest(), tree.count
+    if result.count != count or result.root != root:
+        return
+
+    entries = Entry.objects.in_bulk(list(found.values()))
+    for attempt, index in fresh:
+        entry = entries[found[index]]
+        winner = by_attempt.get(attempt)
+        if winner is None:
+            result.skipped.append(entry.id)
+            if not entry.duplicate_reason and entry.user_id not in earlier_users:
+                result.problems.append(f"Skipped pick {entry.id} is not marked as a duplicate.")
+        elif winner.draw_index != index or entry.user_id != winner.user_id:
+            result.problems.append(f"Attempt {attempt} picks entry {entry.id}, not winner {winner.pk}'s entry.")
+
+
+def _verify_weighted(result, winners, seed, earlier_users, chunk_size):
+    by_user = {winner.user_id: winner for winner in winners}
+    recorded = {
+        entry_id: by_user[user_id]
+        for entry_id, user_id in Entry.objects.filter(giveaway_id=result.giveaway.id, user_id__in=by_user)
+        .values_list('id', 'user_id')
+    }
+    if len(recorded) != len(winners):
+        result.problems.append("A winner has no entry in the giveaway.")
+        return
+    threshold = min(float(winner.draw_key) for winner in winners)
+
+    tree = MerkleRoot()
+    for index, (entry_id, weight, reason, user_id) in enumerate(
+        entry_rows(result.giveaway.id, 'weight', 'duplicate_reason', 'user_id', chunk_size=chunk_size)
+    ):
+        tree.add(entry_id, weight)
+        key = sampling_key(seed, entry_id, weight)
+        winner = recorded.get(entry_id)
+        if winner is not None:
+            if repr(key) != winner.draw_key or index != winner.draw_index:
+                result.problems.append(f"Winner {winner.pk}'s key or index does not match the replayed draw.")
+        elif key > threshold:
+            result.skipped.append(entry_id)
+            if not reason and user_id not in earlier_users:
+                result.problems.append(f"Entry {entry_id} outranks a winner but was not drawn.")
+    result.root, result.count = tree.hexdigest(), tree.count
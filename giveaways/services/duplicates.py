@@ -0,0 +1,270 @@
+"""
+Duplicate-entry and multi-account screening.
+
+unique_together on Entry stops one account from entering twice; this
+module catches one person entering through several accounts. Every entry
+gets two 64-bit keys:
+
+- email_key:  the member's email with aliases folded (case, '+tag',
+              dots and googlemail.com for Gmail), so kari+1@gmail.com and
+              k.ari@googlemail.com collide
+- device_key: client address (IPv6 by /64), User-Agent and
+              Accept-Language of the entry request
+
+An entry whose key matches an earlier entry in the same giveaway gets a
+duplicate_reason ('email' or 'device'). It is stored as normal (the
+member sees no difference), and reasons listed in ENTRY_SCREENING_EXCLUDE
+keep it out of the draw. Only 'email' is excluded by default: people
+behind one NAT address with the same phone model share a device_key, so
+a device match is only a signal for staff, shown on winners in the admin.
+
+Each giveaway has one sketch per key kind in the shared cache, split into
+SKETCH_BLOCKS blocks so a check reads and writes one small cache value.
+A block holds the exact key set until it has EXACT_LIMIT keys and then
+becomes a 4096-bit Bloom filter, so small giveaways are screened exactly
+and large ones in fixed memory (512 kB per kind at most). A hit is
+confirmed with an indexed query, so Bloom false positives and deleted
+entries never flag anyone; a miss costs no query at all.
+
+Sketch updates are not atomic across processes and the cache may evict
+them, so two entries can slip past each other. screen_giveaway() screens
+entries that were not screened at entry time (admin, imports) before a
+draw, and recheck_entry() verifies the drawn entry exactly against the
+earlier entries, so a missed duplicate can never win.
+"""
+
+import hashlib
+import ipaddress
+import logging
+import threading
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.ratelimit import client_ip
+
+from ..models import Entry
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'entry-screen:'
+KINDS = ('email', 'device')
+DEFAULT_EXCLUDE = ('email',)
+SKETCH_BLOCKS = 1024
+BLOCK_BITS = 4096
+BLOOM_HASHES = 4
+EXACT_LIMIT = 64
+SKETCH_TTL = 60 * 60 * 24 * 60
+GMAIL_DOMAINS = {'gmail.com', 'googlemail.com'}
+
+_locks = [threading.Lock() for _ in range(64)]
+
+
+def normalize_email(email: str) -> str:
+    """
+    Fold the usual aliases of an address into one form.
+
+    Lowercases, drops '+tag' from the local part and, for Gmail, dots
+    and the googlemail.com domain.
+    """
+    email = (email or '').strip().lower()
+    local, sep, domain = email.rpartition('@')
+    if not sep:
+        return email
+    local = local.split('+', 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f'{local}@{domain}'
+
+
+def _key(kind: str, value: str) -> str:
+    digest = hashlib.blake2b(
+        value.encode(), digest_size=8, key=settings.SECRET_KEY.encode()[:64], person=kind.encode(),
+    )
+    return digest.hexdigest()
+
+
+def email_key(email: str) -> str:
+    """16-hex-digit key of a normalized email address ('' for no address)."""
+    normalized = normalize_email(email)
+    return _key('email', normalized) if normalized else ''
+
+
+def device_key(request) -> str:
+    """16-hex-digit key of the client address and browser of a request."""
+    address = client_ip(request)
+    try:
+        ip = ipaddress.ip_address(address)
+        if ip.version == 6:
+            # Privacy extensions rotate the host part
+            address = str(ipaddress.ip_network(f'{ip}/64', strict=False).network_address)
+    except ValueError:
+        pass
+    browser = '|'.join((
+        address,
+        request.META.get('HTTP_USER_AGENT', ''),
+        request.META.get('HTTP_ACCEPT_LANGUAGE', ''),
+    ))
+    return _key('device', browser)
+
+
+def _block_and_bits(key: str):
+    value = int(key, 16)
+    block = (value >> 48) % SKETCH_BLOCKS
+    bits = [(value >> (12 * i)) & (BLOCK_BITS - 1) for i in range(BLOOM_HASHES)]
+    return block, bits, value
+
+
+def _sketch_contains_and_add(giveaway_id: int, kind: str, key: str) -> bool:
+    """Add key to the giveaway's sketch; return True if it may have been there."""
+    block, bits, value = _block_and_bits(key)
+    cache_key = f'{KEY_PREFIX}{giveaway_id}:{kind}:{block}'
+    try:
+        with _locks[hash(cache_key) % len(_locks)]:
+            stored = cache.get(cache_key)
+            if isinstance(stored, bytes):
+                bitmap = bytearray(stored)
+                seen = all(bitmap[bit >> 3] & (1 << (bit & 7)) for bit in bits)
+            else:
+                keys = stored or frozenset()
+                seen = value in keys
+                if seen:
+                    return True
+                if len(keys) < EXACT_LIMIT:
+                    cache.set(cache_key, keys | {value}, SKETCH_TTL)
+                    return False
+                # Block is full: switch to a Bloom filter holding the same keys
+                bitmap = bytearray(BLOCK_BITS // 8)
+                for old in keys:
+                    for bit in _block_and_bits(f'{old:016x}')[1]:
+                        bitmap[bit >> 3] |= 1 << (bit & 7)
+            if not seen:
+                for bit in bits:
+                    bitmap[bit >> 3] |= 1 << (bit & 7)
+                cache.set(cache_key, bytes(bitmap), SKETCH_TTL)
+            return seen
+    except Exception as e:
+        # Screening must never block entries; recheck_entry() covers the draw
+        logger.warning("Entry screening cache unavailable: %s", e)
+        return False
+
+
+def _earlier_match(giveaway_id: int, kind: str, key: str, user_id: int, before_id: Optional[int] = None) -> bool:
+    matches = Entry.objects.filter(giveaway_id=giveaway_id, **{f'{kind}_key': key}).exclude(user_id=user_id)
+    if before_id is not None:
+        matches = matches.filter(id__lt=before_id)
+    return matches.exists()
+
+
+def _screen(giveaway_id: int, user_id: int, keys: dict, before_id: Optional[int] = None) -> str:
+    reason = ''
+    for kind in KINDS:
+        key = keys.get(kind)
+        if not key:
+            continue
+        # Always add the key, so later entries are compared against it too
+        if _sketch_contains_and_add(giveaway_id, kind, key) and not reason:
+            if _earlier_match(giveaway_id, kind, key, user_id, before_id):
+                reason = kind
+    return reason
+
+
+def screening_enabled() -> bool:
+    return getattr(settings, 'ENTRY_SCREENING_ENABLED', True)
+
+
+def excluded_reasons() -> list:
+    """Duplicate reasons that keep an entry out of the draw."""
+    return list(getattr(settings, 'ENTRY_SCREENING_EXCLUDE', DEFAULT_EXCLUDE))
+
+
+def screen_entry(entry: Entry, request=None) -> str:
+    """
+    Set the screening keys and duplicate_reason of an unsaved entry.
+
+    Needs entry.giveaway and entry.user. O(1): two cache reads and at most
+    one indexed query when a sketch reports a match.
+
+    Returns:
+        str: The duplicate reason, '' if none
+    """
+    entry.email_key = email_key(entry.user.email)
+    entry.device_key = device_key(request) if request is not None else ''
+    if not screening_enabled():
+        return ''
+    entry.duplicate_reason = _screen(
+        entry.giveaway_id, entry.user_id, {'email': entry.email_key, 'device': entry.device_key},
+    )
+    if entry.duplicate_reason:
+        logger.info(
+            "Entry by user %s in giveaway %s matches an earlier entry (%s)",
+            entry.user_id, entry.giveaway_id, entry.duplicate_reason,
+        )
+    return entry.duplicate_reason
+
+
+def screen_giveaway(giveaway_id: int, chunk_size: int = 1000) -> int:
+    """
+    Screen entries of a giveaway that were not screened when created.
+
+    Only entries without an email_key are read (an indexed lookup), so a
+    giveaway whose entries all came through the entry form costs one
+    query.
+
+    Returns:
+        int: Number of entries screened
+    """
+    screened = 0
+    last_id = 0
+    while True:
+        rows = list(
+            Entry.objects.filter(giveaway_id=giveaway_id, email_key='', id__gt=last_id)
+            .order_by('id').values_list('id', 'user_id', 'user__email', 'duplicate_reason')[:chunk_size]
+        )
+        if not rows:
+            return screened
+        updates = []
+        # Keys of this chunk are not in the table until bulk_update below
+        chunk_keys = set()
+        for entry_id, user_id, email, reason in rows:
+            key = email_key(email) or '-'
+            if screening_enabled() and key != '-':
+                # A reason set by staff is kept
+                if _screen(giveaway_id, user_id, {'email': key}, before_id=entry_id) or key in chunk_keys:
+                    reason = reason or 'email'
+                chunk_keys.add(key)
+            updates.append(Entry(id=entry_id, email_key=key, duplicate_reason=reason))
+        Entry.objects.bulk_update(updates, ['email_key', 'duplicate_reason'])
+        screened += len(rows)
+        last_id = rows[-1][0]
+
+
+def recheck_entry(entry: Entry) -> str:
+    """
+    Verify an entry exactly against earlier entries of its giveaway.
+
+    Used on the drawn entry, so duplicates the sketches missed (races,
+    evicted sketches) cannot win. Stores and returns the reason found.
+    """
+    if not screening_enabled():
+        return entry.duplicate_reason
+    for kind in KINDS:
+        key = getattr(entry, f'{kind}_key')
+        if key and key != '-' and _earlier_match(entry.giveaway_id, kind, key, entry.user_id, before_id=entry.id):
+            if entry.duplicate_reason != kind:
+                entry.duplicate_reason = kind
+                Entry.objects.filter(pk=entry.pk).update(duplicate_reason=kind)
+                logger.info("Drawn entry %s in giveaway %s is a duplicate (%s)", entry.pk, entry.giveaway_id, kind)
+            return kind
+    return entry.duplicate_reason
+
+
+def drawable_entries(giveaway_id: int, reasons: Optional[Iterable[str]] = None):
+    """Entries of a giveaway that may win: all but excluded duplicates."""
+    reasons = excluded_reasons() if reasons is None else list(reasons)
+    entries = Entry.objects.filter(giveaway_id=giveaway_id)
+    if reasons and screening_enabled():
+        entries = entries.exclude(duplicate_reason__in=reasons)
+    return entries
+
@@ -0,0 +1,75 @@
+"""
+Entry rules for giveaways: city matching and entry validation.
+
+Members may only enter giveaways from businesses in their own city;
+cities are compared after normalize_city().
+"""
+import unicodedata
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Letters NFKD leaves alone that Norwegian users often type without
+NORWEGIAN_FOLD = str.maketrans({'ø': 'o', 'æ': 'ae'})
+
+
+def normalize_city(city: str) -> str:
+    """Normalize city name for consistent comparison.
+    
+    Removes accents, spaces, case sensitivity, and special characters,
+    and folds ø/æ, so "Tromsø" and "Tromso" compare equal.
+    
+    Args:
+        city: The city name to normalize
+        
+    Returns:
+        Normalized city name for comparison
+    """
+    if not city:
+        return ""
+    city = city.lower().strip()
+    city = unicodedata.normalize('NFKD', city)
+    # Remove all non-alphanumeric characters
+    city = ''.join(c for c in city if c.isalnum())
+    return city.translate(NORWEGIAN_FOLD)
+
+def cities_match(user_city: str, giveaway_city: str) -> bool:
+    """Return True if cities match (robust, accent/space/case insensitive)."""
+    return normalize_city(user_city) == normalize_city(giveaway_city)
+
+def validate_entry(user, giveaway, user_city: str, answer: str) -> dict:
+    """Validates entry submission. Returns dict with 'success', 'error' and optionally 'normalized_city'."""
+    # Always require an answer
+    if not answer:
+        return {"success": False, "error": "You must select an answer."}
+    
+    # Always require a city location
+    if not user_city:
+        return {"success": False, "error": "Your location must be registered. Allow location sharing or enter city manually."}
+    
+    # IMPORTANT: Users must be in the same city as the business to participate
+    # This is a vital function for Raildrops
+    normalized_user_city = normalize_city(user_city)
+    normalized_business_city = normalize_city(giveaway.business.city)
+    
+    # Log the normalization for debugging
+    logger.debug(
+        "Comparing user city %r (%s) with business city %r (%s)",
+        user_city, normalized_user_city, giveaway.business.city, normalized_business_city,
+    )
+    
+    if not normalized_user_city:
+        # Edge case: Empty normalized city
+        return {"success": False, "error": f"Invalid city format: {user_city}. Please update your profile with a valid city."}
+    
+    if normalized_user_city != normalized_business_city:
+        # Create a more informative error message
+        return {
+            "success": False, 
+            "error": f"You must be in {giveaway.business.city} to participate in this giveaway. Your current position is registered as {user_city}."
+        }
+    
+    # Log successful location match
+    logger.debug("Approved position: %s matches %s", user_city, giveaway.business.city)
+    
+    return {"success": True, "normalized_city": normalized_user_city}
@@ -0,0 +1,177 @@
+"""
+Claim deadlines and automatic redraws.
+
+Winners are drawn as pending with a claim deadline (WINNER_CLAIM_DAYS
+after the draw) and claim the prize from the winner page. A pending
+winner whose deadline passes is expired; staff can disqualify a winner
+in the admin. Either way the Winner row is kept, so the draw stays
+verifiable, and a replacement is drawn by continuing the original draw
+(see services/draws.py), skipping everyone who has already won. If the
+entries changed since (a deleted account), the replacement starts a new
+draw record over the current entries.
+
+redraw_expired_winners() runs periodically. Each run expires at most
+WINNER_REDRAW_BATCH_SIZE claims and redraws for at most that many
+giveaways, found through the (status, claim_deadline) and (redrawn,
+status) indexes; an indexed redraw costs about one query per
+replacement. Remaining work is picked up by the next run, so a run takes
+about the same time however many giveaways are waiting. A place that
+cannot be filled stays vacant and is retried after the others, so it
+does not hold up later runs.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from ..models import Giveaway, Winner
+from ..notifications import send_winner_notifications
+from .base import SelectionError, log_execution_time
+from .draws import redraw_entries
+from .duplicates import excluded_reasons, recheck_entry
+
+logger = logging.getLogger(__name__)
+
+VACATED_STATUSES = (Winner.EXPIRED, Winner.DISQUALIFIED)
+
+
+def claim_deadline(selected_at):
+    """Claim deadline for a winner drawn at selected_at (None if claims never expire)."""
+    days = getattr(settings, 'WINNER_CLAIM_DAYS', 7)
+    return selected_at + timedelta(days=days) if days else None
+
+
+def batch_size_setting() -> int:
+    return getattr(settings, 'WINNER_REDRAW_BATCH_SIZE', 50)
+
+
+def expire_claims(now=None, batch_size: Optional[int] = None) -> int:
+    """
+    Expire pending winners whose claim deadline has passed.
+
+    Returns:
+        int: Number of winners expired (at most batch_size)
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or batch_size_setting()
+    ids = list(
+        Winner.objects.filter(status=Winner.PENDING, claim_deadline__lt=now)
+        .order_by('claim_deadline').values_list('id', flat=True)[:batch_size]
+    )
+    # Re-check the status so a claim made meanwhile is not undone
+    return Winner.objects.filter(id__in=ids, status=Winner.PENDING).update(status=Winner.EXPIRED)
+
+
+def vacant_giveaway_ids(batch_size: Optional[int] = None) -> List[int]:
+    """
+    Giveaways with expired or disqualified winners that have not been redrawn.
+
+    Giveaways never tried come first, then those tried longest ago.
+    """
+    batch_size = batch_size or batch_size_setting()
+    return list(
+        Winner.objects.filter(redrawn=False, status__in=VACATED_STATUSES)
+        .values('giveaway_id').annotate(tried_at=Max('redraw_tried_at'))
+        .order_by(F('tried_at').asc(nulls_first=True), 'giveaway_id')
+        .values_list('giveaway_id', flat=True)[:batch_size]
+    )
+
+
+def redraw_giveaway(giveaway_id: int) -> List[Winner]:
+    """
+    Draw replacements for a giveaway's expired and disqualified winners.
+
+    A replacement takes the rank of the winner it replaces, which is then
+    marked redrawn (as are vacated winners whose place is no longer
+    needed). A place for which no eligible entry is left stays vacant,
+    with redraw_tried_at set so later runs try other giveaways first;
+    that is logged for staff.
+
+    Returns:
+        list: The new Winner rows
+    """
+    with transaction.atomic():
+        giveaway = Giveaway.objects.select_for_update().get(id=giveaway_id)
+        winners = list(giveaway.winners.order_by('rank', 'id'))
+        vacated = [winner for winner in winners if winner.status in VACATED_STATUSES and not winner.redrawn]
+        if not vacated:
+            return []
+        active = sum(winner.is_active for winner in winners)
+        wanted = min(len(vacated), max(giveaway.number_of_winners - active, 0))
+
+        previous_users = {winner.user_id for winner in winners}
+        excluded = excluded_reasons()
+        draws = []
+        if wanted:
+            try:
+                draws = redraw_entries(
+                    giveaway,
+                    winners,
+                    wanted,
+                    lambda entry: entry.user_id not in previous_users and recheck_entry(entry) not in excluded,
+                )
+            except SelectionError as e:
+                logger.warning("Cannot redraw giveaway %s: %s", giveaway_id, e)
+
+        now = timezone.now()
+        unfilled = vacated[len(draws):wanted]
+        if unfilled:
+            logger.warning("Giveaway %s: %s of %s places could not be redrawn", giveaway_id, len(unfilled), wanted)
+            Winner.objects.filter(pk__in=[winner.pk for winner in unfilled]).update(redraw_tried_at=now)
+        replacements = Winner.objects.bulk_create([
+            Winner(
+                giveaway=giveaway,
+                user_id=draw.entry.user_id,
+                rank=old.rank,
+                selected_at=now,
+                claim_deadline=claim_deadline(now),
+                replaces=old,
+                **draw.winner_fields()
+            )
+            for old, draw in zip(vacated, draws)
+        ])
+        Winner.objects.filter(pk__in=[winner.pk for winner in vacated if winner not in unfilled]).update(redrawn=True)
+    logger.info("Redrew %s winner(s) for giveaway %s", len(replacements), giveaway_id)
+    return replacements
+
+
+@log_execution_time
+def redraw_expired_winners(batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Expire overdue claims, redraw vacated places and notify the new winners.
+
+    Handles at most batch_size claims and giveaways per call.
+
+    Returns:
+        Dict with counts of expired winners, giveaways, replacements and
+        notified winners
+    """
+    batch_size = batch_size or batch_size_setting()
+    result = {"expired": expire_claims(batch_size=batch_size), "giveaways": 0, "replacements": 0, "errors": 0}
+
+    redrawn = []
+    for giveaway_id in vacant_giveaway_ids(batch_size):
+        result["giveaways"] += 1
+        try:
+            replacements = redraw_giveaway(giveaway_id)
+        except Exception as e:
+            result["errors"] += 1
+            logger.exception(f"Error redrawing winners for giveaway {giveaway_id}: {str(e)}")
+            continue
+        if replacements:
+            redrawn.append(giveaway_id)
+            result["replacements"] += len(replacements)
+
+    result["notified"] = 0
+    if redrawn:
+        try:
+            result["notified"] = send_winner_notifications(redrawn)
+        except Exception:
+            # The replacements stay pending; the notify_winners task retries them
+            logger.exception("Could not notify redrawn winners of giveaways %s", redrawn)
+    return result
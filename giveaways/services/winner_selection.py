@@ -4,6 +4,13 @@ Winner selection service for giveaways.
 This module provides scalable and robust implementations for selecting
 random winners from giveaway entries.
 
+select_random_winner() and can_select_winners_for_expired_giveaways()
+are the simple variants used by the select_winners management command.
+
+Each giveaway gets number_of_winners distinct winners, drawn without
+replacement in one draw (see services/draws.py); result["winner"] is the
+first of them and result["winners"] all of them in rank order.
+
 Key features:
 - Database chunking for large datasets
 - Transaction safety
@@ -11,7 +18,6 @@ Key features:
 - Error handling and logging
 """
 
-import random
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from django.db import transaction
@@ -21,12 +27,56 @@ from django.contrib.auth import get_user_model
 
 from ..models import Giveaway, Entry, Winner
 from .base import log_execution_time, SelectionError
+from .draws import draw_winners
+from .duplicates import drawable_entries, excluded_reasons, recheck_entry, screen_giveaway
 from .metrics import track_operation, MetricsCollector
+from .redraws import claim_deadline
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _create_winners(giveaway: Giveaway, chunk_size: int = 1000) -> List[Winner]:
+    """
+    Draw the giveaway's winners and create their Winner rows (rank 1..N).
+
+    Winners are pending until they claim the prize (see services/redraws.py).
+
+    Drawn entries are verified exactly and skipped if they turn out to be
+    duplicates of another account. Must run in a transaction.
+    """
+    excluded = excluded_reasons()
+    draws = draw_winners(
+        giveaway,
+        giveaway.number_of_winners,
+        lambda entry: recheck_entry(entry) not in excluded,
+        chunk_size=chunk_size,
+    )
+    if draws:
+        MetricsCollector.increment_counter("select_random_winner", "total_entries", draws[0].count)
+    now = timezone.now()
+    return Winner.objects.bulk_create([
+        Winner(
+            giveaway=giveaway,
+            user_id=draw.entry.user_id,
+            rank=rank,
+            selected_at=now,
+            claim_deadline=claim_deadline(now),
+            notification_sent=False,
+            **draw.winner_fields()
+        )
+        for rank, draw in enumerate(draws, start=1)
+    ])
+
+
+def _existing_winners(giveaway: Giveaway) -> List[Winner]:
+    return list(giveaway.winners.select_related('user').order_by('rank'))
+
+
+def _winner_emails(winners: List[Winner]) -> str:
+    return ", ".join(winner.user.email for winner in winners)
+
+
 @log_execution_time
 @track_operation("select_random_winner")
 def select_random_winner_scalable(giveaway_id: int, chunk_size: int = 1000) -> Dict[str, Any]:
@@ -35,7 +85,9 @@ def select_random_winner_scalable(giveaway_id: int, chunk_size: int = 1000) -> D
     
     Uses database optimization techniques to efficiently handle giveaways
     with large numbers of entries. Following Windsurf project requirements,
-    winners are randomly selected from ALL entries.
+    winners are randomly selected from ALL entries, except duplicates by
+    other accounts of the same person (see services/duplicates.py). The
+    drawn entry is verified exactly and redrawn if it turns out to be one.
     
     Args:
         giveaway_id: ID of the giveaway
@@ -48,10 +100,14 @@ def select_random_winner_scalable(giveaway_id: int, chunk_size: int = 1000) -> D
         "success": False,
         "message": "",
         "winner": None,
+        "winners": [],
         "performance_metrics": {}
     }
     
     try:
+        # Screen entries that did not come through the entry form
+        screen_giveaway(giveaway_id)
+
         with transaction.atomic():
             # Get the giveaway with a select_for_update to prevent race conditions
             giveaway = Giveaway.objects.select_for_update().get(id=giveaway_id)
@@ -62,44 +118,32 @@ def select_random_winner_scalable(giveaway_id: int, chunk_size: int = 1000) -> D
                 logger.warning(result["message"])
                 return result
             
-            # Check if a winner already exists
-            if Winner.objects.filter(giveaway=giveaway).exists():
-                existing_winner = Winner.objects.get(giveaway=giveaway)
-                result["message"] = f"Giveaway {giveaway.title} already has a winner: {existing_winner.user.email}"
-                result["winner"] = existing_winner
+            # Check if winners already exist
+            existing = _existing_winners(giveaway)
+            if existing:
+                result["message"] = f"Giveaway {giveaway.title} already has winners: {_winner_emails(existing)}"
+                result["winner"] = existing[0]
+                result["winners"] = existing
                 logger.info(result["message"])
                 return result
                 
-            # Count total entries first (more efficient than loading all entries)
-            total_entries = Entry.objects.filter(giveaway=giveaway).count()
-            MetricsCollector.increment_counter("select_random_winner", "total_entries", total_entries)
-            
-            if total_entries == 0:
+            if not drawable_entries(giveaway.id).exists():
                 result["message"] = f"No entries found for giveaway {giveaway.title}."
                 logger.warning(result["message"])
                 return result
-                
-            # Select a random offset - optimized approach for large datasets
-            random_index = random.randint(0, total_entries - 1)
-            
-            # Get just the winning entry directly with OFFSET/LIMIT for efficiency
-            winning_entry = Entry.objects.filter(
-                giveaway=giveaway
-            ).order_by('id')[random_index:random_index+1].get()
             
-            # Create winner record
-            winner = Winner.objects.create(
-                giveaway=giveaway,
-                user=winning_entry.user,
-                selected_at=timezone.now(),
-                notification_sent=False
-            )
+            # Seeded, verifiable draw without replacement (see services/draws.py);
+            # picks that turn out to be duplicates are skipped
+            winners = _create_winners(giveaway, chunk_size)
+            if not winners:
+                raise SelectionError(f"No eligible entries for giveaway {giveaway.id}")
             
-            logger.info(f"Selected winner for {giveaway.title}: {winner.user.email}")
+            logger.info("Selected %s winner(s) for giveaway %s", len(winners), giveaway.pk)
             
             result["success"] = True
-            result["message"] = f"Successfully selected winner for {giveaway.title}: {winner.user.email}"
-            result["winner"] = winner
+            result["message"] = f"Successfully selected winners for {giveaway.title}: {_winner_emails(winners)}"
+            result["winner"] = winners[0]
+            result["winners"] = winners
             
     except Giveaway.DoesNotExist:
         result["message"] = f"Giveaway with ID {giveaway_id} does not exist."
@@ -190,7 +234,7 @@ def find_eligible_giveaways() -> List[int]:
         is_active=True,        # Giveaway is active
     ).annotate(
         entry_count=Count('entries'),  # Count entries
-        has_winner=Count('winner')     # Check if has winner
+        has_winner=Count('winners')    # Check if has winners
     ).filter(
         entry_count__gt=0,     # Has at least one entry
         has_winner=0           # Does not have a winner
@@ -200,3 +244,128 @@ def find_eligible_giveaways() -> List[int]:
     logger.info(f"Found {len(eligible_ids)} eligible giveaways for winner selection")
     
     return eligible_ids
+
+
+def select_random_winner(giveaway_id: int) -> Dict[str, Any]:
+    """
+    Selects a random winner for a giveaway from all participants.
+    
+    This function follows the Windsurf project requirements by:
+    1. Selecting randomly from all giveaway entries
+    2. Using a seeded, verifiable random selection
+    3. Creating a Winner record
+    4. Setting notification status
+    
+    Args:
+        giveaway_id (int): The ID of the giveaway to select a winner for
+        
+    Returns:
+        Dict containing success status, winner info if successful, and error message if not
+    """
+    result = {
+        "success": False,
+        "message": "",
+        "winner": None,
+        "winners": []
+    }
+    
+    try:
+        # Get the giveaway
+        giveaway = Giveaway.objects.get(id=giveaway_id)
+        
+        # Check if giveaway is expired
+        if not giveaway.is_expired():
+            result["message"] = f"Giveaway {giveaway.title} has not ended yet. Cannot select a winner until the end date."
+            logger.warning(result["message"])
+            return result
+        
+        # Check if winners already exist
+        existing = _existing_winners(giveaway)
+        if existing:
+            result["message"] = f"Giveaway {giveaway.title} already has winners: {_winner_emails(existing)}"
+            result["winner"] = existing[0]
+            result["winners"] = existing
+            logger.info(result["message"])
+            return result
+        
+        # Get all entries for the giveaway (no filtering by correct answer),
+        # leaving out duplicates by other accounts of the same person
+        screen_giveaway(giveaway.id)
+        entries = drawable_entries(giveaway.id)
+        
+        if not entries.exists():
+            result["message"] = f"No entries found for giveaway {giveaway.title}."
+            logger.warning(result["message"])
+            return result
+        
+        # Create the winner records in a transaction to ensure data integrity
+        with transaction.atomic():
+            # Seeded, verifiable draw without replacement (see services/draws.py)
+            winners = _create_winners(giveaway)
+            if not winners:
+                result["message"] = f"No eligible entries for giveaway {giveaway.title}."
+                logger.warning(result["message"])
+                return result
+            
+            # Log the winner selection
+            logger.info("Selected %s winner(s) for giveaway %s", len(winners), giveaway.pk)
+            
+            result["success"] = True
+            result["message"] = f"Successfully selected winners for {giveaway.title}: {_winner_emails(winners)}"
+            result["winner"] = winners[0]
+            result["winners"] = winners
+            
+            return result
+            
+    except Giveaway.DoesNotExist:
+        result["message"] = f"Giveaway with ID {giveaway_id} does not exist."
+        logger.error(result["message"])
+    except Exception as e:
+        result["message"] = f"Error selecting winner: {str(e)}"
+        logger.exception(f"Unexpected error selecting winner for giveaway {giveaway_id}: {str(e)}")
+    
+    return result
+
+
+def can_select_winners_for_expired_giveaways() -> Dict[str, Any]:
+    """
+    Find all expired giveaways without winners and select winners for them.
+    
+    Returns:
+        Dict with results information
+    """
+    result = {
+        "success": True,
+        "processed": 0,
+        "winners": 0,
+        "errors": 0,
+        "messages": []
+    }
+    
+    # Find expired giveaways without winners
+    now = timezone.now()
+    expired_giveaways = Giveaway.objects.filter(
+        end_date__lt=now,  # End date is in the past
+        is_active=True     # Giveaway is active
+    ).exclude(
+        winners__isnull=False  # No winners yet
+    )
+    
+    if not expired_giveaways.exists():
+        result["messages"].append("No expired giveaways without winners found.")
+        return result
+    
+    # Process each expired giveaway
+    for giveaway in expired_giveaways:
+        result["processed"] += 1
+        
+        # Select a winner
+        winner_result = select_random_winner(giveaway.id)
+        result["messages"].append(winner_result["message"])
+        
+        if winner_result["success"]:
+            result["winners"] += 1
+        else:
+            result["errors"] += 1
+    
+    return result
@@ -0,0 +1,70 @@
+"""
+Signal handlers for the giveaways app.
+
+Keeps cached GiveawaySnapshots (giveaways/snapshots.py) consistent with
+the database: saving or deleting a giveaway drops its snapshot, and
+saving or deleting a business drops the snapshots of all its giveaways.
+Image variants recorded by utils/images.py (a queryset update, so no
+post_save) drop the snapshots of the giveaways showing them.
+Both also queue a rebuild of the homepage feed (giveaways/feed.py) and
+update the full-text search table (giveaways/search.py) in the same
+transaction as the write.
+
+Snapshots are dropped once the transaction commits: dropped earlier, a
+request reading in between would cache the old row again for the full
+timeout.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from utils.images import variants_saved
+
+from .feed import schedule_rebuild
+from .models import Giveaway
+from .search import index_giveaways, remove_giveaways
+from .snapshots import invalidate_giveaway_snapshots
+
+
+@receiver(post_save, sender=Giveaway)
+def giveaway_saved(sender, instance, **kwargs):
+    """Drop the cached snapshot, reindex and refresh the feed when a giveaway changes."""
+    transaction.on_commit(partial(invalidate_giveaway_snapshots, instance.pk))
+    index_giveaways([instance.pk])
+    schedule_rebuild()
+
+
+@receiver(post_delete, sender=Giveaway)
+def giveaway_deleted(sender, instance, **kwargs):
+    """Drop the cached snapshot and search row of a deleted giveaway."""
+    transaction.on_commit(partial(invalidate_giveaway_snapshots, instance.pk))
+    remove_giveaways([instance.pk])
+    schedule_rebuild()
+
+
+@receiver(post_save, sender='businesses.Business')
+@receiver(post_delete, sender='businesses.Business')
+def business_changed(sender, instance, **kwargs):
+    """Drop the snapshots (and feed cards) of every giveaway hosted by the business and reindex them."""
+    giveaway_ids = list(Giveaway.objects.filter(business_id=instance.pk).values_list('pk', flat=True))
+    if giveaway_ids:
+        transaction.on_commit(partial(invalidate_giveaway_snapshots, *giveaway_ids))
+        index_giveaways(giveaway_ids)
+        schedule_rebuild()
+
+
+@receiver(variants_saved)
+def image_variants_saved(sender, pks, **kwargs):
+    """Drop the snapshots (and feed cards) showing a giveaway image or business logo whose variants changed."""
+    if sender is Giveaway:
+        giveaway_ids = list(pks)
+    elif sender._meta.label == 'businesses.Business':
+        giveaway_ids = list(Giveaway.objects.filter(business_id__in=pks).values_list('pk', flat=True))
+    else:
+        return
+    if giveaway_ids:
+        transaction.on_commit(partial(invalidate_giveaway_snapshots, *giveaway_ids))
+        schedule_rebuild()
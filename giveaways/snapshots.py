@@ -0,0 +1,191 @@
+"""
+Cached, read-only snapshots of giveaways.
+
+The detail page, entry submission, eligibility checks, EntryForm and the
+animation/winner views all need the same Giveaway + Business metadata.
+GiveawaySnapshot holds those fields in an immutable, slotted object that
+is cached in two tiers (utils.cache.TwoTierCache): an in-process LRU with
+a short TTL in front of the shared cache. Signal handlers in
+giveaways/signals.py drop the snapshot whenever the giveaway or its
+business is saved or deleted.
+
+Entries, entry counts and winners are never part of a snapshot; they
+change on every submission and are always read from the database.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DEFERRED
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from utils.cache import TwoTierCache
+
+from .models import Giveaway
+
+# Bump when GiveawaySnapshot's fields change, so processes running the
+# new code never unpickle snapshots cached by the old one
+SNAPSHOT_VERSION = 1
+
+_cache = TwoTierCache(
+    f'giveaway:snapshot:v{SNAPSHOT_VERSION}',
+    shared_timeout=getattr(settings, 'GIVEAWAY_SNAPSHOT_TIMEOUT', 300),
+    local_ttl=getattr(settings, 'GIVEAWAY_SNAPSHOT_LOCAL_TTL', 5),
+    local_maxsize=getattr(settings, 'GIVEAWAY_SNAPSHOT_LOCAL_SIZE', 1024),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GiveawaySnapshot:
+    """
+    Immutable view of a giveaway and the business hosting it.
+
+    Mirrors the Giveaway attributes used for eligibility and display, so
+    it can be passed to can_enter_giveaway() and EntryForm in place of a
+    model instance. Use as_giveaway() where a real model instance is
+    needed (templates, Entry.giveaway).
+    """
+    id: int
+    title: str
+    description: str
+    image: str
+    image_variants: str
+    prize_value: Optional[Decimal]
+    start_date: datetime
+    end_date: datetime
+    is_active: bool
+    created_at: datetime
+    signup_question: str
+    signup_options: Tuple[str, ...]
+    number_of_winners: int
+    early_bird_hours: int
+    early_bird_weight: int
+    draw_commitment: str
+    business_id: int
+    business_name: str
+    business_city: str
+    business_postal_code: str
+    business_logo: str
+
+    @classmethod
+    def from_giveaway(cls, giveaway: Giveaway) -> 'GiveawaySnapshot':
+        """Build a snapshot from a giveaway loaded with its business."""
+        business = giveaway.business
+        return cls(
+            id=giveaway.id,
+            title=giveaway.title,
+            description=giveaway.description,
+            image=giveaway.image.name or '',
+            # JSON text keeps the snapshot immutable
+            image_variants=json.dumps(giveaway.image_variants or {}),
+            prize_value=giveaway.prize_value,
+            start_date=giveaway.start_date,
+            end_date=giveaway.end_date,
+            is_active=giveaway.is_active,
+            created_at=giveaway.created_at,
+            signup_question=giveaway.signup_question,
+            signup_options=tuple(giveaway.signup_options or ()),
+            number_of_winners=giveaway.number_of_winners,
+            early_bird_hours=giveaway.early_bird_hours,
+            early_bird_weight=giveaway.early_bird_weight,
+            draw_commitment=giveaway.draw_commitment,
+            business_id=business.id,
+            business_name=business.name,
+            business_city=business.city,
+            business_postal_code=business.postal_code,
+            business_logo=business.logo.name or '',
+        )
+
+    def __str__(self) -> str:
+        return f"{self.title} ({self.business_name})"
+
+    def get_absolute_url(self) -> str:
+        return reverse('giveaways:giveaway-detail', args=[str(self.id)])
+
+    def is_currently_active(self) -> bool:
+        """Same rule as Giveaway.is_currently_active()."""
+        now = timezone.now()
+        return self.is_active and self.start_date <= now <= self.end_date
+
+    def as_giveaway(self) -> Giveaway:
+        """
+        Return a fresh Giveaway instance (with business) built from the snapshot.
+
+        Instances are created like rows loaded from the database, without
+        a query. Business fields outside the snapshot are deferred and
+        loaded on first access.
+
+        Returns:
+            Giveaway: A new, unshared model instance
+        """
+        business = _from_values(Business, {
+            'id': self.business_id,
+            'name': self.business_name,
+            'city': self.business_city,
+            'postal_code': self.business_postal_code,
+            'logo': self.business_logo or None,
+        })
+        giveaway = _from_values(Giveaway, {
+            'id': self.id,
+            'business_id': self.business_id,
+            'title': self.title,
+            'description': self.description,
+            'image': self.image or None,
+            'image_variants': json.loads(self.image_variants),
+            'prize_value': self.prize_value,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'is_active': self.is_active,
+            'created_at': self.created_at,
+            'signup_question': self.signup_question,
+            'signup_options': list(self.signup_options),
+            'number_of_winners': self.number_of_winners,
+            'early_bird_hours': self.early_bird_hours,
+            'early_bird_weight': self.early_bird_weight,
+        })
+        giveaway.business = business
+        return giveaway
+
+
+def _from_values(model, values):
+    """Instantiate model as if loaded from the database; other fields are deferred."""
+    fields = model._meta.concrete_fields
+    return model.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [values.get(field.attname, DEFERRED) for field in fields],
+    )
+
+
+def _load(pk) -> Optional[GiveawaySnapshot]:
+    giveaway = Giveaway.objects.select_related('business').filter(pk=pk).first()
+    return GiveawaySnapshot.from_giveaway(giveaway) if giveaway else None
+
+
+def get_giveaway_snapshot(pk) -> Optional[GiveawaySnapshot]:
+    """
+    Return the snapshot for a giveaway, loading it on a cache miss.
+
+    Args:
+        pk: Giveaway primary key (int or numeric string)
+
+    Returns:
+        GiveawaySnapshot or None if no such giveaway exists
+    """
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    return _cache.get_or_set(pk, lambda: _load(pk))
+
+
+def invalidate_giveaway_snapshots(*pks) -> None:
+    """Drop cached snapshots for the given giveaway ids."""
+    _cache.delete_many(int(pk) for pk in pks)
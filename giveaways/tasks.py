@@ -8,6 +8,7 @@ from django.utils import timezone
 
 from .services.winner_selection import select_random_winner_scalable, process_winners_batch, find_eligible_giveaways
 from .services import can_select_winners_for_expired_giveaways
+from .feed import build_feed
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +18,10 @@ def select_winners() -> Dict[str, Any]:
     """
     Celery task to select winners for all expired giveaways.
     
-    This task is scheduled to run daily to ensure that winners are selected
-    for all expired giveaways. It follows the Windsurf project requirements
-    by randomly selecting winners from all participants.
+    Runs every 15 minutes from beat, so every giveaway (including series
+    created by giveaways/imports.py) is drawn shortly after it ends. It
+    follows the Windsurf project requirements by randomly selecting
+    winners from all participants.
     
     Returns:
         Dict containing success status and statistics
@@ -182,50 +184,26 @@ def summarize_winner_selection(results: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 
 @shared_task(name='giveaways.notify_winners')
-def notify_winners() -> Dict[str, Any]:
+def notify_winners(giveaway_ids: Optional[List[int]] = None) -> Dict[str, Any]:
     """
     Celery task to send notifications to winners who haven't been notified yet.
     
-    This task is scheduled to run daily to ensure that all winners receive
-    notifications about their wins.
+    Runs every 5 minutes from beat, so winners hear about a draw soon
+    after it and before their claim deadline runs out. Winners are emailed in batches (see
+    giveaways/notifications.py).
+    
+    Args:
+        giveaway_ids: Only notify winners of these giveaways (default: all)
     
     Returns:
         Dict containing success status and statistics
     """
-    from .models import Winner
+    from .notifications import send_winner_notifications
     
     logger.info(f"Starting winner notification task at {timezone.now()}")
     
     try:
-        # Find winners who haven't been notified yet
-        pending_winners = Winner.objects.filter(notification_sent=False)
-        
-        if not pending_winners.exists():
-            logger.info("No pending winner notifications found.")
-            return {
-                'success': True,
-                'notified': 0,
-                'message': 'No pending notifications found.'
-            }
-        
-        notification_count = 0
-        
-        # Process each winner
-        for winner in pending_winners:
-            try:
-                # Here you would implement the actual notification logic
-                # For example, sending an email or a push notification
-                # For now, we just mark them as notified
-                
-                logger.info(f"Notifying winner {winner.user.email} for giveaway {winner.giveaway.title}")
-                
-                # Mark as notified
-                winner.mark_notification_sent()
-                notification_count += 1
-                
-            except Exception as inner_e:
-                logger.error(f"Error notifying winner {winner.id}: {str(inner_e)}")
-        
+        notification_count = send_winner_notifications(giveaway_ids)
         return {
             'success': True,
             'notified': notification_count,
@@ -238,4 +216,39 @@ def notify_winners() -> Dict[str, Any]:
             'success': False,
             'notified': 0,
             'error': str(e)
-        }
\ No newline at end of file
+        }
+
+@shared_task(name='giveaways.redraw_winners')
+def redraw_winners() -> Dict[str, Any]:
+    """
+    Expire unclaimed prizes and draw replacement winners.
+    
+    Runs every 15 minutes from beat; each run handles a bounded batch
+    (see giveaways/services/redraws.py).
+    
+    Returns:
+        Dict containing counts of expired, redrawn and notified winners
+    """
+    from .services.redraws import redraw_expired_winners
+    
+    try:
+        result = redraw_expired_winners()
+        result['success'] = True
+        return result
+    except Exception as e:
+        logger.exception(f"Error in winner redraw task: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+@shared_task(name='giveaways.rebuild_home_feed', ignore_result=True)
+def rebuild_home_feed() -> None:
+    """
+    Rebuild the cached homepage feed (see giveaways/feed.py).
+
+    Runs periodically from beat and shortly after giveaways or businesses
+    change.
+    """
+    build_feed()
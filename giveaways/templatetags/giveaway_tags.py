@@ -0,0 +1,40 @@
+"""
+Inclusion tags for giveaway and participation rows.
+
+List pages render one of these per row. An inclusion tag compiles its
+template once per node and renders it with just the row, where an
+{% include ... with row=... %} in a loop resolves the template and pushes
+a copy of the whole page context for every row.
+
+Usage:
+    {% load giveaway_tags %}
+    {% for giveaway in giveaways %}{% giveaway_row giveaway %}{% endfor %}
+"""
+
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/giveaway_row.html')
+def giveaway_row(row):
+    """Table row for a business's giveaway."""
+    return {'row': row}
+
+
+@register.inclusion_tag('includes/giveaway_row_card.html')
+def giveaway_row_card(row):
+    """Mobile card for a business's giveaway."""
+    return {'row': row}
+
+
+@register.inclusion_tag('includes/participation_row.html')
+def participation_row(row):
+    """Table row for a member's entry."""
+    return {'row': row}
+
+
+@register.inclusion_tag('includes/participation_row_card.html')
+def participation_row_card(row):
+    """Mobile card for a member's entry."""
+    return {'row': row}
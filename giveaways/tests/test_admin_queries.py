@@ -0,0 +1,83 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Giveaway, Entry, Winner
+
+User = get_user_model()
+
+
+class AdminChangelistQueryCountTest(TestCase):
+    """Changelist query counts must not grow with the number of rows shown."""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@test.com", password="test123"
+        )
+        self.business = Business.objects.create(
+            user=self.admin_user, admin=self.admin_user, name="AdminBedrift", city="Oslo"
+        )
+        self.counter = 0
+        self.client.login(email="admin@test.com", password="test123")
+
+    def _add_giveaways(self, n):
+        now = timezone.now()
+        for _ in range(n):
+            self.counter += 1
+            giveaway = Giveaway.objects.create(
+                business=self.business,
+                title=f"Giveaway {self.counter}",
+                description="Test",
+                start_date=now - datetime.timedelta(days=2),
+                end_date=now - datetime.timedelta(days=1),
+            )
+            users = [
+                User.objects.create_user(
+                    username=f"medlem{self.counter}_{i}",
+                    email=f"medlem{self.counter}_{i}@test.com",
+                    password="test123",
+                )
+                for i in range(2)
+            ]
+            for user in users:
+                Entry.objects.create(giveaway=giveaway, user=user, answer="Ja", user_location_city="Oslo")
+            Winner.objects.create(giveaway=giveaway, user=users[0])
+
+    def _count_queries(self, url_name):
+        url = reverse(url_name)
+        # Warm up the session and user caches so only the changelist is measured
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def _assert_constant(self, url_name):
+        with self.settings(KEYSET_COUNT_CACHE_TIMEOUT=0):
+            self._add_giveaways(3)
+            small = self._count_queries(url_name)
+            self._add_giveaways(6)
+            large = self._count_queries(url_name)
+        self.assertEqual(small, large)
+
+    def test_giveaway_changelist_query_count_is_constant(self):
+        self._assert_constant('admin:giveaways_giveaway_changelist')
+
+    def test_entry_changelist_query_count_is_constant(self):
+        self._assert_constant('admin:giveaways_entry_changelist')
+
+    def test_winner_changelist_query_count_is_constant(self):
+        self._assert_constant('admin:giveaways_winner_changelist')
+
+    def test_giveaway_changelist_shows_annotated_columns(self):
+        self._add_giveaways(1)
+        response = self.client.get(reverse('admin:giveaways_giveaway_changelist'))
+        self.assertContains(response, "medlem1_0@test.com")
+        cl = response.context['cl']
+        self.assertEqual(cl.result_list[0]._entries_count, 2)
@@ -0,0 +1,189 @@
+import datetime
+import hashlib
+import smtplib
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Entry, Giveaway, Winner
+from giveaways.notifications import send_winner_notifications
+from giveaways.services.draws import MerkleRoot, entries_root, pick_index, verify_draw
+from giveaways.services.winner_selection import select_random_winner, select_random_winner_scalable
+
+User = get_user_model()
+
+
+def tree_hash(ids):
+    """RFC 6962 Merkle tree hash, computed recursively."""
+    if not ids:
+        return hashlib.sha256(b'').digest()
+    if len(ids) == 1:
+        return hashlib.sha256(b'\x00' + ids[0].to_bytes(8, 'big')).digest()
+    split = 1 << (len(ids) - 1).bit_length() - 1
+    return hashlib.sha256(b'\x01' + tree_hash(ids[:split]) + tree_hash(ids[split:])).digest()
+
+
+class DrawPrimitivesTest(SimpleTestCase):
+    def test_streaming_root_matches_tree_hash(self):
+        for n in range(0, 18):
+            ids = [i * 7 + 3 for i in range(n)]
+            tree = MerkleRoot()
+            for entry_id in ids:
+                tree.add(entry_id)
+            self.assertEqual(tree.hexdigest(), tree_hash(ids).hex(), n)
+            self.assertEqual(tree.count, n)
+
+    def test_pick_index_is_reproducible(self):
+        seed, root = 'ab' * 32, 'cd' * 32
+        picks = [pick_index(seed, root, 10, attempt) for attempt in range(50)]
+        self.assertEqual(picks, [pick_index(seed, root, 10, attempt) for attempt in range(50)])
+        self.assertTrue(all(0 <= pick < 10 for pick in picks))
+        self.assertGreater(len(set(picks)), 5)
+        self.assertNotEqual(picks, [pick_index('ef' * 32, root, 10, attempt) for attempt in range(50)])
+
+
+class DrawTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username="bedrift", email="bedrift@test.com", password="test123", city="Oslo")
+        business = Business.objects.create(user=owner, admin=owner, name="TestBedrift", city="Oslo", postal_code="0150")
+        self.giveaway = Giveaway.objects.create(
+            business=business,
+            title="Test Giveaway",
+            description="Test",
+            start_date=timezone.now() - datetime.timedelta(days=1),
+            end_date=timezone.now() + datetime.timedelta(days=1),
+            signup_question="Hva er 2+2?",
+            signup_options=["4", "5"],
+        )
+        for i in range(12):
+            user = User.objects.create_user(username=f"m{i}", email=f"m{i}@example.com", password="test123", city="Oslo")
+            Entry.objects.create(giveaway=self.giveaway, user=user, answer="4", user_location_city="Oslo")
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(end_date=timezone.now() - datetime.timedelta(minutes=1))
+
+
+class VerifiableDrawTest(DrawTestCase):
+    def test_seed_is_committed_at_creation(self):
+        self.assertEqual(len(self.giveaway.draw_seed), 64)
+        self.assertEqual(self.giveaway.draw_commitment, hashlib.sha256(bytes.fromhex(self.giveaway.draw_seed)).hexdigest())
+
+    def test_draw_is_recorded_and_reproducible(self):
+        for select in (select_random_winner_scalable, select_random_winner):
+            with self.subTest(select=select.__name__):
+                Winner.objects.all().delete()
+                self.assertTrue(select(self.giveaway.pk)['success'])
+                winner = Winner.objects.get(giveaway=self.giveaway)
+                root, count = entries_root(self.giveaway.pk)
+                self.assertEqual((winner.draw_seed, winner.draw_root, winner.draw_entry_count),
+                                 (self.giveaway.draw_seed, root, 12))
+                index = pick_index(winner.draw_seed, root, count)
+                self.assertEqual(winner.draw_index, index)
+                self.assertEqual(Entry.objects.order_by('id')[index].user_id, winner.user_id)
+                self.assertTrue(verify_draw(self.giveaway).ok)
+
+    def test_skipped_duplicates_verify(self):
+        root, count = entries_root(self.giveaway.pk)
+        first = pick_index(self.giveaway.draw_seed, root, count)
+        skipped = Entry.objects.order_by('id')[first]
+        Entry.objects.filter(pk=skipped.pk).update(duplicate_reason='email')
+        select_random_winner_scalable(self.giveaway.pk)
+        winner = Winner.objects.get(giveaway=self.giveaway)
+        self.assertGreaterEqual(winner.draw_attempt, 1)
+        self.assertNotEqual(winner.user_id, skipped.user_id)
+        result = verify_draw(self.giveaway)
+        self.assertTrue(result.ok, result.problems)
+        self.assertIn(skipped.pk, result.skipped)
+        # Clearing the flag afterwards makes the skip unjustified
+        Entry.objects.filter(pk=skipped.pk).update(duplicate_reason='')
+        self.assertFalse(verify_draw(self.giveaway).ok)
+
+    def test_command_reports_tampering(self):
+        select_random_winner_scalable(self.giveaway.pk)
+        out = StringIO()
+        call_command('verify_draw', self.giveaway.pk, '--chunk-size', '5', stdout=out)
+        self.assertIn('OK', out.getvalue())
+
+        late = User.objects.create_user(username="sen", email="sen@example.com", password="test123", city="Oslo")
+        Entry.objects.create(giveaway=self.giveaway, user=late, answer="4", user_location_city="Oslo")
+        with self.assertRaises(CommandError):
+            call_command('verify_draw', stdout=out)
+        self.assertIn('Merkle root', out.getvalue())
+
+
+class MultipleWinnersTest(DrawTestCase):
+    def test_draws_distinct_winners_in_rank_order(self):
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(number_of_winners=5)
+        result = select_random_winner_scalable(self.giveaway.pk)
+        self.assertTrue(result['success'], result['message'])
+        winners = list(self.giveaway.winners.order_by('rank'))
+        self.assertEqual([w.rank for w in winners], [1, 2, 3, 4, 5])
+        self.assertEqual(len({w.user_id for w in winners}), 5)
+        self.assertEqual(result['winner'], winners[0])
+        self.assertTrue(verify_draw(self.giveaway).ok)
+
+    def test_more_winners_than_entries(self):
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(number_of_winners=20)
+        self.assertTrue(select_random_winner(self.giveaway.pk)['success'])
+        self.assertEqual(self.giveaway.winners.count(), 12)
+        self.assertTrue(verify_draw(self.giveaway).ok)
+
+    def test_weighted_draw_is_reproducible(self):
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(number_of_winners=3)
+        Entry.objects.filter(id__in=Entry.objects.order_by('id').values('id')[:4]).update(weight=5)
+        select_random_winner_scalable(self.giveaway.pk)
+        winners = list(self.giveaway.winners.order_by('rank'))
+        self.assertEqual(len(winners), 3)
+        keys = [float(w.draw_key) for w in winners]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        weighted_root = MerkleRoot()
+        for entry_id, weight in Entry.objects.order_by('id').values_list('id', 'weight'):
+            weighted_root.add(entry_id, weight)
+        self.assertEqual(winners[0].draw_root, weighted_root.hexdigest())
+        self.assertTrue(verify_draw(self.giveaway).ok)
+
+        # Entries that outrank a winner must be marked duplicates
+        loser = Entry.objects.exclude(user__in=[w.user_id for w in winners]).order_by('id').first()
+        Winner.objects.filter(pk=winners[2].pk).update(user=loser.user, draw_key=repr(keys[2] / 2))
+        self.assertFalse(verify_draw(self.giveaway).ok)
+
+    def test_early_entries_get_extra_weight(self):
+        self.giveaway.early_bird_hours = 2
+        self.giveaway.early_bird_weight = 3
+        self.assertEqual(self.giveaway.entry_weight(self.giveaway.start_date + datetime.timedelta(hours=1)), 3)
+        self.assertEqual(self.giveaway.entry_weight(self.giveaway.start_date + datetime.timedelta(hours=3)), 1)
+        self.giveaway.early_bird_hours = 0
+        self.assertEqual(self.giveaway.entry_weight(self.giveaway.start_date), 1)
+
+    def test_notifications_list_all_winners(self):
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(number_of_winners=3)
+        select_random_winner_scalable(self.giveaway.pk)
+        with self.assertNumQueries(2):
+            self.assertEqual(send_winner_notifications(batch_size=50), 3)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(mail.outbox[-1].to, ["bedrift@test.com"])
+        self.assertEqual(mail.outbox[-1].body.count("\n3. "), 1)
+        self.assertFalse(Winner.objects.filter(notification_sent=False).exists())
+
+    def test_failed_notification_stays_pending(self):
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(number_of_winners=3)
+        select_random_winner_scalable(self.giveaway.pk)
+        unlucky = Winner.objects.order_by('id').first()
+        send_messages = locmem.EmailBackend.send_messages
+
+        def flaky(backend, messages):
+            if messages[0].to == [unlucky.user.email]:
+                raise smtplib.SMTPRecipientsRefused({})
+            return send_messages(backend, messages)
+
+        with mock.patch.object(locmem.EmailBackend, 'send_messages', flaky):
+            self.assertEqual(send_winner_notifications(), 2)
+        self.assertEqual(list(Winner.objects.filter(notification_sent=False)), [unlucky])
+        self.assertEqual(send_winner_notifications(), 1)
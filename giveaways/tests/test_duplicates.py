@@ -0,0 +1,120 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Entry, Giveaway, Winner
+from giveaways.services import duplicates
+from giveaways.services.duplicates import email_key, normalize_email, screen_entry, screen_giveaway
+from giveaways.services.winner_selection import select_random_winner_scalable
+
+User = get_user_model()
+
+
+class SketchTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_normalize_email_folds_aliases(self):
+        self.assertEqual(normalize_email(" Kari+vinn@Example.com "), "kari@example.com")
+        self.assertEqual(normalize_email("k.ari+2@googlemail.com"), "kari@gmail.com")
+        self.assertEqual(normalize_email("k.ari@example.com"), "k.ari@example.com")
+        self.assertEqual(email_key("kari+1@gmail.com"), email_key("K.ari@gmail.com"))
+        self.assertNotEqual(email_key("kari@gmail.com"), email_key("kari@example.com"))
+
+    def test_full_block_becomes_bloom_filter_without_false_negatives(self):
+        keys = [email_key(f"medlem{i}@example.com") for i in range(300)]
+        with mock.patch.object(duplicates, 'SKETCH_BLOCKS', 1):
+            self.assertFalse(any(duplicates._sketch_contains_and_add(1, 'email', key) for key in keys))
+            self.assertIsInstance(cache.get(f'{duplicates.KEY_PREFIX}1:email:0'), bytes)
+            self.assertTrue(all(duplicates._sketch_contains_and_add(1, 'email', key) for key in keys))
+
+
+class EntryScreeningTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        owner = User.objects.create_user(username="bedrift", email="bedrift@test.com", password="test123", city="Oslo")
+        business = Business.objects.create(user=owner, admin=owner, name="TestBedrift", city="Oslo", postal_code="0150")
+        self.giveaway = Giveaway.objects.create(
+            business=business,
+            title="Test Giveaway",
+            description="Test",
+            start_date=timezone.now() - datetime.timedelta(days=1),
+            end_date=timezone.now() + datetime.timedelta(days=1),
+            signup_question="Hva er 2+2?",
+            signup_options=["4", "5"],
+        )
+
+    def member(self, email):
+        return User.objects.create_user(username=email, email=email, password="test123", city="Oslo")
+
+    def enter(self, user, ip='10.0.0.1', agent='Firefox'):
+        entry = Entry(giveaway=self.giveaway, user=user, answer="4", user_location_city="Oslo")
+        request = self.factory.post('/', REMOTE_ADDR=ip, HTTP_USER_AGENT=agent)
+        screen_entry(entry, request)
+        entry.save()
+        return entry
+
+    def test_flags_alias_and_shared_device(self):
+        first = self.enter(self.member("kari@gmail.com"))
+        alias = self.enter(self.member("kari+1@gmail.com"), ip='10.0.0.2')
+        same_device = self.enter(self.member("ola@example.com"))
+        other = self.enter(self.member("per@example.com"), agent='Safari')
+        self.assertEqual(
+            [first.duplicate_reason, alias.duplicate_reason, same_device.duplicate_reason, other.duplicate_reason],
+            ['', 'email', 'device', ''],
+        )
+
+    def test_new_keys_are_checked_without_queries(self):
+        entry = Entry(giveaway=self.giveaway, user=self.member("kari@example.com"), answer="4", user_location_city="Oslo")
+        with self.assertNumQueries(0):
+            self.assertEqual(screen_entry(entry, self.factory.post('/')), '')
+
+    def test_deleted_entries_do_not_flag(self):
+        self.enter(self.member("kari@example.com")).delete()
+        self.assertEqual(self.enter(self.member("kari+2@example.com")).duplicate_reason, '')
+
+    def test_batch_pass_screens_unscreened_entries(self):
+        for email in ("kari@example.com", "Kari+x@example.com", "ola@example.com"):
+            Entry.objects.create(giveaway=self.giveaway, user=self.member(email), answer="4", user_location_city="Oslo")
+        self.assertEqual(screen_giveaway(self.giveaway.pk), 3)
+        reasons = list(Entry.objects.order_by('id').values_list('duplicate_reason', flat=True))
+        self.assertEqual(reasons, ['', 'email', ''])
+        with self.assertNumQueries(1):
+            self.assertEqual(screen_giveaway(self.giveaway.pk), 0)
+
+    def end_giveaway(self):
+        Giveaway.objects.filter(pk=self.giveaway.pk).update(end_date=timezone.now() - datetime.timedelta(minutes=1))
+
+    def test_draw_skips_duplicates_missed_at_entry_time(self):
+        first = self.enter(self.member("kari@example.com"))
+        cache.clear()  # sketch evicted, so the alias gets through unflagged
+        alias = self.enter(self.member("kari+2@example.com"), ip='10.0.0.2')
+        self.assertEqual(alias.duplicate_reason, '')
+        self.end_giveaway()
+        # Offset 1 (the alias) first, then offset 0
+        with mock.patch('giveaways.services.draws.pick_index', side_effect=[1, 0]):
+            result = select_random_winner_scalable(self.giveaway.pk)
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(Winner.objects.get(giveaway=self.giveaway).user_id, first.user_id)
+        alias.refresh_from_db()
+        self.assertEqual(alias.duplicate_reason, 'email')
+
+    def test_device_matches_win_and_are_flagged_for_review(self):
+        self.enter(self.member("kari@example.com"))
+        shared = self.enter(self.member("ola@example.com"))
+        self.end_giveaway()
+        with mock.patch('giveaways.services.draws.pick_index', return_value=1):
+            result = select_random_winner_scalable(self.giveaway.pk)
+        self.assertEqual(result['winner'].user_id, shared.user_id)
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@test.com", "test123"))
+        response = self.client.get(reverse('admin:giveaways_winner_changelist'), {'review': 'duplicate'})
+        self.assertEqual([winner.pk for winner in response.context['cl'].result_list], [result['winner'].pk])
+        self.assertContains(response, "Sjekk (device)")
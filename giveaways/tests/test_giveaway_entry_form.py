@@ -56,6 +56,14 @@ class TestEntryForm(TestCase):
         self.assertFalse(form.is_valid())
         self.assertIn("user_location_city", form.errors)
 
+    def test_ascii_spelled_business_city_matches(self):
+        self.business.city = "Tromso"
+        self.business.save()
+        for typed in ("Tromso", "Tromsø"):
+            with self.subTest(typed=typed):
+                form = EntryForm(data={"answer": "4", "user_location_city": typed}, giveaway=self.giveaway, request=None)
+                self.assertTrue(form.is_valid(), form.errors)
+
     def test_entry_fails_without_city(self):
         form = EntryForm(data={"answer": "4"}, giveaway=self.giveaway, request=None)
         self.assertFalse(form.is_valid())
@@ -72,6 +80,26 @@ class TestEntryForm(TestCase):
         self.assertTrue(form.is_valid())
         self.assertEqual(form.cleaned_data["user_location_city"], "Oslo")
 
+    def test_browser_position_sets_canonical_city(self):
+        request = type('obj', (object,), {"user": self.member, "method": "POST"})()
+        form = EntryForm(data={"answer": "4", "latitude": "59.91", "longitude": "10.75"}, giveaway=self.giveaway, request=request)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["user_location_city"], "Oslo")
+
+        form = EntryForm(data={"answer": "4", "latitude": "60.39", "longitude": "5.32"}, giveaway=self.giveaway, request=request)
+        self.assertFalse(form.is_valid())
+        self.assertIn("user_location_city", form.errors)
+
+    def test_detail_page_sends_position_to_server(self):
+        from django.core.cache import cache
+        from django.urls import reverse
+        cache.clear()
+        self.client.force_login(self.member)
+        response = self.client.get(reverse("giveaways:giveaway-detail", args=[self.giveaway.pk]))
+        self.assertContains(response, 'name="latitude"')
+        self.assertContains(response, reverse("accounts:update-location-batch"))
+        self.assertNotContains(response, "nominatim")
+
     def test_double_entry_not_allowed(self):
         Entry.objects.create(giveaway=self.giveaway, user=self.member, answer="4", user_location_city="Oslo")
         self.assertFalse(can_enter_giveaway(self.member, self.giveaway))
@@ -0,0 +1,106 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.feed import FEED_CACHE_KEY, build_feed, ranked_giveaways
+from giveaways.models import Entry, Giveaway
+
+User = get_user_model()
+
+
+class HomeFeedTest(TestCase):
+    def setUp(self):
+        cache.delete(FEED_CACHE_KEY)
+        self.owner = User.objects.create_user(
+            username="bedrift", email="bedrift@test.com", password="test123", city="Oslo"
+        )
+        self.business = Business.objects.create(
+            user=self.owner, admin=self.owner, name="TestBedrift", city="Oslo", postal_code="0150"
+        )
+        self.counter = 0
+
+    def tearDown(self):
+        cache.delete(FEED_CACHE_KEY)
+
+    def _giveaway(self, days_left=5, started=True, is_active=True, entries=0):
+        self.counter += 1
+        now = timezone.now()
+        giveaway = Giveaway.objects.create(
+            business=self.business,
+            title=f"Giveaway {self.counter}",
+            description="Test",
+            start_date=now - datetime.timedelta(days=1) if started else now + datetime.timedelta(days=1),
+            end_date=now + datetime.timedelta(days=days_left),
+            is_active=is_active,
+        )
+        for i in range(entries):
+            user = User.objects.create_user(
+                username=f"m{self.counter}-{i}", email=f"m{self.counter}-{i}@test.com", password="x"
+            )
+            Entry.objects.create(giveaway=giveaway, user=user, answer="Ja", user_location_city="Oslo")
+        return giveaway
+
+    def test_ranks_live_giveaways_by_popularity_and_urgency(self):
+        quiet = self._giveaway(days_left=20)
+        popular = self._giveaway(days_left=20, entries=5)
+        ending = self._giveaway(days_left=0.1)
+        self._giveaway(is_active=False)
+        self._giveaway(started=False)
+        self._giveaway(days_left=-0.5)
+        self.assertEqual([g.pk for g in ranked_giveaways()], [popular.pk, ending.pk, quiet.pk])
+
+    @override_settings(HOME_FEED_SIZE=3)
+    def test_feed_is_size_limited(self):
+        for _ in range(5):
+            self._giveaway()
+        self.assertEqual(len(build_feed()), 3)
+
+    def test_homepage_renders_from_cache_in_constant_queries(self):
+        self._giveaway()
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse('home'))
+
+        for _ in range(10):
+            self._giveaway()
+        cache.delete(FEED_CACHE_KEY)
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(reverse('home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(small), len(large))
+        giveaway_table = Giveaway._meta.db_table
+        self.assertFalse(any(giveaway_table in q['sql'] for q in large.captured_queries))
+
+    @override_settings(HOME_FEED_PAGE_SIZE=2)
+    def test_json_endpoint_returns_further_cards(self):
+        for _ in range(3):
+            self._giveaway()
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['next_offset'], 2)
+        self.assertEqual(len(response.context['cards']), 2)
+
+        data = self.client.get(reverse('giveaways:home-feed'), {'offset': 2}).json()
+        self.assertEqual(len(data['cards']), 1)
+        self.assertIsNone(data['next_offset'])
+        self.assertIn('data-url', data['cards'][0])
+
+        response = self.client.get(reverse('giveaways:home-feed'), {'offset': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(HOME_FEED_ASYNC=False)
+    def test_rebuilt_when_giveaway_changes(self):
+        giveaway = self._giveaway()
+        build_feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            giveaway.title = "Ny tittel"
+            giveaway.save()
+        self.assertIn("Ny tittel", cache.get(FEED_CACHE_KEY)[0])
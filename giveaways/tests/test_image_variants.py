@@ -0,0 +1,118 @@
+import datetime
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from businesses.models import Business
+from giveaways.models import Giveaway
+from giveaways.snapshots import get_giveaway_snapshot, invalidate_giveaway_snapshots
+from utils.images import generate_variants
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_jpeg(width, height, name="upload.jpg"):
+    image = Image.new("RGB", (width, height), (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x010F] = "TestCamera"  # Make
+    exif[0x0112] = 6  # Orientation: rotate 90° clockwise
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANTS_ASYNC=False)
+class ImageVariantsTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        user = User.objects.create_user(username="bedrift", email="bedrift@test.com", password="test123")
+        self.business = Business.objects.create(user=user, admin=user, name="Bildebedrift", city="Oslo")
+
+    def _create_giveaway(self, image):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            giveaway = Giveaway.objects.create(
+                business=self.business,
+                title="Bilde",
+                description="Test",
+                image=image,
+                start_date=now,
+                end_date=now + datetime.timedelta(days=1),
+            )
+        giveaway.refresh_from_db()
+        return giveaway
+
+    def test_upload_builds_rotated_variants_without_metadata(self):
+        giveaway = self._create_giveaway(make_jpeg(1000, 500))
+        variants = giveaway.image_variants
+
+        self.assertEqual(variants["source"], giveaway.image.name)
+        # EXIF orientation 6 swaps the dimensions
+        self.assertEqual((variants["width"], variants["height"]), (500, 1000))
+        # Widths above the original are clamped instead of upscaled
+        self.assertEqual([w for w, _ in variants["webp"]], [320, 500])
+        self.assertEqual([w for w, _ in variants["jpeg"]], [320, 500])
+
+        storage = giveaway.image.storage
+        for width, name in variants["webp"] + variants["jpeg"]:
+            self.assertRegex(name, r"^giveaway_images/variants/[0-9a-f]{16}-\d+w\.(webp|jpg)$")
+            with storage.open(name) as f, Image.open(f) as variant:
+                self.assertEqual(variant.width, width)
+                self.assertEqual(len(variant.getexif()), 0)
+
+    def test_replacing_image_rebuilds_and_removing_clears_variants(self):
+        giveaway = self._create_giveaway(make_jpeg(400, 400))
+        first = giveaway.image_variants
+
+        giveaway.image = make_jpeg(800, 400, name="other.jpg")
+        with self.captureOnCommitCallbacks(execute=True):
+            giveaway.save()
+        giveaway.refresh_from_db()
+        self.assertEqual(giveaway.image_variants["source"], giveaway.image.name)
+        self.assertNotEqual(giveaway.image_variants["jpeg"], first["jpeg"])
+
+        giveaway.image = None
+        giveaway.save()
+        giveaway.refresh_from_db()
+        self.assertEqual(giveaway.image_variants, {})
+
+    def test_recorded_variants_replace_cached_snapshot(self):
+        giveaway = self._create_giveaway(make_jpeg(400, 400))
+        # Variants not built yet when the snapshot is cached
+        Giveaway.objects.filter(pk=giveaway.pk).update(image_variants={})
+        invalidate_giveaway_snapshots(giveaway.pk)
+        self.addCleanup(invalidate_giveaway_snapshots, giveaway.pk)
+        self.assertEqual(get_giveaway_snapshot(giveaway.pk).image_variants, "{}")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            generate_variants('giveaways.Giveaway', giveaway.pk)
+        self.assertIn('"source"', get_giveaway_snapshot(giveaway.pk).image_variants)
+
+    def test_responsive_image_tag(self):
+        template = Template("{% load image_tags %}{% responsive_image giveaway 'image' sizes='240px' alt='Premie' %}")
+        giveaway = self._create_giveaway(make_jpeg(1000, 500))
+        html = template.render(Context({"giveaway": giveaway}))
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn("320w", html)
+        self.assertIn('sizes="240px"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertNotIn(giveaway.image.url, html)
+
+        # Stale variants (e.g. while a new upload is processed) fall back to the original
+        giveaway.image_variants = dict(giveaway.image_variants, source="giveaway_images/old.jpg")
+        html = template.render(Context({"giveaway": giveaway}))
+        self.assertIn(f'src="{giveaway.image.url}"', html)
+        self.assertNotIn("<picture>", html)
@@ -0,0 +1,124 @@
+import json
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from businesses.models import Business
+from giveaways.imports import import_giveaways
+from giveaways.models import Giveaway
+from giveaways.search import search_ids
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+CSV_HEADER = "title;description;start_date;end_date;options;image;repeat;occurrences\n"
+
+
+def csv_file(*rows, name="giveaways.csv"):
+    return SimpleUploadedFile(name, (CSV_HEADER + "".join(rows)).encode("utf-8-sig"), content_type="text/csv")
+
+
+def make_png(name="premie.png"):
+    buffer = BytesIO()
+    Image.new("RGB", (400, 300), (20, 120, 200)).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_VARIANTS_ASYNC=False, HOME_FEED_ASYNC=False)
+class GiveawayImportTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="kjede", email="kjede@test.com", password="test123", city="Bergen"
+        )
+        self.business = Business.objects.create(
+            user=self.owner, admin=self.owner, name="Kaffekjeden", city="Bergen", postal_code="5003"
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_csv_with_recurring_series_and_shared_image(self):
+        upload = csv_file(
+            "Ukens kaffe;Vinn kaffe;2030-01-06 12:00;2030-01-12 20:00;Ja|Nei;premie.png;weekly;3\n",
+            "Månedens kake;Vinn kake;2030-01-31 12:00;2030-01-31 20:00;Ja|Nei;;monthly;2\n",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            result = import_giveaways(self.business, upload, {"premie.png": make_png()})
+
+        self.assertTrue(result["success"])
+        coffee = list(Giveaway.objects.filter(title="Ukens kaffe").order_by("start_date"))
+        self.assertEqual([g.start_date.day for g in coffee], [6, 13, 20])
+        self.assertEqual(len({g.image.name for g in coffee}), 1)
+        self.assertTrue(all(g.image_variants.get("source") == coffee[0].image.name for g in coffee))
+
+        cake = list(Giveaway.objects.filter(title="Månedens kake").order_by("start_date"))
+        self.assertEqual([(g.start_date.month, g.start_date.day) for g in cake], [(1, 31), (2, 28)])
+        self.assertEqual(cake[0].signup_options, ["Ja", "Nei"])
+
+        self.assertCountEqual(search_ids("ukens kaffekjeden"), [g.pk for g in coffee])
+
+    def test_json_rows(self):
+        rows = [{
+            "title": "Gavekort",
+            "description": "Vinn et gavekort",
+            "start_date": "2030-03-01T10:00:00",
+            "end_date": "2030-03-10T10:00:00",
+            "options": ["Ja", "Nei", "Kanskje"],
+            "prize_value": 500,
+        }]
+        upload = SimpleUploadedFile("rows.json", json.dumps(rows).encode(), content_type="application/json")
+        result = import_giveaways(self.business, upload)
+        self.assertTrue(result["success"])
+        giveaway = Giveaway.objects.get(title="Gavekort")
+        self.assertEqual(giveaway.prize_value, 500)
+        self.assertEqual(giveaway.signup_options, ["Ja", "Nei", "Kanskje"])
+
+    def test_invalid_rows_are_reported_and_nothing_is_saved(self):
+        upload = csv_file(
+            "Gyldig;Test;2030-01-01 12:00;2030-01-02 12:00;Ja|Nei;;;\n",
+            "Feil dato;Test;i morgen;2030-01-02 12:00;Ja|Nei;;;\n",
+            "Baklengs;Test;2030-01-05 12:00;2030-01-02 12:00;Ja;mangler.png;yearly;2\n",
+        )
+        result = import_giveaways(self.business, upload)
+
+        self.assertFalse(result["success"])
+        self.assertFalse(Giveaway.objects.exists())
+        rows = {row for row, _ in result["errors"]}
+        self.assertEqual(rows, {2, 3})
+        messages = " ".join(message for row, message in result["errors"] if row == 3)
+        self.assertIn("mangler.png", messages)
+        self.assertIn("repeat", messages)
+        self.assertIn("options", messages)
+
+    @override_settings(GIVEAWAY_IMPORT_MAX_ROWS=2)
+    def test_total_size_is_limited_after_expansion(self):
+        upload = csv_file("Serie;Test;2030-01-01 12:00;2030-01-02 12:00;Ja|Nei;;daily;3\n")
+        result = import_giveaways(self.business, upload)
+        self.assertFalse(result["success"])
+        self.assertEqual(result["errors"][0][0], 0)
+
+    def test_view_imports_for_business_user(self):
+        self.client.login(email="kjede@test.com", password="test123")
+        upload = csv_file("Fra skjema;Test;2030-01-01 12:00;2030-01-02 12:00;Ja|Nei;;;\n")
+        response = self.client.post(reverse("giveaways:giveaway-import"), {"file": upload})
+        self.assertRedirects(response, reverse("giveaways:business-giveaways"), fetch_redirect_response=False)
+        self.assertTrue(Giveaway.objects.filter(title="Fra skjema", business=self.business).exists())
+
+        bad = csv_file("Uten svar;Test;2030-01-01 12:00;2030-01-02 12:00;;;;\n")
+        response = self.client.post(reverse("giveaways:giveaway-import"), {"file": bad})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["import_errors"][0][0], 1)
@@ -0,0 +1,134 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Giveaway, Entry
+from utils.pagination import KeysetPaginator, InvalidCursor
+
+User = get_user_model()
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        self.business_user = User.objects.create_user(
+            username="bedrift", email="bedrift@test.com", password="test123", city="Oslo"
+        )
+        self.business = Business.objects.create(
+            user=self.business_user, admin=self.business_user, name="TestBedrift", city="Oslo"
+        )
+        now = timezone.now()
+        # Several giveaways share the same end_date so the id tiebreaker matters
+        for i in range(25):
+            Giveaway.objects.create(
+                business=self.business,
+                title=f"Giveaway {i:02d}",
+                description="Test",
+                start_date=now - datetime.timedelta(days=1),
+                end_date=now + datetime.timedelta(days=i // 4 + 1),
+            )
+
+    def _walk_forward(self, paginator):
+        pages = []
+        page = paginator.page()
+        pages.append(page)
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            pages.append(page)
+        return pages
+
+    def test_forward_traversal_covers_all_rows_in_order(self):
+        paginator = KeysetPaginator(Giveaway.objects.all(), 10, ordering=['end_date'])
+        pages = self._walk_forward(paginator)
+        ids = [g.id for page in pages for g in page]
+        expected = list(Giveaway.objects.order_by('end_date', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(p) for p in pages], [10, 10, 5])
+        self.assertFalse(pages[0].has_previous())
+        self.assertFalse(pages[-1].has_next())
+
+    def test_descending_ordering_with_tiebreaker(self):
+        paginator = KeysetPaginator(Giveaway.objects.all(), 7, ordering=['-end_date'])
+        self.assertEqual(paginator.ordering, ('-end_date', '-id'))
+        ids = [g.id for page in self._walk_forward(paginator) for g in page]
+        expected = list(Giveaway.objects.order_by('-end_date', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_previous_cursor_returns_same_page(self):
+        paginator = KeysetPaginator(Giveaway.objects.all(), 10, ordering=['title'])
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+        back = paginator.page(third.previous_cursor)
+        self.assertEqual([g.id for g in back], [g.id for g in second])
+        self.assertTrue(back.has_previous())
+        self.assertTrue(back.has_next())
+        back_to_first = paginator.page(back.previous_cursor)
+        self.assertEqual([g.id for g in back_to_first], [g.id for g in first])
+        self.assertFalse(back_to_first.has_previous())
+
+    def test_invalid_cursor_raises(self):
+        paginator = KeysetPaginator(Giveaway.objects.all(), 10, ordering=['end_date'])
+        with self.assertRaises(InvalidCursor):
+            paginator.page("not-a-cursor")
+
+    def test_pages_do_not_use_offset_or_count(self):
+        paginator = KeysetPaginator(Giveaway.objects.all(), 10, ordering=['start_date'])
+        first = paginator.page()
+        with CaptureQueriesContext(connection) as ctx:
+            paginator.page(first.next_cursor)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql'].upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+
+
+class EntryAdminKeysetTest(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@test.com", password="test123"
+        )
+        business = Business.objects.create(
+            user=self.admin_user, admin=self.admin_user, name="AdminBedrift", city="Oslo"
+        )
+        now = timezone.now()
+        giveaway = Giveaway.objects.create(
+            business=business,
+            title="Admin Giveaway",
+            description="Test",
+            start_date=now - datetime.timedelta(days=1),
+            end_date=now + datetime.timedelta(days=1),
+            signup_question="Hva er 2+2?",
+            signup_options=["4", "5"],
+        )
+        for i in range(5):
+            user = User.objects.create_user(
+                username=f"medlem{i}", email=f"medlem{i}@test.com", password="test123"
+            )
+            Entry.objects.create(giveaway=giveaway, user=user, answer="4", user_location_city="Oslo")
+        self.client.login(email="admin@test.com", password="test123")
+
+    def test_changelist_pages_with_cursor(self):
+        from giveaways.admin import EntryAdmin
+        url = reverse('admin:giveaways_entry_changelist')
+        with self.settings(KEYSET_COUNT_CACHE_TIMEOUT=0):
+            EntryAdmin.list_per_page = 2
+            try:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                cl = response.context['cl']
+                self.assertEqual(len(cl.result_list), 2)
+                self.assertIn('cursor=', cl.next_page_url)
+
+                response = self.client.get(url + cl.next_page_url)
+                self.assertEqual(response.status_code, 200)
+                second = response.context['cl']
+                self.assertEqual(len(second.result_list), 2)
+                self.assertTrue(set(cl.result_list).isdisjoint(second.result_list))
+            finally:
+                EntryAdmin.list_per_page = 100
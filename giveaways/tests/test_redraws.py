@@ -0,0 +1,158 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Entry, Giveaway, Winner
+from giveaways.services.draws import verify_draw
+from giveaways.services.redraws import expire_claims, redraw_expired_winners, vacant_giveaway_ids
+from giveaways.services.winner_selection import select_random_winner_scalable
+
+User = get_user_model()
+
+
+class RedrawTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username="bedrift", email="bedrift@test.com", password="test123", city="Oslo")
+        self.business = Business.objects.create(user=owner, admin=owner, name="TestBedrift", city="Oslo", postal_code="0150")
+        self.giveaway = self.make_giveaway("Test Giveaway", entries=10, number_of_winners=2)
+
+    def make_giveaway(self, title, entries, **fields):
+        giveaway = Giveaway.objects.create(
+            business=self.business,
+            title=title,
+            description="Test",
+            start_date=timezone.now() - datetime.timedelta(days=2),
+            end_date=timezone.now() + datetime.timedelta(days=1),
+            signup_question="Hva er 2+2?",
+            signup_options=["4", "5"],
+            **fields
+        )
+        for i in range(entries):
+            user = User.objects.create_user(
+                username=f"{giveaway.pk}-{i}", email=f"m{giveaway.pk}-{i}@example.com", password="test123", city="Oslo",
+            )
+            Entry.objects.create(giveaway=giveaway, user=user, answer="4", user_location_city="Oslo")
+        Giveaway.objects.filter(pk=giveaway.pk).update(end_date=timezone.now() - datetime.timedelta(minutes=1))
+        return giveaway
+
+    def draw(self, giveaway):
+        self.assertTrue(select_random_winner_scalable(giveaway.pk)['success'])
+        Winner.objects.update(notification_sent=True)
+        return list(giveaway.winners.order_by('rank'))
+
+    def test_expired_claim_is_redrawn_and_verifiable(self):
+        first, second = self.draw(self.giveaway)
+        self.assertEqual(first.status, Winner.PENDING)
+        self.assertIsNotNone(first.claim_deadline)
+        second.claim()
+        Winner.objects.filter(pk=first.pk).update(claim_deadline=timezone.now() - datetime.timedelta(minutes=1))
+
+        result = redraw_expired_winners()
+        self.assertEqual((result['expired'], result['replacements'], result['notified']), (1, 1, 1))
+        first.refresh_from_db()
+        self.assertEqual(first.status, Winner.EXPIRED)
+        self.assertTrue(first.redrawn)
+        replacement = first.replacements.get()
+        self.assertEqual(replacement.rank, 1)
+        self.assertNotIn(replacement.user_id, (first.user_id, second.user_id))
+        self.assertGreater(replacement.draw_attempt, max(first.draw_attempt, second.draw_attempt))
+        self.assertEqual(mail.outbox[0].to, [replacement.user.email])
+        self.assertTrue(verify_draw(self.giveaway).ok)
+        # Nothing left to do
+        self.assertEqual(redraw_expired_winners()['giveaways'], 0)
+
+    def test_disqualified_winner_is_replaced_in_weighted_draw(self):
+        Entry.objects.filter(giveaway=self.giveaway, id__in=Entry.objects.order_by('id').values('id')[:3]).update(weight=4)
+        first, second = self.draw(self.giveaway)
+        Winner.objects.filter(pk=second.pk).update(status=Winner.DISQUALIFIED)
+        redraw_expired_winners()
+        replacement = Winner.objects.get(replaces=second)
+        self.assertLess(float(replacement.draw_key), float(second.draw_key))
+        self.assertTrue(verify_draw(self.giveaway).ok)
+
+    def test_replaced_winner_is_not_notified(self):
+        self.assertTrue(select_random_winner_scalable(self.giveaway.pk)['success'])
+        first, second = self.giveaway.winners.order_by('rank')
+        Winner.objects.filter(pk=first.pk).update(status=Winner.DISQUALIFIED)
+
+        redraw_expired_winners()
+        replacement = Winner.objects.get(replaces=first)
+        winner_mail = [message.to for message in mail.outbox if message.subject.startswith("Gratulerer")]
+        self.assertCountEqual(winner_mail, [[second.user.email], [replacement.user.email]])
+        self.assertFalse(Winner.objects.get(pk=first.pk).notification_sent)
+
+    def test_deleted_account_starts_new_draw_record(self):
+        first, second = self.draw(self.giveaway)
+        User.objects.filter(entries__giveaway=self.giveaway, giveaway_wins__isnull=True).first().delete()
+        Winner.objects.filter(pk=first.pk).update(status=Winner.DISQUALIFIED)
+
+        self.assertEqual(redraw_expired_winners()['replacements'], 1)
+        self.assertTrue(Winner.objects.get(pk=first.pk).redrawn)
+        replacement = Winner.objects.get(replaces=first)
+        self.assertEqual(replacement.draw_entry_count, 9)
+        self.assertNotEqual(replacement.draw_root, first.draw_root)
+        self.assertNotIn(replacement.user_id, (first.user_id, second.user_id))
+        result = verify_draw(self.giveaway)
+        self.assertTrue(result.ok, result.problems)
+        self.assertEqual(sorted(result.superseded), [first.pk, second.pk])
+
+        # Later redraws continue the new record
+        Winner.objects.filter(pk=second.pk).update(status=Winner.EXPIRED)
+        redraw_expired_winners()
+        self.assertEqual(Winner.objects.get(replaces=second).draw_root, replacement.draw_root)
+        self.assertTrue(verify_draw(self.giveaway).ok)
+
+    def test_unfilled_place_stays_vacant_behind_others(self):
+        small = self.make_giveaway("Small", entries=2, number_of_winners=2)
+        first, _ = self.draw(small)
+        Winner.objects.filter(pk=first.pk).update(status=Winner.DISQUALIFIED)
+        self.assertEqual(redraw_expired_winners()['replacements'], 0)
+        first.refresh_from_db()
+        self.assertFalse(first.redrawn)
+        self.assertIsNotNone(first.redraw_tried_at)
+
+        later = self.make_giveaway("Later", entries=3)
+        winner, = self.draw(later)
+        Winner.objects.filter(pk=winner.pk).update(status=Winner.EXPIRED)
+        self.assertEqual(vacant_giveaway_ids(), [later.pk, small.pk])
+
+    def test_runs_are_bounded(self):
+        others = [self.make_giveaway(f"Giveaway {i}", entries=3) for i in range(3)]
+        for giveaway in [self.giveaway] + others:
+            self.draw(giveaway)
+        past = timezone.now() - datetime.timedelta(minutes=1)
+        Winner.objects.update(claim_deadline=past)
+        self.assertEqual(expire_claims(batch_size=2), 2)
+        self.assertEqual(expire_claims(batch_size=10), 3)
+        self.assertEqual(len(vacant_giveaway_ids(batch_size=3)), 3)
+        result = redraw_expired_winners(batch_size=3)
+        self.assertEqual(result['giveaways'], 3)
+        self.assertEqual(len(vacant_giveaway_ids()), 1)
+
+    def test_winner_claims_before_deadline(self):
+        first, _ = self.draw(self.giveaway)
+        self.client.force_login(first.user)
+        url = reverse('giveaways:claim-prize', args=[self.giveaway.pk])
+        self.client.post(url)
+        first.refresh_from_db()
+        self.assertEqual(first.status, Winner.CLAIMED)
+        self.assertIsNotNone(first.claimed_at)
+
+        Winner.objects.filter(pk=first.pk).update(status=Winner.PENDING, claim_deadline=timezone.now() - datetime.timedelta(minutes=1))
+        self.client.post(url)
+        self.assertEqual(Winner.objects.get(pk=first.pk).status, Winner.PENDING)
+
+    def test_stale_winner_cannot_claim_after_expiry(self):
+        first, _ = self.draw(self.giveaway)
+        # Loaded while pending, then expired by the task before the claim is saved
+        Winner.objects.filter(pk=first.pk).update(status=Winner.EXPIRED)
+        self.assertFalse(first.claim())
+        self.assertEqual(first.status, Winner.EXPIRED)
+        self.assertEqual(Winner.objects.get(pk=first.pk).status, Winner.EXPIRED)
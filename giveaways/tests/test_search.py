@@ -0,0 +1,102 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Giveaway
+from giveaways.search import fold_text, query_tokens, search_ids, typeahead
+
+User = get_user_model()
+
+
+class GiveawaySearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="bedrift", email="bedrift@test.com", password="test123", city="Tromsø"
+        )
+        self.business = Business.objects.create(
+            user=self.owner, admin=self.owner, name="Kaffebrenneriet", city="Tromsø", postal_code="9008"
+        )
+        self.counter = 0
+        self.coffee = self._giveaway("Gratis kaffe i ett år", "Vinn kaffe hver dag.")
+        self.bike = self._giveaway("Ny sykkel", "Premien er en sykkel. Passer godt til kaffeturer.")
+
+    def tearDown(self):
+        cache.clear()
+
+    def _giveaway(self, title, description):
+        now = timezone.now()
+        return Giveaway.objects.create(
+            business=self.business,
+            title=title,
+            description=description,
+            start_date=now - datetime.timedelta(days=1),
+            end_date=now + datetime.timedelta(days=1),
+        )
+
+    def test_fold_text_matches_city_normalization(self):
+        self.assertEqual(fold_text("Kaffe på Tromsø!"), "kaffe pa tromso")
+        self.assertEqual(fold_text("Ærlig talt – Bodø"), "aerlig talt bodo")
+        self.assertEqual(query_tokens("  "), [])
+
+    def test_prefix_and_accent_folded_matching(self):
+        self.assertEqual(search_ids("sykk"), [self.bike.pk])
+        self.assertCountEqual(search_ids("tromso"), [self.coffee.pk, self.bike.pk])
+        self.assertEqual(search_ids("gratis tromsø"), [self.coffee.pk])
+        self.assertEqual(search_ids("finnesikke"), [])
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(search_ids("kaffe"), [self.coffee.pk, self.bike.pk])
+
+    def test_index_follows_business_and_giveaway_changes(self):
+        self.business.name = "Sykkelverkstedet"
+        self.business.save()
+        self.assertCountEqual(search_ids("sykkelverk"), [self.coffee.pk, self.bike.pk])
+
+        self.bike.delete()
+        self.assertEqual(search_ids("sykkelverk"), [self.coffee.pk])
+
+    def test_rebuild_command_restores_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM giveaways_search")
+        self.assertEqual(search_ids("kaffe"), [])
+        call_command("rebuild_search_index", stdout=open("/dev/null", "w"))
+        self.assertEqual(search_ids("kaffe"), [self.coffee.pk, self.bike.pk])
+
+    def test_list_view_q_parameter(self):
+        response = self.client.get(reverse("giveaways:list"), {"q": "kaffe"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([g.pk for g in response.context["giveaways"]], [self.coffee.pk, self.bike.pk])
+
+        response = self.client.get(reverse("giveaways:list"), {"q": "sykkel", "city": "Tromsø"})
+        self.assertEqual([g.pk for g in response.context["giveaways"]], [self.bike.pk])
+
+    def test_ended_giveaways_do_not_crowd_out_live_matches(self):
+        ended = [self._giveaway("Kaffe kaffe kaffe", "Kaffe.") for _ in range(3)]
+        Giveaway.objects.filter(pk__in=[g.pk for g in ended]).update(end_date=timezone.now() - datetime.timedelta(days=1))
+        with self.settings(SEARCH_MAX_RESULTS=2):
+            self.assertEqual(search_ids("kaffe", live=True), [self.coffee.pk, self.bike.pk])
+            response = self.client.get(reverse("giveaways:list"), {"q": "kaffe"})
+        self.assertEqual([g.pk for g in response.context["giveaways"]], [self.coffee.pk, self.bike.pk])
+        self.assertEqual([r["id"] for r in typeahead("kaffe", limit=1)], [self.coffee.pk])
+
+    def test_typeahead_endpoint(self):
+        response = self.client.get(reverse("giveaways:search-suggest"), {"q": "kaff"})
+        data = response.json()
+        self.assertEqual([r["id"] for r in data["results"]], [self.coffee.pk, self.bike.pk])
+        self.assertEqual(data["results"][0]["business"], "Kaffebrenneriet")
+        self.assertEqual(data["results"][0]["url"], self.coffee.get_absolute_url())
+
+    def test_typeahead_cached_per_query(self):
+        typeahead("kaff")
+        with CaptureQueriesContext(connection) as queries:
+            typeahead("Kaff")
+        self.assertEqual(len(queries), 0)
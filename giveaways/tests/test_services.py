@@ -0,0 +1,23 @@
+import importlib
+
+from django.test import SimpleTestCase
+
+from giveaways import services
+from giveaways.services import entries, winner_selection
+
+
+class ServicesPackageTest(SimpleTestCase):
+    def test_exports_real_implementations(self):
+        self.assertIs(services.normalize_city, entries.normalize_city)
+        self.assertIs(services.validate_entry, entries.validate_entry)
+        self.assertIs(services.can_select_winners_for_expired_giveaways,
+                      winner_selection.can_select_winners_for_expired_giveaways)
+        self.assertEqual(services.normalize_city(" Oslo Sentrum "), "oslosentrum")
+        self.assertTrue(services.cities_match("Ålesund", "alesund"))
+        self.assertTrue(services.cities_match("Bodø", "Bodo"))
+        self.assertTrue(services.cities_match("Lillestrøm", "LILLESTROM"))
+
+    def test_task_and_command_modules_import(self):
+        for name in ('giveaways.tasks', 'giveaways.management.commands.select_winners'):
+            with self.subTest(module=name):
+                importlib.import_module(name)
@@ -0,0 +1,120 @@
+import dataclasses
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.forms import EntryForm
+from giveaways.models import Giveaway
+from giveaways.snapshots import get_giveaway_snapshot, invalidate_giveaway_snapshots
+from utils.cache import LocalTTLCache
+
+User = get_user_model()
+
+
+class GiveawaySnapshotTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="bedrift", email="bedrift@test.com", password="test123", city="Oslo"
+        )
+        self.business = Business.objects.create(
+            user=self.owner, admin=self.owner, name="TestBedrift", city="Oslo", postal_code="0150"
+        )
+        self.giveaway = Giveaway.objects.create(
+            business=self.business,
+            title="Test Giveaway",
+            description="Test",
+            start_date=timezone.now() - datetime.timedelta(days=1),
+            end_date=timezone.now() + datetime.timedelta(days=1),
+            signup_question="Hva er 2+2?",
+            signup_options=["4", "5"],
+        )
+
+    def tearDown(self):
+        invalidate_giveaway_snapshots(self.giveaway.pk)
+
+    def test_second_lookup_does_not_query(self):
+        snapshot = get_giveaway_snapshot(self.giveaway.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_giveaway_snapshot(str(self.giveaway.pk)), snapshot)
+            giveaway = snapshot.as_giveaway()
+            self.assertEqual(giveaway.business.city, "Oslo")
+            self.assertEqual(giveaway.signup_options, ["4", "5"])
+            self.assertEqual(str(snapshot), str(giveaway))
+        self.assertEqual(len(queries), 0)
+
+    def test_snapshot_is_immutable_and_slotted(self):
+        snapshot = get_giveaway_snapshot(self.giveaway.pk)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.title = "Endret"
+        self.assertFalse(hasattr(snapshot, '__dict__'))
+
+    def test_missing_giveaway_returns_none(self):
+        self.assertIsNone(get_giveaway_snapshot(self.giveaway.pk + 1000))
+        self.assertIsNone(get_giveaway_snapshot("abc"))
+
+    def test_invalidated_on_giveaway_save(self):
+        get_giveaway_snapshot(self.giveaway.pk)
+        self.giveaway.title = "Ny tittel"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.giveaway.save()
+        # Dropped only once the write commits
+        self.assertEqual(get_giveaway_snapshot(self.giveaway.pk).title, "Test Giveaway")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_giveaway_snapshot(self.giveaway.pk).title, "Ny tittel")
+
+    def test_invalidated_on_business_save(self):
+        get_giveaway_snapshot(self.giveaway.pk)
+        self.business.city = "Bergen"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.business.save()
+        self.assertEqual(get_giveaway_snapshot(self.giveaway.pk).business_city, "Bergen")
+
+    def test_invalidated_by_admin_activation_actions(self):
+        admin_user = User.objects.create_superuser(username="admin", email="admin@test.com", password="test123")
+        self.client.force_login(admin_user)
+        self.assertTrue(get_giveaway_snapshot(self.giveaway.pk).is_active)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:giveaways_giveaway_changelist'), {
+                'action': 'mark_inactive', '_selected_action': [self.giveaway.pk],
+            })
+        self.assertFalse(get_giveaway_snapshot(self.giveaway.pk).is_active)
+
+    def test_entry_form_accepts_snapshot(self):
+        snapshot = get_giveaway_snapshot(self.giveaway.pk)
+        form = EntryForm(data={"answer": "4", "user_location_city": "Oslo"}, giveaway=snapshot, request=None)
+        self.assertTrue(form.is_valid())
+        form = EntryForm(data={"answer": "4", "user_location_city": "Bergen"}, giveaway=snapshot, request=None)
+        self.assertFalse(form.is_valid())
+
+    def test_detail_page_served_from_snapshot(self):
+        url = reverse('giveaways:giveaway-detail', args=[self.giveaway.pk])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "TestBedrift")
+        giveaway_table = Giveaway._meta.db_table
+        self.assertFalse(any(f'FROM "{giveaway_table}"' in q['sql'] for q in queries.captured_queries))
+
+
+class LocalTTLCacheTest(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LocalTTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+
+    def test_entries_expire(self):
+        cache = LocalTTLCache(maxsize=2, ttl=0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
@@ -10,7 +10,11 @@ URL namespaces:
 URL patterns:
     * / - Public giveaway listing page
     * /create/ - Create giveaway (business only)
+    * /import/ - Bulk import giveaways from CSV/JSON (business only)
     * /<int:pk>/ - Giveaway detail with entry form
+    * /<int:pk>/claim/ - Winner claims the prize (POST)
+    * /api/home-feed/ - Further homepage cards as JSON
+    * /api/search/ - Search suggestions as JSON
 """
 
 from django.urls import path
@@ -20,7 +24,8 @@ from django.contrib.auth.decorators import login_required
 
 from .views import (GiveawayCreateView, GiveawayListView, GiveawayDetailView,
                   BusinessGiveawayListView, GiveawayEditView, WinnerSelectionStatusView,
-                  GiveawayAnimationDataView, WinnerAnimationView, GiveawayWinnerView)
+                  GiveawayAnimationDataView, WinnerAnimationView, GiveawayWinnerView,
+                  HomeFeedView, GiveawaySearchSuggestView, GiveawayImportView, ClaimPrizeView)
 from .permissions import is_member, can_enter_giveaway
 
 app_name = 'giveaways'
@@ -52,6 +57,13 @@ urlpatterns = [
         name='giveaway-create'
     ),
     
+    # ===== Masseimport av giveaways (kun for bedrifter) =====
+    path(
+        'import/', 
+        login_required(secure_view(GiveawayImportView.as_view())), 
+        name='giveaway-import'
+    ),
+    
     # ===== Detaljer og påmelding for giveaway =====
     path(
         '<int:pk>/', 
@@ -87,12 +99,33 @@ urlpatterns = [
         name='giveaway-winner'
     ),
     
+    # ===== Vinneren bekrefter gevinsten =====
+    path(
+        '<int:pk>/claim/', 
+        secure_view(ClaimPrizeView.as_view()), 
+        name='claim-prize'
+    ),
+    
     # ===== API endpoint for animation data =====
     path(
         'api/animation-data/', 
         secure_view(GiveawayAnimationDataView.as_view()), 
         name='animation-data'
     ),
+    
+    # ===== Lazy-loaded cards for the homepage feed =====
+    path(
+        'api/home-feed/', 
+        HomeFeedView.as_view(), 
+        name='home-feed'
+    ),
+    
+    # ===== Search suggestions (typeahead) =====
+    path(
+        'api/search/', 
+        GiveawaySearchSuggestView.as_view(), 
+        name='search-suggest'
+    ),
 ]
 
 # Sikkerhetsmerknad:
@@ -1,32 +1,75 @@
-from .permissions import can_enter_giveaway
+from .permissions import can_enter_giveaway, is_member
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import IntegrityError
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
 from django.shortcuts import get_object_or_404, redirect
-from django.views.generic.edit import CreateView, UpdateView
+from django.views.generic.edit import CreateView, FormView, UpdateView
 from django.http import Http404
 from django.utils.translation import gettext as _
 from .models import Giveaway
-from .forms import GiveawayCreateForm
+from .forms import GiveawayCreateForm, GiveawayImportForm
+from .imports import import_giveaways
 from businesses.models import Business
+from utils.db import retry_on_locked
+from utils.logging import lazy
+from utils.pagination import KeysetPaginationMixin
+from utils.routers import ReplicaReadMixin
 import logging
 
+from django.conf import settings
+
 logger = logging.getLogger(__name__)
 
 # Admin task monitoring views and winner animation API
 
 from django.views.generic import ListView, DetailView, View
 from django.http import JsonResponse
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.utils import timezone
 from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from celery.result import AsyncResult
 from django.shortcuts import render
 
-from .models import Giveaway, Winner
+from .models import Giveaway, Winner, Entry
+from .snapshots import get_giveaway_snapshot
+from .feed import get_cards
+from .search import fallback_filter, search_ids, typeahead
+from .services.duplicates import screen_entry
+
+
+class GiveawaySnapshotMixin:
+    """
+    DetailView mixin loading the giveaway from its cached GiveawaySnapshot.
+
+    get_object() returns a Giveaway (with business) built from the
+    snapshot, so hot giveaways are served without querying giveaway or
+    business rows. Both objects are memoized for the rest of the request.
+    """
+
+    def get_object(self, queryset=None):
+        """Return a Giveaway instance built from the cached snapshot."""
+        if getattr(self, '_giveaway', None) is None:
+            snapshot = self.get_snapshot()
+            self._giveaway = snapshot.as_giveaway()
+        return self._giveaway
+
+    def get_snapshot(self):
+        """
+        Return the cached GiveawaySnapshot for the requested giveaway.
+
+        Raises:
+            Http404: If no giveaway has this ID
+        """
+        if getattr(self, '_snapshot', None) is None:
+            self._snapshot = get_giveaway_snapshot(self.kwargs.get(self.pk_url_kwarg))
+            if self._snapshot is None:
+                raise Http404(_("Ingen giveaway funnet med denne ID-en"))
+        return self._snapshot
 
 
-class GiveawayWinnerView(DetailView):
+class GiveawayWinnerView(GiveawaySnapshotMixin, DetailView):
     """View for displaying the winner of a giveaway.
     
     This view shows the details of the winner for a completed giveaway.
@@ -53,18 +96,25 @@ class GiveawayWinnerView(DetailView):
             dict: The context dictionary with giveaway and winner information
         """
         context = super().get_context_data(**kwargs)
-        giveaway = self.get_object()
+        giveaway = self.object
         context['business'] = giveaway.business
+        context['draw_commitment'] = self.get_snapshot().draw_commitment
         
-        # Get winner information if available
-        try:
-            winner = Winner.objects.get(giveaway=giveaway)
-            context['winner'] = winner
+        # Get winner information if available (first drawn winner first);
+        # expired and disqualified winners are replaced and not shown
+        winners = list(
+            giveaway.winners.filter(status__in=Winner.ACTIVE_STATUSES).select_related('user').order_by('rank', 'id')
+        )
+        if self.request.user.is_authenticated:
+            context['own_win'] = giveaway.winners.filter(user=self.request.user).first()
+        if winners:
+            context['winners'] = winners
+            context['winner'] = winner = winners[0]
             # Get the winner's entry to show their answer
             winner_entry = winner.get_entry()
             if winner_entry:
                 context['winner_entry'] = winner_entry
-        except Winner.DoesNotExist:
+        else:
             context['no_winner_yet'] = True
         
         # Include the total number of entries
@@ -77,6 +127,20 @@ class GiveawayWinnerView(DetailView):
         return context
 
 
+class ClaimPrizeView(LoginRequiredMixin, View):
+    """Let a drawn winner claim the prize before the claim deadline."""
+    
+    def post(self, request, pk):
+        winner = get_object_or_404(Winner, giveaway_id=pk, user=request.user)
+        if winner.claim():
+            messages.success(request, _("Gevinsten er bekreftet! Bedriften tar kontakt for utlevering."))
+        elif winner.status == Winner.CLAIMED:
+            messages.info(request, _("Du har allerede bekreftet gevinsten."))
+        else:
+            messages.error(request, _("Fristen for å bekrefte gevinsten har gått ut."))
+        return redirect('giveaways:giveaway-winner', pk=pk)
+
+
 class GiveawayAnimationDataView(View):
     """
     API view that provides entry data for the winner selection animation.
@@ -85,6 +149,7 @@ class GiveawayAnimationDataView(View):
     for the specified giveaway. It only includes minimal required information
     for the animation and follows privacy best practices.
     """
+    ratelimit_scope = 'animation-data'
     
     def get(self, request):
         giveaway_id = request.GET.get('giveaway_id')
@@ -96,8 +161,10 @@ class GiveawayAnimationDataView(View):
             }, status=400)
             
         try:
-            # Get the giveaway
-            giveaway = Giveaway.objects.get(id=giveaway_id)
+            # Get the giveaway metadata from the snapshot cache
+            giveaway = get_giveaway_snapshot(giveaway_id)
+            if giveaway is None:
+                raise Giveaway.DoesNotExist
             
             # Check if user has permission to view this giveaway
             if not self._can_view_giveaway(request.user, giveaway):
@@ -107,7 +174,7 @@ class GiveawayAnimationDataView(View):
                 }, status=403)
             
             # Get entries for animation - limit fields to only what's needed
-            entries = giveaway.entries.all().select_related('user')
+            entries = Entry.objects.filter(giveaway_id=giveaway.id).select_related('user')
             
             # Format entries for animation
             entry_data = [{
@@ -143,7 +210,7 @@ class GiveawayAnimationDataView(View):
         """Check if user can view this giveaway's entries."""
         # Business owners can view their own giveaways
         if user.is_authenticated and hasattr(user, 'business_profile'):
-            return user.business_profile.business == giveaway.business
+            return user.business_profile.business_id == giveaway.business_id
         
         # Staff/admin can view any giveaway
         return user.is_staff or user.is_superuser
@@ -161,7 +228,7 @@ class GiveawayAnimationDataView(View):
         return f"{username[0:2]}***@{domain[0:2]}***"
 
 
-class WinnerAnimationView(DetailView):
+class WinnerAnimationView(GiveawaySnapshotMixin, DetailView):
     """
     View that displays the arcade claw machine animation for a giveaway winner.
     
@@ -174,12 +241,15 @@ class WinnerAnimationView(DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        giveaway = self.get_object()
+        giveaway = self.object
         
-        # Check if this giveaway has a winner
-        try:
-            winner = Winner.objects.get(giveaway=giveaway)
-            context['winner'] = winner
+        # Check if this giveaway has winners
+        winners = list(
+            giveaway.winners.filter(status__in=Winner.ACTIVE_STATUSES).select_related('user').order_by('rank', 'id')
+        )
+        if winners:
+            context['winners'] = winners
+            context['winner'] = winner = winners[0]
             # Get the winner's entry to show their answer
             winner_entry = winner.get_entry()
             if winner_entry:
@@ -190,7 +260,7 @@ class WinnerAnimationView(DetailView):
             context['entries'] = entries
             context['entries_count'] = entries.count()
             
-        except Winner.DoesNotExist:
+        else:
             context['no_winner_yet'] = True
         
         # Add business info
@@ -199,6 +269,41 @@ class WinnerAnimationView(DetailView):
         return context
 
 
+class HomeFeedView(ReplicaReadMixin, View):
+    """
+    JSON endpoint for lazy-loading further homepage cards.
+
+    Returns a batch of pre-rendered card fragments from the cached feed
+    (giveaways/feed.py) starting at `offset`, plus the offset of the next
+    batch (null at the end of the feed).
+    """
+
+    def get(self, request):
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+        except ValueError:
+            return JsonResponse({
+                "error": "Invalid offset",
+                "message": "offset must be a whole number"
+            }, status=400)
+        cards, next_offset = get_cards(offset)
+        return JsonResponse({"cards": cards, "next_offset": next_offset})
+
+
+class GiveawaySearchSuggestView(ReplicaReadMixin, View):
+    """
+    JSON endpoint with search suggestions for the giveaway search box.
+
+    Returns the best-matching live giveaways for the partial query `q`
+    (prefix matching, accent-insensitive). Answers come from the full-text
+    index and are cached briefly per query.
+    """
+
+    def get(self, request):
+        query = request.GET.get("q", "").strip()[:100]
+        return JsonResponse({"query": query, "results": typeahead(query)})
+
+
 class WinnerSelectionStatusView(View):
     """
     Admin view for checking the status of winner selection tasks.
@@ -259,16 +364,18 @@ class WinnerSelectionStatusView(View):
         
         return JsonResponse(data)
 
-class GiveawayListView(ListView):
+class GiveawayListView(ReplicaReadMixin, KeysetPaginationMixin, ListView):
     """
     Public overview of active giveaways with advanced filtering options.
     
     Features:
+    - Full-text search with the `q` parameter, ranked by relevance
     - Location-based filtering (city, postal code)
     - Status filtering (active, upcoming, all)
     - Optimized database queries
     - Accessibility enhancements
-    - Responsive pagination
+    - Keyset (cursor) pagination on the selected sort field
+    - Served from read replicas when configured
     """
     model = Giveaway
     template_name = "giveaways/giveaway_list.html"
@@ -286,7 +393,6 @@ class GiveawayListView(ListView):
         # Date filtering
         show_all_dates = self.request.GET.get("all_dates")
         if not show_all_dates:
-            from django.utils import timezone
             now = timezone.now()
             queryset = queryset.filter(start_date__lte=now, end_date__gte=now)
             
@@ -294,26 +400,35 @@ class GiveawayListView(ListView):
         city = self.request.GET.get("city")
         postal_code = self.request.GET.get("postal_code")
         
-        # Case-insensitive city matching with normalization
+        # Case-insensitive city matching
         if city:
-            from .services import normalize_city_name
-            normalized_city = normalize_city_name(city)
-            queryset = queryset.filter(business__city__iexact=normalized_city)
+            queryset = queryset.filter(business__city__iexact=city.strip())
             
         if postal_code:
             queryset = queryset.filter(business__postal_code=postal_code)
             
-        # Category filtering
-        category = self.request.GET.get("category")
-        if category:
-            queryset = queryset.filter(category=category)
+        # Full-text search; results are ranked unless a sort is chosen
+        query = self.request.GET.get("q", "").strip()
+        ranked_ids = None
+        if query:
+            ranked_ids = search_ids(query, live=not show_all_dates)
+            if ranked_ids is None:
+                queryset = queryset.filter(fallback_filter(query))
+            else:
+                queryset = queryset.filter(pk__in=ranked_ids)
             
         # Sorting
-        sort_by = self.request.GET.get("sort", "end_date")
+        sort_by = self.request.GET.get("sort", "relevance" if ranked_ids else "end_date")
         valid_sort_fields = ['end_date', '-end_date', 'start_date', '-start_date', 
                             'title', '-title']
                             
-        if sort_by in valid_sort_fields:
+        if sort_by == "relevance" and ranked_ids:
+            # Position in the ranked result, so keyset pagination can page through it
+            queryset = queryset.annotate(search_rank=Case(
+                *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked_ids)],
+                output_field=IntegerField(),
+            )).order_by("search_rank", "id")
+        elif sort_by in valid_sort_fields:
             queryset = queryset.order_by(sort_by)
         else:
             # Default sort - ending soon first
@@ -332,11 +447,10 @@ class GiveawayListView(ListView):
         context["selected_city"] = self.request.GET.get("city", "")
         context["selected_postal_code"] = self.request.GET.get("postal_code", "")
         context["all_dates"] = self.request.GET.get("all_dates", "")
-        context["selected_category"] = self.request.GET.get("category", "")
+        context["search_query"] = self.request.GET.get("q", "")
         context["selected_sort"] = self.request.GET.get("sort", "end_date")
         
         # Get cities with active giveaways for dropdown
-        from django.db.models import Count
         cities = Giveaway.objects.filter(is_active=True)\
             .values('business__city')\
             .annotate(count=Count('id'))\
@@ -346,11 +460,9 @@ class GiveawayListView(ListView):
         context["available_cities"] = cities
         
         # Add statistics for template
-        from django.utils import timezone
         now = timezone.now()
         
         # Provide count of active, upcoming and total giveaways
-        from django.db.models import Q
         giveaway_stats = Giveaway.objects.filter(is_active=True).aggregate(
             active_count=Count('id', filter=Q(start_date__lte=now, end_date__gte=now)),
             upcoming_count=Count('id', filter=Q(start_date__gt=now)),
@@ -359,19 +471,15 @@ class GiveawayListView(ListView):
         
         context["giveaway_stats"] = giveaway_stats
         
-        # Get categories for filtering
-        categories = Giveaway.objects.values_list('category', flat=True)\
-            .distinct().order_by('category')
-        context["categories"] = [c for c in categories if c]  # Filter out empty categories
-        
         # Add accessibility enhancements
         context["accessibility"] = {
             "aria_labels": {
                 "giveaway_list": _('Liste over aktive giveaways'),
-                "filter_form": _('Filter giveaways etter sted og kategori'),
+                "filter_form": _('Søk og filtrer giveaways etter sted'),
                 "pagination": _('Sidenavigasjon for giveaway-liste')
             },
             "help_text": {
+                "q": _('Søk etter premie, bedrift eller sted'),
                 "city": _('Velg by for å se giveaways i nærheten av deg'),
                 "postal_code": _('Skriv inn postnummer for å finne giveaways'),
                 "all_dates": _('Vis også kommende giveaways som ikke har startet ennå')
@@ -388,7 +496,7 @@ from .forms import EntryForm
 
 from .models import Giveaway
 
-class GiveawayDetailView(DetailView):
+class GiveawayDetailView(ReplicaReadMixin, GiveawaySnapshotMixin, DetailView):
     """
     Detailed view of a giveaway with entry form for members.
     
@@ -397,36 +505,21 @@ class GiveawayDetailView(DetailView):
     2. Showing entry form for eligible members
     3. Processing form submissions for participation
     4. Validating user eligibility based on location and membership
+    
+    GET requests read from replicas when configured; after submitting an entry
+    the user is kept on the primary so has_joined is never stale.
     """
     model = Giveaway
     template_name = 'giveaways/giveaway_detail.html'
     context_object_name = 'giveaway'
-    
-    def get_object(self, queryset=None):
-        """
-        Retrieve the giveaway with all related objects for better performance.
-        """
-        if queryset is None:
-            queryset = self.get_queryset()
-            
-        # Use select_related to reduce database queries
-        queryset = queryset.select_related('business')
-        
-        pk = self.kwargs.get(self.pk_url_kwarg)
-        if pk is not None:
-            queryset = queryset.filter(pk=pk)
-            
-        try:
-            obj = queryset.get()
-            return obj
-        except queryset.model.DoesNotExist:
-            raise Http404(_("Ingen giveaway funnet med denne ID-en"))
+    # Entry POSTs are throttled by utils.middleware.RateLimitMiddleware
+    ratelimit_scope = 'giveaway-entry'
     
     def get_entry_form_kwargs(self, post=False):
         """
-        Prepare form kwargs with giveaway and request objects.
+        Prepare form kwargs with the giveaway snapshot and request.
         """
-        kwargs = {'giveaway': self.get_object(), 'request': self.request}
+        kwargs = {'giveaway': self.get_snapshot(), 'request': self.request}
         if post:
             kwargs['data'] = self.request.POST
         return kwargs
@@ -437,6 +530,7 @@ class GiveawayDetailView(DetailView):
         """
         context = super().get_context_data(**kwargs)
         giveaway = self.get_object()
+        snapshot = self.get_snapshot()
         user = self.request.user
         
         # Use cached property pattern for expensive queries
@@ -445,9 +539,6 @@ class GiveawayDetailView(DetailView):
             entries_count = giveaway.entries.count()
             self._entries_count = entries_count
         
-        # Import is_member function
-        from .permissions import is_member
-        
         # Check various user statuses
         is_member_status = is_member(user) if user.is_authenticated else False
         is_business_user = hasattr(user, "business_account") if user.is_authenticated else False
@@ -457,7 +548,7 @@ class GiveawayDetailView(DetailView):
         if user.is_authenticated:
             has_joined = giveaway.entries.filter(user=user).exists()
             
-        can_participate = can_enter_giveaway(user, giveaway)
+        can_participate = can_enter_giveaway(user, snapshot)
         
         # Get participation status text for better user feedback
         participation_status = self._get_participation_status(
@@ -494,6 +585,7 @@ class GiveawayDetailView(DetailView):
             "participation_status": participation_status,
             "accessibility": accessibility,
             "is_active_giveaway": giveaway.is_currently_active(),
+            "draw_commitment": snapshot.draw_commitment,
         })
         return context
         
@@ -553,14 +645,12 @@ class GiveawayDetailView(DetailView):
         user = request.user
         
         # Security check - verify user can participate
-        if not can_enter_giveaway(user, self.object):
+        if not can_enter_giveaway(user, self.get_snapshot()):
             messages.error(
                 request, 
                 _('Du har ikke tilgang til å delta i denne giveawayen.')
             )
-            logger.warning(
-                f"Ugyldig påmeldingsforsøk: {user.email} for giveaway {self.object.id}"
-            )
+            logger.warning("Ugyldig påmeldingsforsøk: bruker %s for giveaway %s", user.pk, self.object.pk)
             return redirect(self.object.get_absolute_url())
 
         # Process form submission with robust error handling
@@ -576,13 +666,17 @@ class GiveawayDetailView(DetailView):
                     # Set both required foreign keys
                     entry.user = user
                     entry.giveaway = self.object
+                    # Flag entries by other accounts of the same person
+                    screen_entry(entry, request)
+                    entry.weight = self.object.entry_weight(timezone.now())
                     
                     # Final validation check before saving
                     # This validates the full model with all fields set
                     entry.full_clean()
                     
-                    # Now save the entry to the database
-                    entry.save()
+                    # Now save the entry to the database, retrying if SQLite
+                    # is briefly locked by a burst of concurrent entries
+                    retry_on_locked(entry.save)
                     
                     # Success message with toast notification
                     messages.success(
@@ -592,20 +686,20 @@ class GiveawayDetailView(DetailView):
                     
                     # Log successful entry
                     logger.info(
-                        f"Bruker {user.email} meldte seg på giveaway {self.object.id} "
-                        f"fra {entry.user_location_city}."
+                        "Bruker %s meldte seg på giveaway %s fra %s.",
+                        user.pk, self.object.pk, entry.user_location_city,
                     )
                     
                     return redirect(self.object.get_absolute_url())
                 except ValidationError as ve:
                     # Handle validation errors
-                    logger.warning(f"Valideringsfeil ved påmelding: {str(ve)}")
+                    logger.warning("Valideringsfeil ved påmelding: %s", ve)
                     for field, errors in ve.message_dict.items():
                         for error in errors:
                             form.add_error(field, error)
                 except IntegrityError:
                     # Handle unique constraint violations (user already entered)
-                    logger.warning(f"Bruker {user.email} har allerede meldt seg på giveaway {self.object.id}")
+                    logger.info("Bruker %s har allerede meldt seg på giveaway %s", user.pk, self.object.pk)
                     messages.error(
                         request,
                         _('Du har allerede meldt deg på denne giveawayen.')
@@ -613,23 +707,23 @@ class GiveawayDetailView(DetailView):
                     return redirect(self.object.get_absolute_url())
                 except Exception as e:
                     # Handle other unexpected errors
-                    logger.error(f"Feil ved lagring av påmelding: {str(e)}")
+                    logger.exception("Feil ved lagring av påmelding: %s", e)
                     messages.error(
                         request, 
                         _('Det oppstod en feil ved påmelding. Vennligst prøv igjen.')
                     )
         except Exception as form_error:
             # Catch any exceptions during form validation
-            logger.error(f"Feil ved validering av skjema: {str(form_error)}")
+            logger.exception("Feil ved validering av skjema: %s", form_error)
             messages.error(
                 request,
                 _('Det oppstod en feil ved validering av skjemaet. Vennligst prøv igjen.')
             )
         else:
             # Form validation failed
-            logger.warning(
-                f"Påmelding mislyktes for {user.email} til giveaway {self.object.id}: "
-                f"{form.errors}"
+            logger.info(
+                "Påmelding mislyktes for bruker %s til giveaway %s: %s",
+                user.pk, self.object.pk, lazy(form.errors.as_json),
             )
             
         # Re-render form with errors
@@ -661,17 +755,12 @@ class BusinessContextMixin:
         if not business:
             return {}
             
-        # Import models here to avoid circular imports
-        from .models import Giveaway, Entry, Winner
-        
         # Use efficient aggregation queries
         giveaways = Giveaway.objects.filter(business=business)
         giveaways_active = giveaways.filter(is_active=True)
         giveaways_ended = giveaways.filter(is_active=False)
         
         # Calculate statistics with annotation and aggregation
-        from django.db.models import Count, Q
-        from django.utils import timezone
         now = timezone.now()
         
         giveaway_stats = giveaways.aggregate(
@@ -727,7 +816,6 @@ class BusinessOnlyMixin(UserPassesTestMixin):
         """
         Provide helpful feedback when access is denied.
         """
-        from django.contrib import messages
         messages.error(
             self.request, 
             _("Kun bedriftsbrukere kan opprette giveaways. Logg inn med en bedriftskonto.")
@@ -940,13 +1028,66 @@ class GiveawayEditView(LoginRequiredMixin, BusinessOnlyMixin, BusinessContextMix
         return reverse_lazy('giveaways:business-giveaways')
 
 
-class BusinessGiveawayListView(LoginRequiredMixin, BusinessOnlyMixin, BusinessContextMixin, ListView):
+class GiveawayImportView(LoginRequiredMixin, BusinessOnlyMixin, BusinessContextMixin, FormView):
+    """
+    View for å importere mange giveaways fra CSV/JSON for innlogget bedriftsbruker.
+    
+    Features:
+    - Validates every row before anything is saved, with errors per row
+    - Recurrence rules (repeat/occurrences) expand to a series of giveaways
+    - Images are uploaded once and shared by the rows referring to them
+    """
+    form_class = GiveawayImportForm
+    template_name = "giveaways/giveaway_import.html"
+    success_url = reverse_lazy('giveaways:business-giveaways')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['business'] = self.get_business()
+        context['max_rows'] = getattr(settings, 'GIVEAWAY_IMPORT_MAX_ROWS', 500)
+        context['accessibility'] = {
+            "aria_labels": {
+                "form": _('Skjema for import av giveaways'),
+                "errors": _('Feil i importfilen'),
+            }
+        }
+        return context
+    
+    def form_valid(self, form):
+        """
+        Import the file; show per-row errors if any row is invalid.
+        """
+        business = self.get_business()
+        result = import_giveaways(business, form.cleaned_data['file'], form.images_by_name())
+        
+        if not result['success']:
+            logger.warning(
+                f"Giveaway-import avvist for {business.name}: {len(result['errors'])} feil"
+            )
+            messages.error(
+                self.request,
+                _('Ingen giveaways ble importert. Rett feilene under og prøv igjen.')
+            )
+            return self.render_to_response(
+                self.get_context_data(form=form, import_errors=result['errors'])
+            )
+        
+        messages.success(
+            self.request,
+            _('%(count)d giveaways ble importert.') % {'count': len(result['created'])}
+        )
+        return super().form_valid(form)
+
+
+class BusinessGiveawayListView(LoginRequiredMixin, BusinessOnlyMixin, BusinessContextMixin,
+                               KeysetPaginationMixin, ListView):
     """
     View for å vise en liste over giveaways for innlogget bedriftsbruker.
     
     Features:
     - Automatic business association for the listed giveaways
     - Filtering and sorting of giveaways
+    - Keyset (cursor) pagination on the selected sort field
     - Status statistics and performance overview
     - Accessibility enhancements
     """
@@ -971,7 +1112,6 @@ class BusinessGiveawayListView(LoginRequiredMixin, BusinessOnlyMixin, BusinessCo
         queryset = Giveaway.objects.filter(business=business)
         
         # Apply status filter if provided
-        from django.utils import timezone
         now = timezone.now()
         
         if status_filter == 'active':
@@ -999,7 +1139,6 @@ class BusinessGiveawayListView(LoginRequiredMixin, BusinessOnlyMixin, BusinessCo
         
         if sort_by == 'participants' or sort_by == '-participants':
             # Need to annotate for participant count sorting
-            from django.db.models import Count
             queryset = queryset.annotate(participants_count=Count('entries'))
             if sort_by == 'participants':
                 queryset = queryset.order_by('participants_count')
@@ -1030,9 +1169,7 @@ class BusinessGiveawayListView(LoginRequiredMixin, BusinessOnlyMixin, BusinessCo
         context['business_stats'] = self.get_business_stats()
         
         # Add summary statistics for quick view
-        from django.utils import timezone
         now = timezone.now()
-        from django.db.models import Count, Q
         
         all_giveaways = Giveaway.objects.filter(business=business)
         status_counts = all_giveaways.aggregate(
@@ -0,0 +1,47 @@
+#!/usr/bin/env bash
+# Run a command against a throwaway PostgreSQL server.
+#
+# Usage:
+#   scripts/with_postgres.sh                      # run the test suite
+#   scripts/with_postgres.sh python manage.py benchmark_sessions
+#
+# Uses a temporary pg_ctl cluster when PostgreSQL binaries are on PATH,
+# otherwise a postgres:16 Docker container. Everything is removed on exit.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+[ $# -eq 0 ] && set -- python -m pytest -q
+
+PORT="${POSTGRES_PORT:-55432}"
+export DB_ENGINE=postgres
+export POSTGRES_HOST=127.0.0.1
+export POSTGRES_PORT="$PORT"
+export POSTGRES_DB=raildrops
+export POSTGRES_USER=raildrops
+export POSTGRES_PASSWORD=raildrops
+
+if command -v pg_ctl >/dev/null 2>&1; then
+    DATA_DIR="$(mktemp -d)"
+    trap 'pg_ctl -D "$DATA_DIR" -m immediate stop >/dev/null 2>&1 || true; rm -rf "$DATA_DIR"' EXIT
+    PWFILE="$DATA_DIR.pw"
+    echo "$POSTGRES_PASSWORD" > "$PWFILE"
+    initdb -D "$DATA_DIR" -U "$POSTGRES_USER" --pwfile="$PWFILE" -A md5 >/dev/null
+    rm -f "$PWFILE"
+    # Durability is irrelevant for a throwaway cluster
+    pg_ctl -D "$DATA_DIR" -l "$DATA_DIR/server.log" -w \
+        -o "-p $PORT -k $DATA_DIR -c fsync=off -c synchronous_commit=off -c full_page_writes=off" start >/dev/null
+    PGPASSWORD="$POSTGRES_PASSWORD" createdb -h 127.0.0.1 -p "$PORT" -U "$POSTGRES_USER" "$POSTGRES_DB"
+elif command -v docker >/dev/null 2>&1; then
+    CONTAINER="raildrops-pg-$$"
+    trap 'docker rm -f "$CONTAINER" >/dev/null 2>&1 || true' EXIT
+    docker run -d --rm --name "$CONTAINER" -p "$PORT:5432" \
+        -e POSTGRES_DB -e POSTGRES_USER -e POSTGRES_PASSWORD \
+        postgres:16 -c fsync=off -c synchronous_commit=off -c full_page_writes=off >/dev/null
+    until docker exec "$CONTAINER" pg_isready -U "$POSTGRES_USER" -d "$POSTGRES_DB" >/dev/null 2>&1; do sleep 0.5; done
+else
+    echo "Need either PostgreSQL binaries (pg_ctl) or docker" >&2
+    exit 1
+fi
+
+python manage.py migrate --noinput >/dev/null
+"$@"
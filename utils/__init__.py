@@ -0,0 +1,5 @@
+"""
+Shared utilities for Raildrops.
+
+Reusable helpers that are not tied to a single app (pagination, logging, etc.).
+"""
@@ -0,0 +1,110 @@
+"""
+Admin helpers for large tables.
+
+Provides a ChangeList that pages with keyset cursors instead of
+OFFSET/LIMIT, a mixin that replaces exact changelist COUNTs with
+estimates, and mixins to enable them on a ModelAdmin.
+"""
+
+import logging
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+
+from .pagination import CURSOR_VAR, ApproximateCountPaginator, InvalidCursor, KeysetPaginator
+
+logger = logging.getLogger(__name__)
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Admin ChangeList that pages with keyset cursors.
+
+    The changelist's own deterministic ordering (including column sorting
+    via `?o=`) is reused as the keyset, so sorting keeps working. Totals
+    come from estimated_count() rather than a COUNT per request.
+    Falls back to the regular OFFSET behaviour when the ordering contains
+    expressions or when list_editable is in use (its formset needs a
+    queryset rather than a list).
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filter and sort links must start over from the first page
+        new_params = dict(new_params or {})
+        new_params.setdefault(CURSOR_VAR, None)
+        return super().get_query_string(new_params, remove)
+
+    def get_results(self, request):
+        if self.list_editable:
+            return super().get_results(request)
+        try:
+            paginator = KeysetPaginator(
+                self.queryset,
+                self.list_per_page,
+                ordering=self.queryset.query.order_by,
+                approximate_count=True,
+            )
+        except ValueError as e:
+            logger.debug("Keyset pagination disabled for %s: %s", self.model.__name__, e)
+            return super().get_results(request)
+
+        try:
+            page = paginator.page(request.GET.get(CURSOR_VAR))
+        except InvalidCursor:
+            raise IncorrectLookupParameters
+
+        self.result_count = paginator.count
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.result_list = page.object_list
+        self.can_show_all = False
+        self.multi_page = page.has_other_pages()
+        self.paginator = paginator
+        self.page = page
+
+    def get_cursor_url(self, cursor):
+        """Return the changelist URL for a cursor, keeping filters and sorting."""
+        return super().get_query_string({CURSOR_VAR: cursor})
+
+    @property
+    def next_page_url(self):
+        cursor = self.page.next_cursor if getattr(self, 'page', None) else None
+        return self.get_cursor_url(cursor) if cursor else None
+
+    @property
+    def previous_page_url(self):
+        cursor = self.page.previous_cursor if getattr(self, 'page', None) else None
+        return self.get_cursor_url(cursor) if cursor else None
+
+
+class ApproximateCountAdminMixin:
+    """
+    ModelAdmin mixin that avoids exact COUNT queries on the changelist.
+
+    The paginator total comes from a planner estimate (PostgreSQL) or a
+    short-lived cached count, and the unfiltered "N total" count is
+    disabled. Combine with annotate() in get_queryset for list columns so
+    the changelist runs a fixed number of queries regardless of page size.
+    """
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
+class KeysetPaginationAdminMixin(ApproximateCountAdminMixin):
+    """
+    ModelAdmin mixin that enables keyset pagination on the changelist.
+
+    Usage:
+        class EntryAdmin(KeysetPaginationAdminMixin, admin.ModelAdmin):
+            ...
+    """
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class UtilsConfig(AppConfig):
+    name = 'utils'
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in, user_logged_out
+        from django.db.backends.signals import connection_created
+
+        from .db import configure_sqlite
+        from .images import connect_signals
+        from .ratelimit import forget_login, remember_login
+
+        connect_signals()
+        user_logged_in.connect(remember_login, dispatch_uid='utils.ratelimit.remember_login')
+        user_logged_out.connect(forget_login, dispatch_uid='utils.ratelimit.forget_login')
+        connection_created.connect(configure_sqlite, dispatch_uid='utils.db.configure_sqlite')
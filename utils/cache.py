@@ -0,0 +1,125 @@
+"""
+Cache helpers.
+
+- LocalTTLCache: small thread-safe in-process LRU cache whose entries
+  expire after a fixed TTL.
+- TwoTierCache: cache-aside lookups that check a LocalTTLCache first and
+  Django's shared cache (Redis in production) second, and only then call
+  the loader. Values must be picklable for the shared tier.
+
+The local tier is per process, so after an invalidation other workers can
+serve the old value until their local entry expires. Keep its TTL short
+(seconds) and rely on the shared tier for longer-lived entries.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache as shared_cache
+
+# Stored in place of None so a cached "missing" result is a cache hit
+_MISSING = object()
+
+
+class LocalTTLCache:
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Args:
+        maxsize: Maximum number of entries kept; the least recently used
+            entry is evicted first
+        ttl: Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize=1024, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    Cache-aside store backed by a local LRU and the shared Django cache.
+
+    Usage:
+        snapshots = TwoTierCache('giveaway:snapshot:v1', shared_timeout=300)
+        snapshot = snapshots.get_or_set(pk, lambda: load(pk))
+
+    Args:
+        prefix: Key prefix in the shared cache; include a version and bump
+            it when the cached objects change shape
+        shared_timeout: Seconds entries live in the shared cache
+        local_ttl: Seconds entries live in the in-process cache
+        local_maxsize: Maximum entries in the in-process cache
+    """
+
+    def __init__(self, prefix, shared_timeout=300, local_ttl=5, local_maxsize=1024):
+        self.prefix = prefix
+        self.shared_timeout = shared_timeout
+        self.local = LocalTTLCache(maxsize=local_maxsize, ttl=local_ttl)
+
+    def shared_key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def get_or_set(self, key, loader):
+        """
+        Return the cached value for key, calling loader() on a miss.
+
+        A None result from the loader is cached too, so repeated lookups
+        of a missing object do not reach the database either.
+        """
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = shared_cache.get(self.shared_key(key), _MISSING)
+        if value is _MISSING:
+            value = loader()
+            shared_cache.set(self.shared_key(key), value, self.shared_timeout)
+        self.local.set(key, value)
+        return value
+
+    def delete(self, key):
+        self.local.delete(key)
+        shared_cache.delete(self.shared_key(key))
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(key)
+        shared_cache.delete_many([self.shared_key(key) for key in keys])
+
+    def clear_local(self):
+        self.local.clear()
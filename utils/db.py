@@ -0,0 +1,88 @@
+"""
+Database helpers.
+
+- sqlite_pragmas() / configure_sqlite(): tuning applied to every new SQLite
+  connection (WAL journal, synchronous=NORMAL, busy_timeout, mmap and page
+  cache) when SQLITE_TUNING is on. With WAL, readers no longer wait for a
+  writer to commit, so list pages keep rendering during entry bursts.
+- retry_on_locked(): retries a write that failed with "database is locked",
+  which SQLite can still raise when busy_timeout runs out under heavy load.
+"""
+
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+logger = logging.getLogger(__name__)
+
+LOCKED_MESSAGES = ('database is locked', 'database table is locked')
+
+
+def sqlite_pragmas():
+    """
+    Return the PRAGMA statements applied to new SQLite connections.
+
+    Values come from settings so single-node installs can size the cache
+    and memory map to their machine.
+    """
+    return [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={int(getattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 5000))}',
+        f'PRAGMA mmap_size={int(getattr(settings, "SQLITE_MMAP_SIZE", 256 * 1024 * 1024))}',
+        # Negative values are KiB rather than pages
+        f'PRAGMA cache_size=-{int(getattr(settings, "SQLITE_CACHE_SIZE_KB", 64000))}',
+        'PRAGMA temp_store=MEMORY',
+    ]
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created handler that tunes SQLite connections."""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TUNING', False):
+        return
+    with connection.cursor() as cursor:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+
+
+def is_locked_error(error):
+    """Return True if an OperationalError is SQLite's lock timeout."""
+    return any(message in str(error) for message in LOCKED_MESSAGES)
+
+
+def retry_on_locked(func, attempts=None, base_delay=0.05):
+    """
+    Call func in a transaction, retrying when SQLite reports a lock.
+
+    Each attempt runs in its own atomic block, so a failed attempt is
+    rolled back cleanly before the next. Delays grow exponentially with
+    jitter. Inside an outer transaction func runs once: rolling back to a
+    savepoint keeps the outer transaction's lock, so a retry could not
+    succeed; the caller that owns the transaction has to retry it.
+
+    Args:
+        func: Callable performing the write
+        attempts: Maximum attempts (default SQLITE_LOCK_RETRIES)
+        base_delay: Delay before the first retry, in seconds
+
+    Returns:
+        The return value of func
+
+    Raises:
+        OperationalError: If the database is still locked after the last
+            attempt, or for any other operational error
+    """
+    attempts = attempts or getattr(settings, 'SQLITE_LOCK_RETRIES', 3)
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction.atomic():
+                return func()
+        except OperationalError as e:
+            if not is_locked_error(e) or attempt == attempts or transaction.get_connection().in_atomic_block:
+                raise
+            delay = base_delay * 2 ** (attempt - 1) * (1 + random.random())
+            logger.warning(f"Database locked (attempt {attempt}/{attempts}), retrying in {delay:.2f}s")
+            time.sleep(delay)
@@ -0,0 +1,259 @@
+"""
+Offline reverse geocoding for Norwegian coordinates.
+
+Giveaway eligibility is an exact (normalized) city match, so the city a
+member is placed in must come from one canonical list rather than from
+whatever a client-side geocoder returns. This module maps browser
+coordinates to a city without any network call:
+
+- With municipality boundaries installed (GEOCODER_BOUNDARIES_FILE, a
+  GeoJSON FeatureCollection of the municipalities, e.g. Kartverket's
+  "Kommuner" dataset in WGS84), the point is tested for containment and
+  the municipality containing it is the city. Points outside every
+  municipality (abroad, at sea) have no city.
+- Otherwise the nearest town in a bundled table
+  (utils/data/places_no.csv: name, postal code, latitude, longitude)
+  within GEOCODER_MAX_DISTANCE_KM is used, but only if it is clearly the
+  nearest: a point outside a town's centre that is about as close to
+  another town (a suburb between two towns, across a fjord) has no city,
+  rather than being assigned one of them by a few hundred metres.
+
+Functions:
+
+- reverse_geocode(lat, lon): the Place a coordinate is in, or None
+- canonical_city(name): the canonical spelling of a typed city name
+  ("tromso" -> "Tromsø"), or the name unchanged if unknown
+
+Both tables are loaded once per process and indexed by a grid of
+0.5° x 1° cells, so a lookup only looks at the towns or municipality
+outlines in the surrounding cells.
+"""
+
+import csv
+import json
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+from giveaways.services.entries import normalize_city
+
+PLACES_FILE = Path(__file__).resolve().parent / 'data' / 'places_no.csv'
+BOUNDARIES_FILE = Path(__file__).resolve().parent / 'data' / 'municipalities_no.geojson'
+# Feature properties holding the municipality name, in order of preference
+NAME_PROPERTIES = ('kommunenavn', 'navn', 'name')
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+CELL_LAT = 0.5
+CELL_LON = 1.0
+# Nearest-town fallback: within this distance a point is in the town; beyond
+# it, the runner-up must be this many times farther away
+TOWN_RADIUS_KM = 3.0
+AMBIGUITY_RATIO = 1.5
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    """A town from the bundled table, with the distance to the queried point."""
+    name: str
+    postal_code: str
+    latitude: float
+    longitude: float
+    distance_km: float = 0.0
+
+
+def _key(name: str) -> str:
+    """Fold a city name for lookups (case, accents, ø/æ, punctuation)."""
+    return normalize_city(name)
+
+
+def _cell(lat: float, lon: float):
+    return int(math.floor(lat / CELL_LAT)), int(math.floor(lon / CELL_LON))
+
+
+class _Table:
+    """Town coordinates in flat arrays plus a grid index over them."""
+
+    def __init__(self, path):
+        self.names, self.postal_codes = [], []
+        self.lats, self.lons = array('d'), array('d')
+        self.grid = {}
+        self.by_key = {}
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                index = len(self.names)
+                lat, lon = float(row['latitude']), float(row['longitude'])
+                self.names.append(row['name'])
+                self.postal_codes.append(row['postal_code'])
+                self.lats.append(lat)
+                self.lons.append(lon)
+                self.grid.setdefault(_cell(lat, lon), []).append(index)
+                self.by_key.setdefault(_key(row['name']), index)
+
+    def place(self, index, distance_km=0.0):
+        return Place(self.names[index], self.postal_codes[index], self.lats[index], self.lons[index], distance_km)
+
+    def nearest(self, lat, lon, max_km):
+        """
+        Return (index, km, runner-up km) for the nearest town within max_km,
+        or None. The runner-up distance is None if no other town is within
+        max_km.
+        """
+        row, col = _cell(lat, lon)
+        rows = math.ceil(max_km / (KM_PER_DEGREE * CELL_LAT))
+        cos_lat = max(math.cos(math.radians(min(abs(lat) + rows * CELL_LAT, 89.0))), 0.01)
+        cols = math.ceil(max_km / (KM_PER_DEGREE * CELL_LON * cos_lat))
+        best, best_km, second_km = None, max_km, None
+        for r in range(row - rows, row + rows + 1):
+            for c in range(col - cols, col + cols + 1):
+                for index in self.grid.get((r, c), ()):
+                    km = haversine_km(lat, lon, self.lats[index], self.lons[index])
+                    if km <= best_km:
+                        if best is not None:
+                            second_km = best_km
+                        best, best_km = index, km
+                    elif km <= max_km and (second_km is None or km < second_km):
+                        second_km = km
+        return None if best is None else (best, best_km, second_km)
+
+
+def _in_polygon(lon, lat, rings):
+    """Even-odd ray casting over a polygon's rings (outer ring and holes)."""
+    inside = False
+    for ring in rings:
+        x1, y1 = ring[-1][0], ring[-1][1]
+        for point in ring:
+            x2, y2 = point[0], point[1]
+            if (y2 > lat) != (y1 > lat) and lon < (x1 - x2) * (lat - y2) / (y1 - y2) + x2:
+                inside = not inside
+            x1, y1 = x2, y2
+    return inside
+
+
+class _Boundaries:
+    """Municipality outlines with bounding boxes, indexed by the cells they cover."""
+
+    def __init__(self, path):
+        self.names, self.polygons, self.boxes = [], [], []
+        self.grid = {}
+        self.by_key = {}
+        with open(path, encoding='utf-8') as f:
+            features = json.load(f)['features']
+        for feature in features:
+            properties = feature.get('properties') or {}
+            name = next((properties[key] for key in NAME_PROPERTIES if isinstance(properties.get(key), str)), None)
+            geometry = feature.get('geometry') or {}
+            if not name or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+                continue
+            polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+            points = [point for polygon in polygons for point in polygon[0]]
+            box = (
+                min(point[1] for point in points), min(point[0] for point in points),
+                max(point[1] for point in points), max(point[0] for point in points),
+            )
+            index = len(self.names)
+            self.names.append(name)
+            self.polygons.append(polygons)
+            self.boxes.append(box)
+            self.by_key.setdefault(_key(name), index)
+            (row0, col0), (row1, col1) = _cell(box[0], box[1]), _cell(box[2], box[3])
+            for r in range(row0, row1 + 1):
+                for c in range(col0, col1 + 1):
+                    self.grid.setdefault((r, c), []).append(index)
+
+    def place(self, index):
+        south, west, north, east = self.boxes[index]
+        return Place(self.names[index], '', (south + north) / 2, (west + east) / 2)
+
+    def containing(self, lat, lon):
+        """Index of the municipality containing the point, or None."""
+        for index in self.grid.get(_cell(lat, lon), ()):
+            south, west, north, east = self.boxes[index]
+            if south <= lat <= north and west <= lon <= east:
+                if any(_in_polygon(lon, lat, polygon) for polygon in self.polygons[index]):
+                    return index
+        return None
+
+
+_table = None
+_boundaries = {}
+_lock = threading.Lock()
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        with _lock:
+            if _table is None:
+                _table = _Table(PLACES_FILE)
+    return _table
+
+
+def _get_boundaries():
+    """Municipality boundaries from GEOCODER_BOUNDARIES_FILE, or None if not installed."""
+    path = Path(getattr(settings, 'GEOCODER_BOUNDARIES_FILE', '') or BOUNDARIES_FILE)
+    if path not in _boundaries:
+        with _lock:
+            if path not in _boundaries:
+                _boundaries[path] = _Boundaries(path) if path.is_file() else None
+    return _boundaries[path]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def reverse_geocode(latitude, longitude, max_distance_km=None) -> Optional[Place]:
+    """
+    Return the municipality, or failing boundaries the town, a coordinate is in.
+
+    Args:
+        latitude: Degrees north
+        longitude: Degrees east
+        max_distance_km: Nearest-town fallback: give up beyond this
+            distance (default GEOCODER_MAX_DISTANCE_KM)
+
+    Returns:
+        Place or None: None for invalid coordinates, outside every
+        municipality, or (without boundaries) if no town is close enough
+        or another town is about as close
+    """
+    try:
+        lat, lon = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or math.isnan(lat) or math.isnan(lon):
+        return None
+    boundaries = _get_boundaries()
+    if boundaries is not None:
+        index = boundaries.containing(lat, lon)
+        return None if index is None else boundaries.place(index)
+
+    max_km = max_distance_km or getattr(settings, 'GEOCODER_MAX_DISTANCE_KM', 60)
+    table = _get_table()
+    found = table.nearest(lat, lon, max_km)
+    if found is None:
+        return None
+    index, km, second_km = found
+    if km > TOWN_RADIUS_KM and second_km is not None and second_km < km * AMBIGUITY_RATIO:
+        return None
+    return table.place(index, km)
+
+
+def canonical_city(name: Optional[str]) -> str:
+    """Return the known spelling of a city or municipality name, or the name unchanged if unknown."""
+    if not name:
+        return ''
+    key = _key(name)
+    for table in (_get_boundaries(), _get_table()):
+        if table is not None and key in table.by_key:
+            return table.names[table.by_key[key]]
+    return name.strip()
@@ -0,0 +1,254 @@
+"""
+Image pipeline for uploaded pictures.
+
+Uploads are stored untouched; after the model is saved a Celery task
+renders resized WebP and JPEG variants into `<upload dir>/variants/`.
+Variants are:
+
+- rotated according to EXIF orientation and saved without any metadata
+  (EXIF, GPS, ICC), so camera and location data never reach the browser
+- named by a hash of their content, so they can be served with
+  far-future cache headers and never need invalidating
+- recorded in a JSONField next to the image field, together with the
+  original's name so a replaced image never shows stale variants
+
+The JSONField is written with a queryset update, which fires no
+post_save; variants_saved is sent instead so caches holding the old
+value (giveaway snapshots, feed cards) can be dropped.
+
+Templates render them with the `responsive_image` tag in
+utils/templatetags/image_tags.py, which falls back to the original
+until the variants exist.
+"""
+
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# model label -> (image field, variants field, target widths in px)
+IMAGE_FIELDS = {
+    'giveaways.Giveaway': ('image', 'image_variants', (320, 640, 960, 1280)),
+    'businesses.Business': ('logo', 'logo_variants', (64, 128, 256)),
+    'accounts.User': ('profile_image', 'profile_image_variants', (64, 128, 256)),
+    'accounts.MemberProfile': ('profile_image', 'profile_image_variants', (64, 128, 256)),
+}
+
+VARIANT_FORMATS = ('webp', 'jpeg')
+
+# Sent with sender=<model> and pks=<list> after variants are recorded
+variants_saved = Signal()
+
+
+def _flatten(image):
+    """Composite an RGBA image onto white for formats without alpha."""
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def _encode(image, fmt, quality):
+    buffer = BytesIO()
+    if fmt == 'jpeg':
+        image.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, format='WEBP', quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def build_variants(field_file, widths, quality=None):
+    """
+    Render resized, metadata-free variants of an image and store them.
+
+    Widths larger than the original are clamped to its width, so small
+    uploads are never upscaled.
+
+    Args:
+        field_file: The FieldFile to process
+        widths: Target widths in pixels
+        quality: Encoder quality (default IMAGE_VARIANT_QUALITY)
+
+    Returns:
+        dict: {'source', 'width', 'height', 'webp': [[width, name], ...],
+        'jpeg': [[width, name], ...]} with entries sorted by width
+
+    Raises:
+        PIL.UnidentifiedImageError: If the file is not an image
+    """
+    quality = quality or getattr(settings, 'IMAGE_VARIANT_QUALITY', 80)
+    storage = field_file.storage
+    variant_dir = posixpath.join(posixpath.dirname(field_file.name), 'variants')
+
+    field_file.open('rb')
+    try:
+        with Image.open(field_file) as original:
+            image = ImageOps.exif_transpose(original)
+            has_alpha = image.mode in ('RGBA', 'LA') or (
+                image.mode == 'P' and 'transparency' in image.info
+            )
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+    finally:
+        field_file.close()
+
+    source_width, source_height = image.size
+    variants = {
+        'source': field_file.name,
+        'width': source_width,
+        'height': source_height,
+    }
+    for fmt in VARIANT_FORMATS:
+        variants[fmt] = []
+
+    for width in sorted({min(w, source_width) for w in widths}):
+        height = max(1, round(source_height * width / source_width))
+        resized = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+        for fmt in VARIANT_FORMATS:
+            frame = _flatten(resized) if fmt == 'jpeg' and has_alpha else resized
+            data = _encode(frame, fmt, quality)
+            digest = hashlib.sha256(data).hexdigest()[:16]
+            ext = 'jpg' if fmt == 'jpeg' else fmt
+            name = posixpath.join(variant_dir, f'{digest}-{width}w.{ext}')
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(data))
+            variants[fmt].append([width, name])
+    return variants
+
+
+def generate_variants(model_label, pk):
+    """
+    Build variants for one object's image and record them.
+
+    The variants field is written with a queryset update guarded on the
+    image name, so it does not fire post_save again and cannot overwrite
+    the variants of an image that was replaced while this ran. Sends
+    variants_saved when a row was updated.
+
+    Returns:
+        dict: The stored variants, or None if there was nothing to do
+    """
+    field_name, variants_field, widths = IMAGE_FIELDS[model_label]
+    model = apps.get_model(model_label)
+    obj = model._default_manager.filter(pk=pk).first()
+    if obj is None:
+        return None
+    field_file = getattr(obj, field_name)
+    if not field_file or getattr(obj, variants_field).get('source') == field_file.name:
+        return None
+
+    variants = build_variants(field_file, widths)
+    if model._default_manager.filter(pk=pk, **{field_name: field_file.name}).update(
+        **{variants_field: variants}
+    ):
+        variants_saved.send(sender=model, pks=[pk])
+    logger.info(f"Built {len(variants['webp'])} image variants for {model_label} {pk}")
+    return variants
+
+
+def generate_shared_variants(model_label, pks):
+    """
+    Build variants for many objects, rendering each distinct image once.
+
+    Used after bulk imports where a series of objects shares one upload.
+    Objects whose variants are already current are skipped.
+
+    Returns:
+        int: Number of distinct images processed
+    """
+    field_name, variants_field, widths = IMAGE_FIELDS[model_label]
+    model = apps.get_model(model_label)
+    by_image = {}
+    for obj in model._default_manager.filter(pk__in=pks):
+        field_file = getattr(obj, field_name)
+        if field_file and getattr(obj, variants_field).get('source') != field_file.name:
+            by_image.setdefault(field_file.name, (field_file, []))[1].append(obj.pk)
+
+    updated = []
+    for name, (field_file, group) in by_image.items():
+        variants = build_variants(field_file, widths)
+        if model._default_manager.filter(pk__in=group, **{field_name: name}).update(
+            **{variants_field: variants}
+        ):
+            updated.extend(group)
+    if updated:
+        variants_saved.send(sender=model, pks=updated)
+    logger.info(f"Built image variants for {len(by_image)} images shared by {model_label} objects")
+    return len(by_image)
+
+
+def _schedule(task_name, func, args):
+    """
+    Run func(*args) after the current transaction commits, in Celery when
+    IMAGE_VARIANTS_ASYNC is on. If the broker cannot be reached the upload
+    still succeeds; pages keep serving the original.
+    """
+    def run():
+        if not getattr(settings, 'IMAGE_VARIANTS_ASYNC', True):
+            func(*args)
+            return
+        from . import tasks
+        try:
+            getattr(tasks, task_name).apply_async(args, retry=False)
+        except Exception as e:
+            logger.warning(f"Could not queue image variants for {args[0]}: {e}")
+
+    transaction.on_commit(run)
+
+
+def schedule_variants(model_label, pk):
+    """Queue variant generation for one object after the transaction commits."""
+    _schedule('process_image_variants', generate_variants, (model_label, pk))
+
+
+def schedule_shared_variants(model_label, pks):
+    """Queue variant generation for many objects after the transaction commits."""
+    _schedule('process_shared_image_variants', generate_shared_variants, (model_label, list(pks)))
+
+
+def _image_saved(sender, instance, **kwargs):
+    model_label = sender._meta.label
+    field_name, variants_field, _ = IMAGE_FIELDS[model_label]
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, variants_field) or {}
+    if field_file:
+        if variants.get('source') != field_file.name:
+            schedule_variants(model_label, instance.pk)
+    elif variants:
+        # Image was removed; forget its variants
+        sender._default_manager.filter(pk=instance.pk).update(**{variants_field: {}})
+
+
+def connect_signals():
+    """Connect the post_save handler for every model in IMAGE_FIELDS."""
+    for model_label in IMAGE_FIELDS:
+        post_save.connect(
+            _image_saved,
+            sender=apps.get_model(model_label),
+            dispatch_uid=f'utils.images.{model_label}',
+        )
+
+
+def variants_for(obj, field_name):
+    """
+    Return the recorded variants for obj.<field_name> if they are current.
+
+    Returns:
+        dict or None: The variants dict, or None if missing or stale
+    """
+    entry = IMAGE_FIELDS.get(obj._meta.label)
+    if not entry or entry[0] != field_name:
+        return None
+    field_file = getattr(obj, field_name)
+    variants = getattr(obj, entry[1], None) or {}
+    if not field_file or variants.get('source') != field_file.name:
+        return None
+    return variants
@@ -0,0 +1,217 @@
+"""
+Structured, non-blocking logging.
+
+Used by the LOGGING setting (config/settings.py):
+
+- JSONFormatter: one JSON object per line (timestamp, level, logger,
+  message, location, exception and any `extra` fields)
+- NonBlockingHandler: request threads only put records on a bounded
+  queue; a QueueListener thread formats and writes them with the real
+  handlers. When the queue is full records are dropped and counted rather
+  than blocking the request.
+- SamplingFilter: keeps a fraction of high-volume DEBUG/INFO records;
+  warnings and errors always pass
+- RedactEmailFilter: masks email addresses in messages (runs on the
+  listener thread when attached to the target handler)
+- lazy(): defers an expensive value until a record is actually emitted
+
+Hot paths should log with %-style arguments, not f-strings, so nothing
+is formatted for records below the configured level:
+
+    logger.debug("Normalized city %r -> %r", city, normalized)
+    logger.info("Stats: %s", lazy(build_stats, giveaway))
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueListener
+
+# Attributes every LogRecord has; anything else came in through `extra`
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+EMAIL_RE = re.compile(r'([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})')
+
+
+class lazy:
+    """
+    Value computed only when a log record is formatted.
+
+    Args:
+        func: Callable returning the value to log
+        *args, **kwargs: Passed to func
+    """
+    __slots__ = ('func', 'args', 'kwargs')
+
+    def __init__(self, func, *args, **kwargs):
+        self.func, self.args, self.kwargs = func, args, kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+    def __repr__(self):
+        return repr(self.func(*self.args, **self.kwargs))
+
+
+def redact_email(text):
+    """Mask email addresses: 'kari@example.com' -> 'k***@example.com'."""
+    return EMAIL_RE.sub(r'\1***@\2', str(text))
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record):
+        message = record.getMessage()
+        data = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': message,
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and not key.startswith('_'):
+                data[key] = value
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a random fraction of low-level records.
+
+    Args:
+        rate: Fraction (0..1) of records at or below max_level to keep
+        max_level: Records above this level are never dropped
+    """
+
+    def __init__(self, rate=1.0, max_level='INFO', name=''):
+        super().__init__(name)
+        self.rate = float(rate)
+        self.max_level = max_level if isinstance(max_level, int) else logging.getLevelName(max_level.upper())
+
+    def filter(self, record):
+        if record.levelno > self.max_level or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class RedactEmailFilter(logging.Filter):
+    """Mask email addresses in the rendered message."""
+
+    def filter(self, record):
+        message = record.getMessage()
+        if '@' in message:
+            record.msg, record.args = redact_email(message), None
+        return True
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room: the stdlib put_nowait() fails when the queue is full
+        self.queue.put(self._sentinel)
+
+
+def _handler_by_name(name):
+    # logging.getHandlerByName() is Python 3.12+; dictConfig registers names in _handlers
+    getter = getattr(logging, 'getHandlerByName', None)
+    return getter(name) if getter else logging._handlers.get(name)
+
+
+class NonBlockingHandler(logging.Handler):
+    """
+    Hand records to a background thread that writes them with other handlers.
+
+    Configure the target handlers by name in LOGGING (dictConfig sets up
+    handlers in name order, so targets must sort before this handler), e.g.
+
+        'queue': {'class': 'utils.logging.NonBlockingHandler', 'targets': ['console']}
+
+    The listener thread starts on the first record (and again in a forked
+    child, whose copy of the thread is gone) and stops at exit after
+    flushing the queue.
+
+    Args:
+        targets: Names of configured handlers that do the I/O
+        queue_size: Records buffered before new ones are dropped
+    """
+
+    def __init__(self, targets=(), queue_size=10000, level=logging.NOTSET):
+        super().__init__(level)
+        self.targets = list(targets)
+        # Hold the handlers now: dictConfig only keeps weak references to
+        # handlers that no logger uses directly
+        self._handlers = self._resolve()
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queue = None
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _resolve(self):
+        return [h for h in (_handler_by_name(name) for name in self.targets) if h is not None]
+
+    def _start(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            handlers = self._handlers or self._resolve()
+            self._queue = queue.Queue(self.queue_size)
+            self._listener = _Listener(self._queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.stop)
+
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        listener, self._listener, self._pid = self._listener, None, None
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+
+    def prepare(self, record):
+        """
+        Make a record safe to hand to another thread.
+
+        Arguments are merged into the message here (they may change or
+        hold request state), and the traceback is rendered; everything
+        else, such as JSON formatting, happens on the listener thread.
+        """
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,124 @@
+"""
+Management command to benchmark logging overhead per request.
+
+Simulates the log calls of one giveaway entry request (a handful of
+records with a few arguments each) and reports the time the request
+thread spends in logging, per request, for:
+
+- sync:        JSON to a file through a plain FileHandler (I/O on the
+               request thread), messages built with f-strings
+- queued:      the same handler behind utils.logging.NonBlockingHandler
+- queued+lazy: queued, with the %-style DEBUG/INFO calls the views now make
+- sampled:     queued, keeping 10% of INFO records (see LOG_INFO_SAMPLE_RATE)
+- disabled:    records below the logger level, f-string vs %-style
+
+Writing to a local file is fast, so there queuing mostly adds a thread
+hand-off; --sink-delay adds a sleep per record to model a slow or
+backed-up sink (a full stdout pipe to a log shipper), which is what the
+queue protects requests from. Loggers and files are private to the
+command; the LOGGING setting is not used or changed.
+"""
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from utils.logging import JSONFormatter, NonBlockingHandler, RedactEmailFilter, SamplingFilter
+
+CITY = 'Tromsø'
+EMAIL = 'kari.nordmann@example.com'
+
+
+def fstring_request(logger, giveaway_id):
+    logger.info(f"Using city {CITY} for user {EMAIL}")
+    logger.info(f"Comparing user city '{CITY}' ({CITY.lower()}) with business city '{CITY}' ({CITY.lower()})")
+    logger.info(f"Approved position: {CITY} matches {CITY}")
+    logger.info(f"Entry approved for city: {CITY}")
+    logger.info(f"Bruker {EMAIL} meldte seg på giveaway {giveaway_id} fra {CITY}.")
+
+
+def lazy_request(logger, giveaway_id):
+    logger.debug("Using city %s for user %s", CITY, 42)
+    logger.debug("Comparing user city %r (%s) with business city %r (%s)", CITY, CITY.lower(), CITY, CITY.lower())
+    logger.debug("Approved position: %s matches %s", CITY, CITY)
+    logger.debug("Entry approved for city: %s", CITY)
+    logger.info("Bruker %s meldte seg på giveaway %s fra %s.", 42, giveaway_id, CITY)
+
+
+class SlowFileHandler(logging.FileHandler):
+    """FileHandler that waits `delay` seconds per record, like a backed-up pipe."""
+
+    def __init__(self, filename, delay):
+        super().__init__(filename, encoding='utf-8')
+        self.sink_delay = delay
+
+    def emit(self, record):
+        if self.sink_delay:
+            time.sleep(self.sink_delay)
+        super().emit(record)
+
+
+class Command(BaseCommand):
+    help = 'Measures time spent in logging per simulated entry request.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000, help='Simulated requests per scenario')
+        parser.add_argument('--sink-delay', type=float, default=0.0, help='Milliseconds the sink blocks per record')
+        parser.add_argument('--sample-rate', type=float, default=0.1, help='INFO sample rate for the sampled run')
+
+    def handle(self, *args, **options):
+        n = options['requests']
+        with tempfile.TemporaryDirectory() as tmp:
+            file_handler = SlowFileHandler(Path(tmp) / 'bench.log', options['sink_delay'] / 1000)
+            file_handler.setFormatter(JSONFormatter())
+            file_handler.addFilter(RedactEmailFilter())
+            file_handler.set_name('benchmark-logging-file')
+            try:
+                runs = [
+                    ('sync', self._logger('sync', logging.INFO, file_handler), fstring_request),
+                    ('queued', self._logger('queued', logging.INFO, self._queued()), fstring_request),
+                    ('queued+lazy', self._logger('lazy', logging.INFO, self._queued()), lazy_request),
+                    ('sampled', self._logger('sampled', logging.INFO, self._queued(options['sample_rate'])), fstring_request),
+                    ('disabled f-string', self._logger('off-f', logging.WARNING, file_handler), fstring_request),
+                    ('disabled %-style', self._logger('off-lazy', logging.WARNING, file_handler), lazy_request),
+                ]
+                for label, logger, request in runs:
+                    timings = self._run(logger, request, n)
+                    self.stdout.write(
+                        f'{label:<18} mean {statistics.fmean(timings):>8.2f} µs/request   '
+                        f'p99 {self._p99(timings):>8.2f} µs   max {max(timings):>9.2f} µs'
+                    )
+                    for handler in logger.handlers:
+                        if isinstance(handler, NonBlockingHandler):
+                            handler.stop()
+                            if handler.dropped:
+                                self.stdout.write(f'{"":<18} {handler.dropped} records dropped (queue full)')
+            finally:
+                file_handler.close()
+
+    def _queued(self, sample_rate=None):
+        handler = NonBlockingHandler(targets=['benchmark-logging-file'])
+        if sample_rate is not None:
+            handler.addFilter(SamplingFilter(sample_rate))
+        return handler
+
+    def _logger(self, name, level, handler):
+        logger = logging.getLogger(f'benchmark.logging.{name}')
+        logger.handlers[:] = [handler]
+        logger.setLevel(level)
+        logger.propagate = False
+        return logger
+
+    def _run(self, logger, request, n):
+        timings = []
+        for i in range(n):
+            started = time.perf_counter()
+            request(logger, i)
+            timings.append((time.perf_counter() - started) * 1e6)
+        return timings
+
+    def _p99(self, timings):
+        return statistics.quantiles(timings, n=100)[98]
@@ -0,0 +1,133 @@
+"""
+Management command to benchmark SQLite reads during write bursts.
+
+Runs the same concurrent workload twice against a scratch database file,
+once with SQLite's defaults (rollback journal) and once with the tuning
+from utils.db.sqlite_pragmas(). Writer threads insert entries in bursts
+of small transactions while reader threads run a query shaped like the
+giveaway list, and the command reports read latency percentiles and
+write throughput. The project database is never touched.
+"""
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from utils.db import sqlite_pragmas
+
+SCHEMA = """
+CREATE TABLE giveaway (id INTEGER PRIMARY KEY, title TEXT, is_active INTEGER, end_date REAL);
+CREATE TABLE entry (id INTEGER PRIMARY KEY, giveaway_id INTEGER, user_id INTEGER, answer TEXT, entered_at REAL);
+CREATE INDEX entry_giveaway ON entry (giveaway_id);
+"""
+
+LIST_QUERY = """
+SELECT g.id, g.title, COUNT(e.id) FROM giveaway g
+LEFT JOIN entry e ON e.giveaway_id = g.id
+WHERE g.is_active = 1 AND g.end_date >= ?
+GROUP BY g.id ORDER BY g.end_date, g.id LIMIT 12
+"""
+
+
+class Command(BaseCommand):
+    help = 'Compares SQLite read latency during write bursts with default vs tuned settings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per run')
+        parser.add_argument('--writers', type=int, default=4, help='Concurrent writer threads')
+        parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads')
+        parser.add_argument('--burst', type=int, default=50, help='Rows written per transaction')
+
+    def handle(self, *args, **options):
+        for label, pragmas in (('default', ['PRAGMA busy_timeout=5000']), ('tuned', sqlite_pragmas())):
+            with tempfile.TemporaryDirectory() as tmp:
+                result = self._run(Path(tmp) / 'bench.sqlite3', pragmas, options)
+            self.stdout.write(
+                f'{label:<8} reads/s {result["reads"]:>8.0f}   '
+                f'read p50 {result["p50"]:>7.2f} ms   p95 {result["p95"]:>7.2f} ms   '
+                f'max {result["max"]:>8.2f} ms   writes/s {result["writes"]:>8.0f}   '
+                f'lock errors {result["errors"]}'
+            )
+
+    def _connect(self, path, pragmas):
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        for pragma in pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def _run(self, path, pragmas, options):
+        setup = self._connect(path, pragmas)
+        setup.executescript(SCHEMA)
+        now = time.time()
+        setup.executemany(
+            'INSERT INTO giveaway (title, is_active, end_date) VALUES (?, 1, ?)',
+            [(f'Giveaway {i}', now + 86400 + i) for i in range(200)],
+        )
+        setup.close()
+
+        stop = threading.Event()
+        latencies, written, errors = [], [0], [0]
+        lock = threading.Lock()
+
+        def writer():
+            conn = self._connect(path, pragmas)
+            while not stop.is_set():
+                rows = [
+                    (random.randint(1, 200), random.randint(1, 10**6), 'Ja', time.time())
+                    for _ in range(options['burst'])
+                ]
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.executemany(
+                        'INSERT INTO entry (giveaway_id, user_id, answer, entered_at) VALUES (?, ?, ?, ?)', rows
+                    )
+                    conn.execute('COMMIT')
+                    with lock:
+                        written[0] += len(rows)
+                except sqlite3.OperationalError:
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    with lock:
+                        errors[0] += 1
+            conn.close()
+
+        def reader():
+            conn = self._connect(path, pragmas)
+            local = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    conn.execute(LIST_QUERY, (time.time(),)).fetchall()
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+                    continue
+                local.append((time.perf_counter() - start) * 1000)
+            conn.close()
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=writer) for _ in range(options['writers'])]
+        threads += [threading.Thread(target=reader) for _ in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        count = len(latencies) or 1
+        return {
+            'reads': len(latencies) / options['duration'],
+            'p50': statistics.median(latencies) if latencies else 0.0,
+            'p95': latencies[int(count * 0.95) - 1] if latencies else 0.0,
+            'max': latencies[-1] if latencies else 0.0,
+            'writes': written[0] / options['duration'],
+            'errors': errors[0],
+        }
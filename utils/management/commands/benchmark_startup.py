@@ -0,0 +1,83 @@
+"""
+Management command to benchmark cold-start time of web and worker processes.
+
+Starts fresh Python processes with `-X importtime` and reports, per
+process type, the wall time to become ready and the slowest top-level
+imports:
+
+- web:    django.setup(), the WSGI application and the URLconf (which
+          imports every view module), as a WSGI server worker does
+          before its first request; template warm-up is left out
+- worker: django.setup() and Celery's task autodiscovery, as
+          `celery -A config worker` does before consuming
+
+Each scenario runs --repeat times and the fastest run is reported, so a
+cold filesystem cache on the first run does not skew the result.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCENARIOS = {
+    'web': (
+        'import django; django.setup()\n'
+        'from config.wsgi import application\n'
+        'from django.urls import get_resolver; get_resolver().url_patterns\n'
+    ),
+    'worker': (
+        'import django; django.setup()\n'
+        'from config.celery import app\n'
+        'app.loader.import_default_modules()\n'
+    ),
+}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(stderr):
+    """Return {module: cumulative µs} for modules imported at the top level."""
+    top = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top[match.group(4)] = int(match.group(2))
+    return top
+
+
+class Command(BaseCommand):
+    help = 'Measures web and Celery worker cold-start time with python -X importtime.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario (fastest is reported)')
+        parser.add_argument('--top', type=int, default=8, help='Slowest top-level imports to list')
+        parser.add_argument('--only', choices=list(SCENARIOS), help='Run one scenario (default: all)')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'),
+               'TEMPLATE_WARMUP': 'False', 'PYTHONDONTWRITEBYTECODE': '1'}
+        for name in [options['only']] if options['only'] else SCENARIOS:
+            best = None
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                process = subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', SCENARIOS[name]],
+                    cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+                )
+                elapsed = time.perf_counter() - started
+                if process.returncode:
+                    self.stderr.write(process.stderr[-2000:])
+                    raise SystemExit(process.returncode)
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, parse_importtime(process.stderr))
+            elapsed, imports = best
+            self.stdout.write(
+                f'{name:<7} ready in {elapsed * 1000:>7.0f} ms   '
+                f'imports {sum(imports.values()) / 1000:>7.0f} ms ({len(imports)} top-level modules)'
+            )
+            for module, micros in sorted(imports.items(), key=lambda item: -item[1])[:options['top']]:
+                self.stdout.write(f'        {micros / 1000:>8.1f} ms  {module}')
@@ -0,0 +1,133 @@
+"""
+Management command to benchmark template rendering.
+
+Renders the giveaway list page (giveaways/giveaway_list.html with base.html
+and its partials) for 12 and 100 cards with:
+
+- uncached: filesystem/app loaders only, so every render reads and
+            compiles each template again (Django's DEBUG behaviour
+            before the cached loader)
+- cached:   the cached loader after warm-up (TEMPLATE_CACHE and
+            TEMPLATE_WARMUP in production)
+
+and then times per-row partials on the business dashboard pattern:
+{% include ... with row=... %} in a loop vs the giveaway_tags inclusion
+tags. Rows and giveaways are unsaved in-memory objects, so no database
+queries are involved.
+"""
+import statistics
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.utils import timezone
+
+from businesses.models import Business
+from giveaways.models import Giveaway
+
+LIST_TEMPLATE = 'giveaways/giveaway_list.html'
+
+INCLUDE_ROWS = (
+    '{% for giveaway in rows %}'
+    '{% include "includes/giveaway_row.html" with row=giveaway %}'
+    '{% include "includes/giveaway_row_card.html" with row=giveaway %}'
+    '{% endfor %}'
+)
+TAG_ROWS = (
+    '{% load giveaway_tags %}{% for giveaway in rows %}'
+    '{% giveaway_row giveaway %}{% giveaway_row_card giveaway %}'
+    '{% endfor %}'
+)
+
+
+def make_backend(cached):
+    config = settings.TEMPLATES[0]
+    loaders = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    if cached:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    options = {**config['OPTIONS'], 'loaders': loaders}
+    return DjangoTemplates({
+        'NAME': f'benchmark-{"cached" if cached else "uncached"}',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': options,
+    })
+
+
+def make_giveaways(count):
+    end = timezone.now() + timedelta(days=7)
+    giveaways = []
+    for i in range(1, count + 1):
+        business = Business(pk=i, name=f'Bedrift {i}', city='Oslo', postal_code='0150')
+        giveaway = Giveaway(
+            pk=i,
+            title=f'Gavekort nr. {i}',
+            description='Vinn et gavekort på 500 kroner til bruk i butikken vår. ' * 3,
+            end_date=end,
+            prize_value=500,
+        )
+        giveaway.business = business
+        giveaways.append(giveaway)
+    return giveaways
+
+
+def make_rows(count):
+    now = timezone.now()
+    rows = []
+    for i in range(1, count + 1):
+        active = i % 3 != 0
+        # Ended rows have winners
+        rows.append(SimpleNamespace(pk=i, title=f'Gavekort nr. {i}', created_at=now, is_active=active,
+                                    entries={'count': i * 7}, has_winner=not active))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Compares giveaway list render times with and without the cached template loader.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Renders per measurement')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        request = RequestFactory().get('/giveaways/')
+        request.user = AnonymousUser()
+
+        backends = {'uncached': make_backend(cached=False), 'cached': make_backend(cached=True)}
+        for count in (12, 100):
+            context = {'giveaways': make_giveaways(count), 'is_paginated': False}
+            for label, backend in backends.items():
+                template = backend.get_template(LIST_TEMPLATE)
+                timings = self._time(lambda: template.render(context, request), iterations)
+                self._report(f'list {count:>3} cards  {label}', timings)
+
+        backend = backends['cached']
+        for count in (12, 100):
+            context = {'rows': make_rows(count)}
+            for label, source in (('include', INCLUDE_ROWS), ('inclusion tag', TAG_ROWS)):
+                template = backend.from_string(source)
+                timings = self._time(lambda: template.render(context), iterations)
+                self._report(f'rows {count:>3}  {label}', timings)
+
+    def _time(self, render, iterations):
+        render()  # first render compiles templates for the cached loader
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        self.stdout.write(
+            f'{label:<28} mean {statistics.fmean(timings):>7.2f} ms   '
+            f'min {min(timings):>7.2f} ms   max {max(timings):>7.2f} ms'
+        )
@@ -0,0 +1,39 @@
+"""
+Management command to build responsive image variants for existing uploads.
+
+New uploads are processed automatically after save; run this once after
+deploying the image pipeline, or after changing the widths in
+utils.images.IMAGE_FIELDS (with --force).
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from utils.images import IMAGE_FIELDS, generate_variants
+
+
+class Command(BaseCommand):
+    help = 'Builds WebP/JPEG variants for uploaded images that do not have current ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild variants even when they are current',
+        )
+
+    def handle(self, *args, **options):
+        for model_label, (field_name, variants_field, _) in IMAGE_FIELDS.items():
+            model = apps.get_model(model_label)
+            queryset = model._default_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            if options['force']:
+                queryset.update(**{variants_field: {}})
+
+            built = failed = 0
+            for pk in queryset.values_list('pk', flat=True).iterator():
+                try:
+                    if generate_variants(model_label, pk):
+                        built += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(self.style.WARNING(f'{model_label} {pk}: {e}'))
+            self.stdout.write(self.style.SUCCESS(f'{model_label}: built {built}, failed {failed}'))
@@ -0,0 +1,31 @@
+"""
+Management command to download anime.js into static/vendor/.
+
+After running it, commit the file and set ANIMEJS_LOCAL=True so templates
+load the local, fingerprinted copy instead of the CDN.
+"""
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.templatetags.static_tags import ANIMEJS_CDN_URL, ANIMEJS_STATIC_PATH
+
+
+class Command(BaseCommand):
+    help = 'Downloads anime.js into the first STATICFILES_DIRS entry for local serving.'
+
+    def handle(self, *args, **options):
+        target = Path(settings.STATICFILES_DIRS[0]) / ANIMEJS_STATIC_PATH
+        try:
+            with urlopen(ANIMEJS_CDN_URL, timeout=30) as response:
+                data = response.read()
+        except OSError as e:
+            raise CommandError(f'Could not download {ANIMEJS_CDN_URL}: {e}')
+        if b'anime' not in data[:2048]:
+            raise CommandError('Downloaded file does not look like anime.js')
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        self.stdout.write(self.style.SUCCESS(f'Saved {len(data)} bytes to {target}'))
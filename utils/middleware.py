@@ -0,0 +1,103 @@
+"""
+Project middleware.
+
+ReplicaRoutingMiddleware: enables replica reads for views marked with
+utils.routers.ReplicaReadMixin / replica_read and keeps users on the
+primary for a few seconds after they write (see utils/routers.py).
+
+RateLimitMiddleware: rejects requests over the RATELIMITS of views
+marked with a rate limit scope (see utils/ratelimit.py).
+"""
+
+from django.conf import settings
+
+from . import ratelimit
+from .routers import replica_aliases, replica_reads
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route reads of opted-in views to replicas, with read-your-writes stickiness.
+
+    The replica context is entered in process_view and left when the
+    response (including template rendering) is complete.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @property
+    def cookie_name(self):
+        return getattr(settings, 'REPLICA_STICKY_COOKIE', 'use_primary')
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            context = getattr(request, '_replica_context', None)
+            if context is not None:
+                context.__exit__(None, None, None)
+
+        if (
+            replica_aliases()
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                self.cookie_name,
+                '1',
+                max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 15),
+                httponly=True,
+                samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        opted_in = getattr(view_class or view_func, 'use_read_replica', False)
+        if (
+            opted_in
+            and replica_aliases()
+            and request.method in SAFE_METHODS
+            and self.cookie_name not in request.COOKIES
+        ):
+            request._replica_context = replica_reads()
+            request._replica_context.__enter__()
+        return None
+
+
+class RateLimitMiddleware:
+    """
+    Enforce rate limits before the view runs.
+
+    Views name their scope with utils.ratelimit.ratelimit (function views)
+    or a `ratelimit_scope` attribute (class-based views). Nothing here
+    touches the session, the user or the database, so keep this before
+    middleware that does. On the way out it sets or deletes the signed
+    user id cookie after a login or logout (see ratelimit.client_key()).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        ratelimit.update_user_cookie(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, 'RATELIMIT_ENABLED', True):
+            return None
+        view_class = getattr(view_func, 'view_class', None)
+        scope = getattr(view_class or view_func, 'ratelimit_scope', None)
+        rules = ratelimit.rules_for(scope) if scope else None
+        if not rules:
+            return None
+        wait = ratelimit.check(request, scope, rules)
+        if wait:
+            ratelimit.logger.info("Rate limited %s for scope %s", ratelimit.client_ip(request), scope)
+            return ratelimit.rejected_response(request, wait)
+        return None
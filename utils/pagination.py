@@ -0,0 +1,463 @@
+"""
+Keyset (cursor) pagination for large querysets.
+
+Django's default Paginator uses OFFSET/LIMIT and runs a COUNT(*) for every
+page, so deep pages get slower the further you go. The KeysetPaginator in
+this module instead remembers the sort key of the last row on a page and
+asks the database for rows "after" that key, which lets an index on the
+sort fields serve every page in constant time.
+
+Main components:
+- KeysetPaginator: Paginates an ordered queryset using opaque cursors
+- KeysetPage: A single page with next/previous cursors
+- KeysetPaginationMixin: Drop-in replacement for ListView pagination
+- ApproximateCountPaginator: OFFSET paginator with estimated totals (admin)
+- cached_count: Short-lived cached COUNT used for approximate totals
+- estimated_count: Planner estimate on PostgreSQL, cached count elsewhere
+"""
+
+import base64
+import datetime
+import hashlib
+import json
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.http import Http404
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+
+logger = logging.getLogger(__name__)
+
+CURSOR_VAR = 'cursor'
+
+_NEXT = 'n'
+_PREVIOUS = 'p'
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor cannot be decoded or does not match the ordering."""
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps full microsecond precision on datetimes.
+
+    DjangoJSONEncoder truncates to milliseconds, which would make the
+    equality part of the seek condition miss rows that share a timestamp.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def cached_count(queryset: QuerySet, timeout: Optional[int] = None) -> int:
+    """
+    Return the number of rows in a queryset, cached for a short time.
+
+    The count is keyed on the generated SQL so that different filters get
+    their own entry. Used where an approximate total is good enough, e.g.
+    "about 12 000 giveaways" above a list.
+
+    Args:
+        queryset: The queryset to count
+        timeout: Cache timeout in seconds (defaults to KEYSET_COUNT_CACHE_TIMEOUT)
+
+    Returns:
+        int: The (possibly slightly stale) number of rows
+    """
+    queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    digest = hashlib.md5(f"{sql}|{params!r}".encode('utf-8')).hexdigest()
+    key = f"pagination:count:{digest}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        if timeout is None:
+            timeout = getattr(settings, 'KEYSET_COUNT_CACHE_TIMEOUT', 60)
+        cache.set(key, count, timeout)
+    return count
+
+
+def _planner_estimate(queryset: QuerySet) -> Optional[int]:
+    """
+    Ask the PostgreSQL planner how many rows a queryset will return.
+
+    Uses QuerySet.explain() so the estimate reflects the current filters.
+    Returns None on other databases or if the plan cannot be read.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        logger.warning("Could not read planner estimate: %s", e)
+        return None
+
+
+def estimated_count(queryset: QuerySet, threshold: Optional[int] = None) -> int:
+    """
+    Return a cheap row count for a queryset.
+
+    On PostgreSQL the planner estimate is used when it is at or above the
+    threshold; smaller results are counted exactly since that is cheap.
+    Other databases have no usable estimate, so the count is cached
+    instead (see cached_count).
+
+    Args:
+        queryset: The queryset to count
+        threshold: Rows above which an estimate is acceptable
+            (defaults to COUNT_ESTIMATE_THRESHOLD)
+
+    Returns:
+        int: An exact, cached or estimated number of rows
+    """
+    if threshold is None:
+        threshold = getattr(settings, 'COUNT_ESTIMATE_THRESHOLD', 10000)
+    estimate = _planner_estimate(queryset)
+    if estimate is None:
+        return cached_count(queryset)
+    if estimate >= threshold:
+        return estimate
+    return queryset.count()
+
+
+def _resolve_field(model, path: str):
+    """
+    Resolve a (possibly related) lookup path like 'user__email' to a model field.
+
+    Returns:
+        The model field, or None if the path is an annotation or unknown
+    """
+    opts = model._meta
+    field = None
+    for part in path.split('__'):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if field.is_relation and field.related_model is not None:
+            opts = field.related_model._meta
+    return field
+
+
+class KeysetPage:
+    """
+    A single page of results from a KeysetPaginator.
+
+    Mirrors the parts of django.core.paginator.Page that templates use
+    (object_list, has_next, has_previous, has_other_pages), but exposes
+    opaque cursors instead of page numbers.
+    """
+
+    def __init__(self, object_list: List[Any], paginator: 'KeysetPaginator',
+                 has_next: bool, has_previous: bool):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self) -> str:
+        return f"<KeysetPage of {len(self.object_list)} items>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @cached_property
+    def next_cursor(self) -> Optional[str]:
+        """Cursor pointing at the page after this one, or None on the last page."""
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], _NEXT)
+
+    @cached_property
+    def previous_cursor(self) -> Optional[str]:
+        """Cursor pointing at the page before this one, or None on the first page."""
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], _PREVIOUS)
+
+
+class KeysetPaginator:
+    """
+    Paginate an ordered queryset using keyset (seek) pagination.
+
+    The ordering must end in a unique column so every row has a distinct
+    sort key; if it does not, the primary key is appended as a tiebreaker
+    in the same direction as the first field. Ordering fields must be
+    non-nullable model fields, related lookups (e.g. 'user__email') or
+    annotations on the queryset.
+
+    Example:
+        paginator = KeysetPaginator(Giveaway.objects.all(), 12, ordering=['end_date'])
+        page = paginator.page(request.GET.get('cursor'))
+
+    Attributes:
+        queryset: The queryset to paginate
+        per_page: Number of rows per page
+        ordering: Normalized ordering, always ending in a unique field
+        approximate_count: If True, `count` is served from a short-lived cache
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int,
+                 ordering: Optional[Sequence[str]] = None,
+                 approximate_count: bool = False):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.approximate_count = approximate_count
+        self.model = queryset.model
+        self.ordering = self._normalize_ordering(
+            ordering or queryset.query.order_by or self.model._meta.ordering
+        )
+
+    def _normalize_ordering(self, ordering: Sequence[Any]) -> Tuple[str, ...]:
+        """
+        Validate the ordering and append a unique tiebreaker if needed.
+
+        Raises:
+            ValueError: If the ordering contains expressions, random ordering
+                or a bare foreign key (which sorts by the related model's ordering)
+        """
+        pk_name = self.model._meta.pk.name
+        normalized = []
+        unique = False
+        for part in ordering:
+            if not isinstance(part, str) or part.lstrip('-') in ('', '?'):
+                raise ValueError(f"Unsupported keyset ordering: {part!r}")
+            descending = part.startswith('-')
+            name = part.lstrip('-')
+            if name == 'pk':
+                name = pk_name
+            field = _resolve_field(self.model, name)
+            if field is not None and field.is_relation and '__' not in name and name == field.name:
+                raise ValueError(f"Keyset ordering on relation '{name}' is ambiguous; use '{name}_id'")
+            normalized.append(f"-{name}" if descending else name)
+            if field is not None and '__' not in name and (field.primary_key or field.unique):
+                unique = True
+                break
+
+        if not normalized:
+            normalized.append(pk_name)
+        elif not unique:
+            prefix = '-' if normalized[0].startswith('-') else ''
+            normalized.append(f"{prefix}{pk_name}")
+        return tuple(normalized)
+
+    @cached_property
+    def count(self) -> int:
+        """
+        Total number of rows.
+
+        Only evaluated when a template or caller asks for it. With
+        approximate_count enabled the value is a planner estimate or a
+        count up to KEYSET_COUNT_CACHE_TIMEOUT seconds old.
+        """
+        if self.approximate_count:
+            return estimated_count(self.queryset)
+        return self.queryset.count()
+
+    def _row_values(self, obj) -> List[Any]:
+        values = []
+        for part in self.ordering:
+            value = obj
+            for attr in part.lstrip('-').split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        """Build an opaque, URL-safe cursor from a row's sort key."""
+        payload = json.dumps(
+            {'d': direction, 'v': self._row_values(obj)},
+            cls=_CursorEncoder,
+            separators=(',', ':'),
+        )
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, List[Any]]:
+        """
+        Decode a cursor back into a direction and typed sort key values.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or does not fit the ordering
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            direction = payload['d']
+            raw_values = payload['v']
+        except (ValueError, TypeError, KeyError, UnicodeError) as e:
+            raise InvalidCursor(f"Malformed cursor: {e}")
+
+        if direction not in (_NEXT, _PREVIOUS) or not isinstance(raw_values, list) \
+                or len(raw_values) != len(self.ordering):
+            raise InvalidCursor("Cursor does not match the current ordering")
+
+        values = []
+        for part, raw in zip(self.ordering, raw_values):
+            field = _resolve_field(self.model, part.lstrip('-'))
+            if field is None:
+                values.append(raw)
+                continue
+            if field.is_relation:
+                field = field.target_field
+            try:
+                values.append(field.to_python(raw))
+            except ValidationError as e:
+                raise InvalidCursor(f"Invalid cursor value for {part}: {e}")
+        return direction, values
+
+    def _seek_filter(self, values: Sequence[Any], backwards: bool) -> Q:
+        """
+        Build the "rows after this key" condition.
+
+        For ordering (a, b, pk) this expands to
+        a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND pk > vpk),
+        flipping comparisons for descending fields and for backwards seeks.
+        """
+        condition = Q()
+        equal_prefix = {}
+        for part, value in zip(self.ordering, values):
+            name = part.lstrip('-')
+            descending = part.startswith('-')
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= Q(**equal_prefix, **{f"{name}__{lookup}": value})
+            equal_prefix[name] = value
+        return condition
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the page identified by a cursor (or the first page).
+
+        Fetches per_page + 1 rows so it can tell whether another page
+        exists without running a COUNT.
+
+        Args:
+            cursor: A cursor from KeysetPage.next_cursor/previous_cursor
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        if not cursor:
+            rows = list(self.queryset.order_by(*self.ordering)[:self.per_page + 1])
+            return KeysetPage(rows[:self.per_page], self,
+                              has_next=len(rows) > self.per_page, has_previous=False)
+
+        direction, values = self.decode_cursor(cursor)
+        backwards = direction == _PREVIOUS
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(p[1:] if p.startswith('-') else f"-{p}" for p in ordering)
+
+        queryset = self.queryset.filter(self._seek_filter(values, backwards)).order_by(*ordering)
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=True)
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    OFFSET paginator whose total comes from estimated_count().
+
+    Intended for admin changelists on large tables, where an exact COUNT on
+    every request is the most expensive query on the page. Because the total
+    may be slightly off, page numbers beyond the estimate are still served
+    (as a possibly empty page) instead of raising EmptyPage.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            return estimated_count(self.object_list)
+        return len(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        return self._get_page(self.object_list[bottom:top], number, self)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that replaces OFFSET pagination with keyset pagination.
+
+    Set `paginate_by` as usual and either `keyset_ordering` or override
+    get_keyset_ordering(). The page is selected with the `cursor` GET
+    parameter, and the template receives `page_obj.next_cursor`,
+    `page_obj.previous_cursor` and `cursor_query` (the current query
+    string without the cursor) for building links.
+    """
+    cursor_kwarg = CURSOR_VAR
+    keyset_ordering = None
+    approximate_count = True
+
+    def get_keyset_ordering(self) -> Optional[Sequence[str]]:
+        """Return the ordering used for the keyset; defaults to the queryset's ordering."""
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_keyset_ordering(),
+            approximate_count=self.approximate_count,
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as e:
+            logger.warning("Ugyldig pagineringsmarkør: %s", e)
+            raise Http404(_("Ugyldig side."))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        context['cursor_query'] = query.urlencode()
+        return context
@@ -0,0 +1,275 @@
+"""
+Fixed-window rate limiting for abuse-prone endpoints.
+
+Views opt in by naming a scope, and the limits for each scope are set in
+the RATELIMITS setting:
+
+    @ratelimit('location')
+    def update_location(request): ...
+
+    class GiveawayDetailView(DetailView):
+        ratelimit_scope = 'giveaway-entry'
+
+    RATELIMITS = {
+        'giveaway-entry': {'methods': ['POST'], 'user': '10/m', 'ip': '30/m'},
+    }
+
+Each rule key picks what a counter is kept per:
+
+- ip:       the client address (REMOTE_ADDR, or from RATELIMIT_IP_HEADER
+            behind RATELIMIT_TRUSTED_PROXIES proxies, see client_ip())
+- user:     the signed user id in the USER_COOKIE cookie, set at login
+            (remember_login()) and checked by its signature, so users are
+            told apart without loading the session or the user. All
+            sessions of an account share one counter. A request without a
+            valid cookie (anonymous, logged in before the cookie existed,
+            or a client that drops it) skips the rule, and only the ip
+            rule applies to it.
+- username: the submitted 'email'/'username' form field, for login
+            endpoints
+
+A rate 'N/period' (period s, m, h or d, optionally with a count such as
+'20/10s') allows N requests per window of that length; windows start at
+multiples of the period. RateLimitMiddleware checks the counters in
+process_view, before the view, the session or the user are touched, so a
+rejected request costs a few cache operations and no database query. It
+answers 429 with Retry-After (the end of the window).
+
+Counters live in the default cache and are updated with cache.add() and
+cache.incr(), which are atomic on Redis and memcached, so concurrent
+requests from several workers are all counted. If the cache fails,
+counters are kept in process memory (bounded, least recently used
+dropped) until it recovers.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ratelimit:'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+RATE_RE = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\s*$')
+LOCAL_MAX_KEYS = 10000
+
+USER_COOKIE = 'rl_uid'
+USER_COOKIE_SALT = 'utils.ratelimit.user'
+
+REJECT_MESSAGE = "For mange forespørsler. Vent litt og prøv igjen."
+
+
+@dataclass(frozen=True)
+class Rate:
+    """At most `capacity` requests per window of `period` seconds."""
+    capacity: int
+    period: float
+
+
+@lru_cache(maxsize=64)
+def parse_rate(rate):
+    """
+    Parse '10/m', '100/h' or '20/10s' into a Rate.
+
+    Raises:
+        ValueError: For malformed rates
+    """
+    match = RATE_RE.match(rate or '')
+    if not match:
+        raise ValueError(f"Invalid rate {rate!r}, expected e.g. '10/m'")
+    count, multiplier, unit = match.groups()
+    return Rate(int(count), int(multiplier or 1) * PERIODS[unit])
+
+
+def _window(rate, now):
+    """Index of the window containing now, and seconds until it ends."""
+    window = int(now // rate.period)
+    return window, (window + 1) * rate.period - now
+
+
+class _LocalCounters:
+    """In-process counter store used while the cache is unavailable."""
+
+    def __init__(self, max_keys=LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        self.counters = OrderedDict()
+        self.lock = threading.Lock()
+
+    def incr(self, key):
+        with self.lock:
+            count = self.counters.pop(key, 0) + 1
+            self.counters[key] = count
+            while len(self.counters) > self.max_keys:
+                self.counters.popitem(last=False)
+            return count
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+
+
+_local = _LocalCounters()
+
+
+def take_token(key, rate, now=None):
+    """
+    Count a request against the counter `key`.
+
+    Args:
+        key: Counter identifier (scope and client)
+        rate: Rate or rate string such as '10/m'
+        now: Current time in seconds (defaults to time.time())
+
+    Returns:
+        float: 0 if the request may proceed, otherwise seconds until the
+        window ends
+    """
+    rate = parse_rate(rate) if isinstance(rate, str) else rate
+    now = time.time() if now is None else now
+    window, remaining = _window(rate, now)
+    cache_key = f'{KEY_PREFIX}{key}:{window}'
+    timeout = int(rate.period) + 1
+    try:
+        # add() is a no-op if the counter exists; incr() is atomic
+        cache.add(cache_key, 0, timeout=timeout)
+        try:
+            count = cache.incr(cache_key)
+        except ValueError:
+            # Expired or evicted between add() and incr()
+            count = 1 if cache.add(cache_key, 1, timeout=timeout) else cache.incr(cache_key)
+    except Exception as e:
+        logger.warning("Rate limit cache unavailable, using in-process counters: %s", e)
+        count = _local.incr(cache_key)
+    return 0.0 if count <= rate.capacity else remaining
+
+
+def client_ip(request):
+    """
+    Client address of a request.
+
+    Behind RATELIMIT_TRUSTED_PROXIES proxies that each append the address
+    they received from to RATELIMIT_IP_HEADER (e.g. 'HTTP_X_FORWARDED_FOR'),
+    the client is the address the outermost trusted proxy appended:
+    counted from the right, since everything to its left is sent by the
+    client and can be forged.
+    """
+    header = getattr(settings, 'RATELIMIT_IP_HEADER', '')
+    if header and request.META.get(header):
+        addresses = [address.strip() for address in request.META[header].split(',') if address.strip()]
+        trusted = max(1, getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 1))
+        if addresses:
+            return addresses[-min(trusted, len(addresses))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:24]
+
+
+def client_key(request, kind):
+    """
+    Identify the client for a rule key ('ip', 'user' or 'username').
+
+    Returns:
+        str or None: None if the request carries no such identity (the
+        rule is then skipped)
+    """
+    if kind == 'ip':
+        return client_ip(request) or None
+    if kind == 'user':
+        try:
+            return request.get_signed_cookie(USER_COOKIE, default=None, salt=USER_COOKIE_SALT)
+        except signing.BadSignature:
+            return None
+    if kind == 'username':
+        if request.method != 'POST':
+            return None
+        name = request.POST.get('email') or request.POST.get('username')
+        return _digest(name.strip().lower()) if name else None
+    raise ValueError(f"Unknown rate limit key {kind!r}")
+
+
+def check(request, scope, rules):
+    """
+    Apply a scope's rules to a request.
+
+    Every applicable counter is incremented, so a client over its per-user
+    limit also uses up its per-IP allowance.
+
+    Returns:
+        float: 0 if allowed, otherwise seconds the client should wait
+    """
+    methods = rules.get('methods')
+    if methods and request.method not in methods:
+        return 0.0
+    wait = 0.0
+    for kind, rate in rules.items():
+        if kind == 'methods':
+            continue
+        identity = client_key(request, kind)
+        if identity is not None:
+            wait = max(wait, take_token(f'{scope}:{kind}:{identity}', rate))
+    return wait
+
+
+def remember_login(sender, request, user, **kwargs):
+    """user_logged_in receiver: have the middleware set USER_COOKIE."""
+    if request is not None:
+        request.ratelimit_user_id = user.pk
+
+
+def forget_login(sender, request, **kwargs):
+    """user_logged_out receiver: have the middleware delete USER_COOKIE."""
+    if request is not None:
+        request.ratelimit_user_id = None
+
+
+def update_user_cookie(request, response):
+    """Set or delete USER_COOKIE after a login or logout in this request."""
+    if not hasattr(request, 'ratelimit_user_id'):
+        return
+    if request.ratelimit_user_id is None:
+        response.delete_cookie(USER_COOKIE, samesite='Lax')
+    else:
+        response.set_signed_cookie(
+            USER_COOKIE, str(request.ratelimit_user_id), salt=USER_COOKIE_SALT,
+            max_age=settings.SESSION_COOKIE_AGE, secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True, samesite='Lax',
+        )
+
+
+def rules_for(scope):
+    return getattr(settings, 'RATELIMITS', {}).get(scope)
+
+
+def rejected_response(request, wait):
+    """429 response; JSON for JSON/AJAX requests."""
+    if request.content_type == 'application/json' or 'application/json' in request.headers.get('Accept', ''):
+        response = JsonResponse({'success': False, 'error': REJECT_MESSAGE}, status=429)
+    else:
+        response = HttpResponse(REJECT_MESSAGE, status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(max(1, round(wait + 0.5)))
+    return response
+
+
+def ratelimit(scope):
+    """Mark a function view as rate limited by the RATELIMITS[scope] rules."""
+    def decorator(view_func):
+        view_func.ratelimit_scope = scope
+        return view_func
+    return decorator
+
+
+def clear_local_counters():
+    """Forget in-process counters (for tests)."""
+    _local.clear()
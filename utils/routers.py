@@ -0,0 +1,82 @@
+"""
+Read replica routing.
+
+Views opt in with ReplicaReadMixin (class-based) or @replica_read
+(function views). For safe requests to those views, ReplicaRoutingMiddleware
+turns on replica reads for the whole request, including template rendering,
+and ReplicaRouter then sends ORM reads to one of DATABASE_REPLICAS. Writes,
+reads inside other views, Celery tasks (winner selection) and management
+commands always use the primary.
+
+Read-your-writes: after any successful unsafe request (entry submission,
+profile edits, logins) the middleware sets a short-lived cookie, and
+requests carrying it read from the primary until it expires, so a user
+never sees a replica that has not caught up with their own write.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_use_replica = ContextVar('use_replica', default=False)
+
+# Session rows are written on login and must be read back immediately
+PRIMARY_ONLY_APPS = {'sessions'}
+
+
+def replica_aliases():
+    """Return the configured replica database aliases."""
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def replica_reads():
+    """Route ORM reads in this block to a replica (when any are configured)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Database router sending opted-in reads to replicas.
+
+    Every replica is a copy of 'default', so relations are always allowed
+    and migrations only run on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _use_replica.get() and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaReadMixin:
+    """
+    Class-based view mixin marking GET/HEAD requests as safe for replicas.
+
+    Usage:
+        class GiveawayListView(ReplicaReadMixin, ListView):
+            ...
+    """
+    use_read_replica = True
+
+
+def replica_read(view_func):
+    """Mark a function view as safe to serve GET/HEAD requests from replicas."""
+    view_func.use_read_replica = True
+    return view_func
@@ -0,0 +1,91 @@
+"""
+Static files storage with fingerprinting and precompression.
+
+CompressedManifestStaticFilesStorage extends Django's
+ManifestStaticFilesStorage: collectstatic writes content-hashed copies
+(`app.3f2a9c1b.css`) plus a manifest, and additionally writes `.gz` and,
+when the optional `brotli` package is installed, `.br` siblings for text
+assets. utils.wsgi serves them with far-future cache headers. No Node
+or other build step is involved.
+"""
+
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip copies are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico')
+
+# Tiny files gain nothing from compression
+MIN_COMPRESS_SIZE = 256
+
+
+def compress_gzip(data):
+    # mtime=0 keeps the output stable across collectstatic runs
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11) if brotli else None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes precompressed copies.
+
+    Lookups are lenient: before collectstatic has run (development,
+    tests) a missing manifest entry falls back to the unhashed name
+    instead of raising.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = {}
+        for original, processed, was_processed in super().post_process(paths, dry_run, **options):
+            if processed and not isinstance(was_processed, Exception):
+                # Adjustable files (CSS) may be yielded again with their final name
+                hashed[original] = processed
+            yield original, processed, was_processed
+
+        if dry_run:
+            return
+        for name in hashed.values():
+            for compressed in self.compress(name):
+                yield name, compressed, True
+
+    def compress(self, name):
+        """
+        Write `.gz`/`.br` copies of a stored file when they are smaller.
+
+        Returns:
+            list: Names of the compressed files written
+        """
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return []
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return []
+
+        written = []
+        for suffix, compressor in (('.gz', compress_gzip), ('.br', compress_brotli)):
+            compressed = compressor(data)
+            if compressed is None or len(compressed) >= len(data):
+                continue
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(compressed))
+            written.append(target)
+        return written
\ No newline at end of file
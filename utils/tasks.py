@@ -0,0 +1,31 @@
+"""
+Celery tasks for shared utilities.
+"""
+
+from celery import shared_task
+
+from .images import generate_shared_variants, generate_variants
+
+
+@shared_task(name='utils.process_image_variants', ignore_result=True)
+def process_image_variants(model_label: str, pk: int) -> None:
+    """
+    Render resized WebP/JPEG variants for an uploaded image.
+
+    Args:
+        model_label: Model label from utils.images.IMAGE_FIELDS, e.g. 'giveaways.Giveaway'
+        pk: Primary key of the object whose image changed
+    """
+    generate_variants(model_label, pk)
+
+
+@shared_task(name='utils.process_shared_image_variants', ignore_result=True)
+def process_shared_image_variants(model_label: str, pks: list) -> None:
+    """
+    Render variants for many objects, once per distinct image.
+
+    Args:
+        model_label: Model label from utils.images.IMAGE_FIELDS
+        pks: Primary keys of the objects, e.g. a bulk-imported series
+    """
+    generate_shared_variants(model_label, pks)
@@ -0,0 +1,71 @@
+"""
+Template tags for responsive images built by utils.images.
+
+Usage:
+    {% load image_tags %}
+    {% responsive_image giveaway 'image' sizes='(max-width: 576px) 100vw, 33vw' alt=giveaway.title css_class='card-img-top' default='img/default-giveaway.png' %}
+"""
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from utils.images import variants_for
+
+register = template.Library()
+
+# Width used for the plain `src` fallback when the browser ignores srcset
+FALLBACK_WIDTH = 640
+
+
+def _srcset(storage, entries):
+    return ', '.join(f'{storage.url(name)} {width}w' for width, name in entries)
+
+
+@register.simple_tag
+def responsive_image(obj, field_name, sizes='100vw', alt='', css_class='', style='',
+                     default=None, loading='lazy'):
+    """
+    Render an image field as <picture> with WebP and JPEG srcsets.
+
+    Falls back to the original upload while variants are being built, and
+    to the `default` static file (if given) when the field is empty.
+
+    Args:
+        obj: Model instance holding the image
+        field_name: Name of the ImageField, e.g. 'image' or 'logo'
+        sizes: The `sizes` attribute telling the browser the rendered width
+        alt, css_class, style: Passed through to the <img>
+        default: Static path used when there is no image
+        loading: 'lazy' (default) or 'eager' for above-the-fold images
+    """
+    attrs = {'alt': alt, 'class': css_class, 'style': style, 'loading': loading, 'decoding': 'async'}
+    field_file = getattr(obj, field_name, None) if obj is not None else None
+
+    if not field_file:
+        if not default:
+            return ''
+        return _img(static(default), attrs)
+
+    variants = variants_for(obj, field_name)
+    if not variants or not variants.get('jpeg'):
+        return _img(field_file.url, attrs)
+
+    storage = field_file.storage
+    jpeg = variants['jpeg']
+    fallback = next((name for width, name in reversed(jpeg) if width <= FALLBACK_WIDTH), jpeg[0][1])
+    img = _img(storage.url(fallback), dict(attrs, srcset=_srcset(storage, jpeg), sizes=sizes))
+    if not variants.get('webp'):
+        return img
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">{}</picture>',
+        _srcset(storage, variants['webp']), sizes, img,
+    )
+
+
+def _img(src, attrs):
+    # alt is always rendered (empty alt marks decorative images)
+    rendered = format_html_join(
+        '', ' {}="{}"', ((k, v) for k, v in attrs.items() if v or k == 'alt')
+    )
+    return format_html('<img src="{}"{}>', src, rendered)
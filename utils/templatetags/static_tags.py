@@ -0,0 +1,31 @@
+"""
+Template tags for third-party scripts that can be served locally.
+
+Usage:
+    {% load static_tags %}
+    {% animejs_script %}
+"""
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+ANIMEJS_VERSION = '3.2.1'
+ANIMEJS_CDN_URL = f'https://cdnjs.cloudflare.com/ajax/libs/animejs/{ANIMEJS_VERSION}/anime.min.js'
+ANIMEJS_STATIC_PATH = 'vendor/anime.min.js'
+
+
+@register.simple_tag
+def animejs_script():
+    """
+    Render the <script> tag for anime.js.
+
+    With ANIMEJS_LOCAL the fingerprinted copy in static/vendor/ is used, so
+    the animation does not depend on the CDN and is cached like other assets.
+    """
+    if getattr(settings, 'ANIMEJS_LOCAL', False):
+        return format_html('<script src="{}"></script>', static(ANIMEJS_STATIC_PATH))
+    return format_html('<script src="{}" crossorigin="anonymous"></script>', ANIMEJS_CDN_URL)
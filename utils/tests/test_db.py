@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from utils.db import retry_on_locked
+
+
+class SQLiteTuningTest(TestCase):
+    def test_new_connections_are_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+
+@override_settings(SQLITE_LOCK_RETRIES=3)
+class RetryOnLockedTest(TransactionTestCase):
+    @mock.patch('utils.db.time.sleep')
+    def test_retries_until_the_lock_clears(self, sleep):
+        func = mock.Mock(side_effect=[OperationalError('database is locked'), 'saved'])
+        self.assertEqual(retry_on_locked(func), 'saved')
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+
+    @mock.patch('utils.db.time.sleep')
+    def test_gives_up_after_the_last_attempt(self, sleep):
+        func = mock.Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_other_errors_are_not_retried(self):
+        func = mock.Mock(side_effect=OperationalError('no such table: x'))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)
+        self.assertEqual(func.call_count, 1)
+
+    @mock.patch('utils.db.time.sleep')
+    def test_not_retried_inside_an_outer_transaction(self, sleep):
+        func = mock.Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError), transaction.atomic():
+            retry_on_locked(func)
+        self.assertEqual(func.call_count, 1)
+        sleep.assert_not_called()
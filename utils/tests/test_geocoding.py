@@ -0,0 +1,88 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from utils.geocoding import _get_table, canonical_city, haversine_km, reverse_geocode
+
+
+class ReverseGeocodeTest(SimpleTestCase):
+    def test_maps_coordinates_to_nearest_town(self):
+        self.assertEqual(reverse_geocode(59.9127, 10.7461).name, "Oslo")  # Oslo sentrum
+        self.assertEqual(reverse_geocode(69.6816, 18.9776).name, "Tromsø")  # Tromsøya
+        place = reverse_geocode(60.3975, 5.3240)  # Bryggen
+        self.assertEqual((place.name, place.postal_code), ("Bergen", "5003"))
+        self.assertLess(place.distance_km, 2)
+
+    def test_matches_brute_force_nearest(self):
+        table = _get_table()
+        for lat in (58.1, 59.4, 60.8, 62.5, 63.9, 66.0, 68.4, 70.1):
+            for lon in (5.5, 7.2, 9.9, 11.4, 14.3, 18.0, 24.5, 29.8):
+                distances = sorted(
+                    (haversine_km(lat, lon, table.lats[i], table.lons[i]), i) for i in range(len(table.names))
+                )
+                index, km, second_km = table.nearest(lat, lon, 2000)
+                self.assertEqual(table.names[index], table.names[distances[0][1]], (lat, lon))
+                self.assertAlmostEqual(km, distances[0][0])
+                self.assertAlmostEqual(second_km, distances[1][0])
+
+    def test_point_between_towns_has_no_city(self):
+        # Fornebu in Bærum: Sandvika and Nesoddtangen are both about 5.5 km away
+        self.assertIsNone(reverse_geocode(59.90, 10.62))
+        self.assertEqual(reverse_geocode(59.8894, 10.5300).name, "Sandvika")
+
+    @override_settings(GEOCODER_MAX_DISTANCE_KM=60)
+    def test_far_or_invalid_positions_return_none(self):
+        self.assertIsNone(reverse_geocode(48.8566, 2.3522))  # Paris
+        self.assertIsNone(reverse_geocode(66.0, 2.0))  # Norwegian Sea
+        self.assertIsNone(reverse_geocode("nord", 10))
+        self.assertIsNone(reverse_geocode(95, 10))
+
+    def test_lookup_takes_microseconds(self):
+        reverse_geocode(59.9, 10.7)
+        started = time.perf_counter()
+        for _ in range(1000):
+            reverse_geocode(63.43, 10.39)
+        self.assertLess((time.perf_counter() - started) / 1000, 0.001)
+
+    def test_canonical_city_spelling(self):
+        self.assertEqual(canonical_city("tromso"), "Tromsø")
+        self.assertEqual(canonical_city(" MO I RANA "), "Mo i Rana")
+        self.assertEqual(canonical_city("Bærum"), "Bærum")
+        self.assertEqual(canonical_city(""), "")
+
+
+def square(south, west, north, east):
+    return [[west, south], [east, south], [east, north], [west, north], [west, south]]
+
+
+class MunicipalityBoundaryTest(SimpleTestCase):
+    def setUp(self):
+        features = [
+            # Bærum, with Oslo's Lysaker corner cut out as a hole
+            {'properties': {'kommunenavn': 'Bærum'}, 'geometry': {
+                'type': 'Polygon', 'coordinates': [square(59.80, 10.40, 60.00, 10.63), square(59.91, 10.60, 59.93, 10.63)],
+            }},
+            {'properties': {'kommunenavn': 'Oslo'}, 'geometry': {
+                'type': 'MultiPolygon', 'coordinates': [[square(59.865, 10.63, 60.00, 10.95)], [square(59.91, 10.60, 59.93, 10.63)]],
+            }},
+            {'properties': {'kommunenavn': 'Nesodden'}, 'geometry': {
+                'type': 'Polygon', 'coordinates': [square(59.70, 10.55, 59.865, 10.75)],
+            }},
+        ]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'kommuner.geojson'
+        path.write_text(json.dumps({'type': 'FeatureCollection', 'features': features}), encoding='utf-8')
+        override = override_settings(GEOCODER_BOUNDARIES_FILE=str(path))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_point_is_placed_in_the_containing_municipality(self):
+        self.assertEqual(reverse_geocode(59.90, 10.62).name, "Bærum")
+        self.assertEqual(reverse_geocode(59.92, 10.62).name, "Oslo")  # in the hole
+        self.assertEqual(reverse_geocode(59.85, 10.66).name, "Nesodden")
+        self.assertIsNone(reverse_geocode(58.0, 10.62))  # Skagerrak
+        self.assertEqual(canonical_city("baerum"), "Bærum")
@@ -0,0 +1,118 @@
+import json
+import logging
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from utils.logging import JSONFormatter, NonBlockingHandler, RedactEmailFilter, SamplingFilter, lazy, redact_email
+
+
+def make_record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord('giveaways.test', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.get_ident())
+
+
+class BlockingHandler(ListHandler):
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+
+    def emit(self, record):
+        self.unblock.wait(5)
+        super().emit(record)
+
+
+class JSONFormatterTest(SimpleTestCase):
+    def test_one_object_with_extra_fields(self):
+        line = JSONFormatter().format(make_record("Påmelding %s", 7, giveaway_id=3))
+        data = json.loads(line)
+        self.assertEqual(data['message'], "Påmelding 7")
+        self.assertEqual((data['level'], data['logger'], data['giveaway_id']), ('INFO', 'giveaways.test', 3))
+        self.assertNotIn('\n', line)
+
+    def test_includes_exception(self):
+        try:
+            raise ValueError("feil")
+        except ValueError:
+            record = logging.LogRecord('x', logging.ERROR, __file__, 1, "oops", (), __import__('sys').exc_info())
+        data = json.loads(JSONFormatter().format(record))
+        self.assertIn('ValueError: feil', data['exception'])
+
+
+class FilterTest(SimpleTestCase):
+    def test_sampling_never_drops_warnings(self):
+        sampler = SamplingFilter(rate=0.0)
+        self.assertFalse(sampler.filter(make_record("info")))
+        self.assertTrue(sampler.filter(make_record("warn", level=logging.WARNING)))
+        self.assertTrue(SamplingFilter(rate=1.0).filter(make_record("info")))
+
+    def test_sampling_keeps_about_rate(self):
+        sampler = SamplingFilter(rate=0.25)
+        with mock.patch('utils.logging.random.random', side_effect=[0.1, 0.3, 0.2, 0.9]):
+            kept = [sampler.filter(make_record("info")) for _ in range(4)]
+        self.assertEqual(kept, [True, False, True, False])
+
+    def test_redacts_emails(self):
+        self.assertEqual(redact_email("Bruker kari@example.com"), "Bruker k***@example.com")
+        record = make_record("Bruker %s meldte seg på", "ola.nordmann@firma.no")
+        RedactEmailFilter().filter(record)
+        self.assertEqual(record.getMessage(), "Bruker o***@firma.no meldte seg på")
+
+
+class LazyTest(SimpleTestCase):
+    def test_not_evaluated_below_level(self):
+        func = mock.Mock(return_value="stats")
+        logger = logging.getLogger('utils.tests.lazy')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        self.addCleanup(setattr, logger, 'propagate', True)
+        handler = ListHandler()
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        logger.debug("Stats: %s", lazy(func, 1))
+        func.assert_not_called()
+        logger.info("Stats: %s", lazy(func, 1))
+        self.assertEqual(handler.records[0].getMessage(), "Stats: stats")
+        func.assert_called_once_with(1)
+
+
+class NonBlockingHandlerTest(SimpleTestCase):
+    def make_handler(self, target, **kwargs):
+        target.set_name('utils-tests-target')
+        handler = NonBlockingHandler(targets=['utils-tests-target'], **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_delivers_formatted_records_to_targets(self):
+        target = ListHandler()
+        handler = self.make_handler(target)
+        args = ["mutable"]
+        handler.handle(make_record("Verdi %s", args))
+        args.append("changed later")
+        handler.stop()
+        self.assertEqual(len(target.records), 1)
+        self.assertEqual(target.records[0].getMessage(), "Verdi ['mutable']")
+        self.assertNotIn(threading.get_ident(), target.threads)
+
+    def test_drops_instead_of_blocking_when_full(self):
+        target = BlockingHandler()
+        handler = self.make_handler(target, queue_size=2)
+        for i in range(10):
+            handler.handle(make_record("rad %s", i))
+        self.assertGreaterEqual(handler.dropped, 7)
+        target.unblock.set()
+        handler.stop()
+        self.assertEqual(len(target.records) + handler.dropped, 10)
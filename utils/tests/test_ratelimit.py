@@ -0,0 +1,130 @@
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from utils import ratelimit
+from utils.ratelimit import Rate, client_ip, parse_rate, take_token
+
+
+class CounterTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.clear_local_counters()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/m'), Rate(10, 60))
+        self.assertEqual(parse_rate('20/10s'), Rate(20, 10))
+        self.assertEqual(parse_rate('5 / h'), Rate(5, 3600))
+        with self.assertRaises(ValueError):
+            parse_rate('10 per minute')
+
+    def test_allows_limit_per_window(self):
+        now = 1000.0  # the window is 960-1020
+        self.assertEqual([take_token('t', '3/m', now) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(take_token('t', '3/m', now), 20.0)
+        self.assertAlmostEqual(take_token('t', '3/m', now + 10), 10.0)
+        self.assertEqual(take_token('t', '3/m', now + 20), 0)
+        self.assertEqual(take_token('other', '3/m', now), 0)
+
+    def test_counts_with_atomic_cache_operations(self):
+        with mock.patch.object(ratelimit.cache, 'get') as get, mock.patch.object(ratelimit.cache, 'set') as set_:
+            self.assertEqual([take_token('t', '2/m', 1000.0) for _ in range(3)], [0, 0, 20.0])
+        get.assert_not_called()
+        set_.assert_not_called()
+        self.assertEqual(cache.get('ratelimit:t:16'), 3)
+        self.assertFalse(ratelimit._local.counters)
+
+    def test_falls_back_to_process_memory_when_cache_fails(self):
+        with mock.patch.object(ratelimit.cache, 'add', side_effect=ConnectionError("redis down")):
+            waits = [take_token('t', '2/m', 1000.0) for _ in range(3)]
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertGreater(waits[2], 0)
+
+
+class ClientIpTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_remote_addr_without_header(self):
+        request = self.factory.get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4')
+        self.assertEqual(client_ip(request), '10.0.0.1')
+
+    @override_settings(RATELIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR', RATELIMIT_TRUSTED_PROXIES=2)
+    def test_counts_trusted_proxies_from_the_right(self):
+        # The client forged 6.6.6.6; the two proxies appended 5.5.5.5 and the CDN address
+        request = self.factory.get('/', HTTP_X_FORWARDED_FOR='6.6.6.6, 5.5.5.5, 172.16.0.1')
+        self.assertEqual(client_ip(request), '5.5.5.5')
+        request = self.factory.get('/', HTTP_X_FORWARDED_FOR='5.5.5.5')
+        self.assertEqual(client_ip(request), '5.5.5.5')
+
+
+@override_settings(RATELIMITS={
+    'giveaway-entry': {'methods': ['POST'], 'user': '5/m', 'ip': '2/m'},
+    'login': {'methods': ['POST'], 'username': '2/m'},
+    'location': {'user': '1/m'},
+})
+class RateLimitMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_rejects_before_any_query(self):
+        url = reverse('giveaways:giveaway-detail', args=[999999])
+        for _ in range(2):
+            self.assertEqual(self.client.post(url).status_code, 404)
+        with self.assertNumQueries(0):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        # Other clients and reads are not affected
+        self.assertEqual(self.client.post(url, REMOTE_ADDR='10.0.0.2').status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_login_limited_per_submitted_email(self):
+        url = reverse('accounts:member-login')
+        data = {'email': 'Kari@example.com', 'password': 'feil'}
+        for address in ('10.0.0.1', '10.0.0.2'):
+            self.assertEqual(self.client.post(url, data, REMOTE_ADDR=address).status_code, 200)
+        data['email'] = 'kari@example.com '
+        with self.assertNumQueries(0):
+            response = self.client.post(url, data, REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(response.status_code, 429)
+
+    def login(self):
+        get_user_model().objects.create_user(username='rl', email='rl@example.com', password='pw12345', city='Oslo')
+        response = self.client.post(reverse('accounts:member-login'), {'email': 'rl@example.com', 'password': 'pw12345'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_json_endpoints_get_json_errors(self):
+        url = reverse('accounts:update-location')
+        self.login()
+        self.assertEqual(self.client.post(url, json.dumps({'city': 'Oslo'}), content_type='application/json').status_code, 200)
+        response = self.client.post(url, json.dumps({'city': 'Oslo'}), content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(response.json()['success'])
+
+    def test_user_counter_follows_signed_login_cookie(self):
+        url = reverse('accounts:update-location')
+        self.login()
+        self.assertIn(ratelimit.USER_COOKIE, self.client.cookies)
+        self.client.post(url, json.dumps({'city': 'Oslo'}), content_type='application/json')
+        # A fresh session cookie does not start a new counter
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'random'
+        self.assertEqual(self.client.post(url, json.dumps({'city': 'Oslo'}), content_type='application/json').status_code, 429)
+        # A forged user id is ignored
+        request = RequestFactory().get('/')
+        request.COOKIES[ratelimit.USER_COOKIE] = '1:forged'
+        self.assertIsNone(ratelimit.client_key(request, 'user'))
+
+        self.client.get(reverse('accounts:logout'))
+        self.assertEqual(self.client.cookies[ratelimit.USER_COOKIE].value, '')
+
+    @override_settings(RATELIMIT_ENABLED=False)
+    def test_can_be_disabled(self):
+        url = reverse('giveaways:giveaway-detail', args=[999999])
+        for _ in range(4):
+            self.assertEqual(self.client.post(url).status_code, 404)
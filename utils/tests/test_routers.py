@@ -0,0 +1,70 @@
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.views.generic import View
+
+from giveaways.models import Giveaway
+from utils.middleware import ReplicaRoutingMiddleware
+from utils.routers import ReplicaReadMixin, ReplicaRouter, replica_reads
+
+
+class ReadView(ReplicaReadMixin, View):
+    def get(self, request):
+        return HttpResponse(ReplicaRouter().db_for_read(Giveaway))
+
+    def post(self, request):
+        return HttpResponse(ReplicaRouter().db_for_read(Giveaway))
+
+
+class PrimaryView(View):
+    def get(self, request):
+        return HttpResponse(ReplicaRouter().db_for_read(Giveaway))
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _call(self, view_class, request):
+        view = view_class.as_view()
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_router_defaults_to_primary(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Giveaway), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Giveaway), 'replica1')
+            self.assertEqual(router.db_for_read(Session), 'default')
+            self.assertEqual(router.db_for_write(Giveaway), 'default')
+        self.assertFalse(router.allow_migrate('replica1', 'giveaways'))
+
+    def test_opted_in_get_reads_from_replica(self):
+        response = self._call(ReadView, self.factory.get('/'))
+        self.assertEqual(response.content, b'replica1')
+        # The context ends with the request
+        self.assertEqual(ReplicaRouter().db_for_read(Giveaway), 'default')
+
+    def test_other_views_read_from_primary(self):
+        self.assertEqual(self._call(PrimaryView, self.factory.get('/')).content, b'default')
+
+    def test_write_sets_sticky_cookie_and_next_read_uses_primary(self):
+        response = self._call(ReadView, self.factory.post('/'))
+        self.assertEqual(response.content, b'default')
+        cookie = response.cookies['use_primary']
+        self.assertEqual(cookie['max-age'], 15)
+
+        request = self.factory.get('/')
+        request.COOKIES['use_primary'] = '1'
+        self.assertEqual(self._call(ReadView, request).content, b'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_no_cookie(self):
+        response = self._call(ReadView, self.factory.post('/'))
+        self.assertNotIn('use_primary', response.cookies)
@@ -0,0 +1,86 @@
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from utils.wsgi import StaticFilesMiddleware
+
+CSS = "body { background: url('../img/bg.png'); }\n" + ".card { color: #333; margin: 0 auto; }\n" * 40
+
+
+class StaticPipelineTest(SimpleTestCase):
+    def setUp(self):
+        self.src = Path(tempfile.mkdtemp())
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.src, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        (self.src / "css").mkdir()
+        (self.src / "img").mkdir()
+        (self.src / "css" / "site.css").write_text(CSS)
+        (self.src / "img" / "bg.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+
+        overrides = override_settings(
+            STATIC_ROOT=str(self.root),
+            STATICFILES_DIRS=[str(self.src)],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def _hashed_css(self):
+        manifest = json.loads((self.root / "staticfiles.json").read_text())
+        return manifest["paths"]["css/site.css"]
+
+    def test_collectstatic_writes_hashed_and_gzipped_copies(self):
+        hashed = self._hashed_css()
+        self.assertRegex(hashed, r"^css/site\.[0-9a-f]{12}\.css$")
+        compressed = (self.root / (hashed + ".gz")).read_bytes()
+        self.assertEqual(gzip.decompress(compressed), (self.root / hashed).read_bytes())
+        # Binary formats are not compressed
+        self.assertFalse(list(self.root.glob("img/*.gz")))
+        self.assertEqual(staticfiles_storage.url("css/site.css"), "/static/" + hashed)
+
+    def test_unknown_file_falls_back_to_unhashed_url(self):
+        self.assertEqual(staticfiles_storage.url("css/missing.css"), "/static/css/missing.css")
+
+    def _get(self, path, **environ):
+        calls = {}
+
+        def fallback(environ, start_response):
+            start_response("404 Not Found", [])
+            return [b"django"]
+
+        def start_response(status, headers):
+            calls["status"] = status
+            calls["headers"] = dict(headers)
+
+        app = StaticFilesMiddleware(fallback, root=str(self.root), prefix="/static/")
+        body = b"".join(app(dict({"REQUEST_METHOD": "GET", "PATH_INFO": path}, **environ), start_response))
+        return calls["status"], calls["headers"], body
+
+    def test_wsgi_serves_hashed_files_as_immutable_and_negotiates_gzip(self):
+        hashed = self._hashed_css()
+        status, headers, body = self._get("/static/" + hashed, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(status, "200 OK")
+        self.assertIn("immutable", headers["Cache-Control"])
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body).decode(), (self.root / hashed).read_text())
+
+        status, headers, _ = self._get("/static/" + hashed, HTTP_IF_NONE_MATCH=headers["ETag"], HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(status, "304 Not Modified")
+
+    def test_wsgi_short_cache_for_unhashed_and_falls_through(self):
+        status, headers, _ = self._get("/static/css/site.css")
+        self.assertEqual(status, "200 OK")
+        self.assertNotIn("immutable", headers["Cache-Control"])
+        self.assertNotIn("Content-Encoding", headers)
+
+        self.assertEqual(self._get("/static/../settings.py")[2], b"django")
+        self.assertEqual(self._get("/static/css/nope.css")[2], b"django")
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.template import engines
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from utils.templates import template_names, warm_templates
+
+CACHED_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': settings.TEMPLATES[0]['DIRS'],
+    'OPTIONS': {
+        'loaders': [('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ])],
+    },
+}]
+
+
+class WarmTemplatesTest(SimpleTestCase):
+    def test_finds_project_and_app_templates(self):
+        names = template_names(engines['django'].engine)
+        self.assertIn('giveaways/giveaway_list.html', names)
+        self.assertIn('includes/giveaway_row_card.html', names)
+        self.assertIn('admin/base.html', names)
+
+    def test_cached_loader_serves_warmed_templates_without_disk_reads(self):
+        with override_settings(TEMPLATES=CACHED_TEMPLATES):
+            self.assertGreater(warm_templates(), 50)
+            with mock.patch.object(FilesystemLoader, 'get_contents', side_effect=AssertionError("read from disk")):
+                engines['django'].get_template('giveaways/giveaway_list.html')
+                engines['django'].get_template('includes/giveaway_row.html')
+
+
+class GiveawayTagsTest(SimpleTestCase):
+    def render(self, source, **context):
+        return engines['django'].from_string(source).render(context)
+
+    def test_inclusion_tags_match_includes(self):
+        rows = [
+            SimpleNamespace(pk=1, title="Kaffe", created_at=timezone.now(), is_active=True, entries={'count': 3}, has_winner=False),
+            SimpleNamespace(pk=2, title="Kake", created_at=timezone.now(), is_active=False, entries={'count': 9}, has_winner=True),
+        ]
+        for name in ('giveaway_row', 'giveaway_row_card'):
+            with self.subTest(name=name):
+                included = self.render(
+                    '{% for g in rows %}{% include "includes/' + name + '.html" with row=g %}{% endfor %}', rows=rows,
+                )
+                tagged = self.render('{% load giveaway_tags %}{% for g in rows %}{% ' + name + ' g %}{% endfor %}', rows=rows)
+                self.assertEqual(tagged, included)
+                self.assertIn("Kake", tagged)
@@ -0,0 +1,138 @@
+"""
+WSGI middleware that serves collected static files.
+
+Serves STATIC_ROOT under STATIC_URL in front of Django, so a plain WSGI
+server (gunicorn, uWSGI) can deliver static assets without a separate
+web server:
+
+- fingerprinted files from the staticfiles manifest are sent with
+  `Cache-Control: public, max-age=31536000, immutable`, so repeat visits
+  never revalidate them; other files get a short max-age
+- precompressed `.br`/`.gz` copies written by collectstatic are chosen
+  according to Accept-Encoding
+- ETag/Last-Modified conditional requests get 304 responses
+
+Requests for anything that is not an existing file fall through to Django.
+"""
+
+import mimetypes
+import os
+import posixpath
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+DEFAULT_MAX_AGE = 60
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFilesMiddleware:
+    """
+    Wrap a WSGI application and serve STATIC_ROOT under STATIC_URL.
+
+    Usage (config/wsgi.py):
+        application = StaticFilesMiddleware(get_wsgi_application())
+    """
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = os.path.realpath(root or settings.STATIC_ROOT)
+        self.prefix = prefix or settings.STATIC_URL
+        if not self.prefix.startswith('/'):
+            self.prefix = '/' + self.prefix
+        self._immutable = None
+
+    @property
+    def immutable(self):
+        """Fingerprinted names from the manifest (loaded on first use)."""
+        if self._immutable is None:
+            hashed_files = getattr(staticfiles_storage, 'hashed_files', None) or {}
+            self._immutable = set(hashed_files.values())
+        return self._immutable
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if environ.get('REQUEST_METHOD') in ('GET', 'HEAD') and path.startswith(self.prefix):
+            name = self._resolve(path[len(self.prefix):])
+            if name is not None:
+                return self.serve(name, environ, start_response)
+        return self.application(environ, start_response)
+
+    def _resolve(self, relative):
+        """Return the normalized file name under root, or None."""
+        name = posixpath.normpath(unquote(relative)).lstrip('/')
+        if name.startswith('..') or name in ('', '.'):
+            return None
+        full = os.path.realpath(os.path.join(self.root, name))
+        if not full.startswith(self.root + os.sep) or not os.path.isfile(full):
+            return None
+        return name
+
+    def serve(self, name, environ, start_response):
+        path = os.path.join(self.root, name)
+        headers = []
+        content_type, _ = mimetypes.guess_type(name)
+        headers.append(('Content-Type', content_type or 'application/octet-stream'))
+
+        encoding = None
+        accept = environ.get('HTTP_ACCEPT_ENCODING', '')
+        has_variants = False
+        for coding, suffix in ENCODINGS:
+            if os.path.isfile(path + suffix):
+                has_variants = True
+                if encoding is None and coding in accept:
+                    encoding = coding
+                    path += suffix
+        if has_variants:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        max_age = IMMUTABLE_MAX_AGE if name in self.immutable else DEFAULT_MAX_AGE
+        cache_control = f'public, max-age={max_age}'
+        if max_age == IMMUTABLE_MAX_AGE:
+            cache_control += ', immutable'
+        headers += [
+            ('Cache-Control', cache_control),
+            ('ETag', etag),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+        ]
+
+        if self._not_modified(environ, etag, stat.st_mtime):
+            start_response('304 Not Modified', [h for h in headers if h[0] != 'Content-Type'])
+            return []
+
+        headers.append(('Content-Length', str(stat.st_size)))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        f = open(path, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper:
+            return file_wrapper(f, 64 * 1024)
+        return _iter_file(f)
+
+    @staticmethod
+    def _not_modified(environ, etag, mtime):
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _iter_file(f, chunk_size=64 * 1024):
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk